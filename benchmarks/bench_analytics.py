@@ -0,0 +1,82 @@
+"""
+Скользящая статистика трат по картам на многолетней выписке: расчет pandas rolling по всем строкам,
+расчет накопленными суммами и добавление операций последней недели по одному дню без пересчета окон старых строк.
+
+Запуск: python -m benchmarks.bench_analytics --rows 2000000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_operations
+from src.analytics import BASELINE_DAYS, SpendingAnalytics
+from src.models import parse_operation_dates
+
+
+def pandas_rolling(operations: pd.DataFrame, operation_dates: np.ndarray) -> pd.DataFrame:
+    """
+    Функция расчета среднего и стандартного отклонения трат карты за предыдущие BASELINE_DAYS дней через pandas.
+    :param operations: DataFrame с операциями по возрастанию даты.
+    :param operation_dates: Даты операций.
+    :return: DataFrame со средним и стандартным отклонением по строкам.
+    """
+    frame = pd.DataFrame(
+        {
+            "card": operations["Номер карты"].to_numpy(),
+            "amount": operations["Сумма операции с округлением"].to_numpy(),
+        },
+        index=pd.DatetimeIndex(operation_dates),
+    ).dropna(subset=["card"])
+    rolling = frame.groupby("card")["amount"].rolling(f"{BASELINE_DAYS}D", closed="left")
+    return pd.DataFrame({"mean": rolling.mean(), "std": rolling.std(ddof=0)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    operations = make_operations(args.rows).iloc[::-1].reset_index(drop=True)
+    operation_dates = parse_operation_dates(operations["Дата операции"])
+    days = operation_dates.astype("datetime64[D]")
+    day_ends = np.searchsorted(days, np.arange(days[-1] - np.timedelta64(6, "D"), days[-1] + 1), side="right")
+    history_end = int(np.searchsorted(days, days[-1] - np.timedelta64(6, "D")))
+    print(
+        f"rows: {args.rows}, cards: {operations['Номер карты'].nunique()}, last week rows: {args.rows - history_end}"
+    )
+
+    start = time.perf_counter()
+    pandas_rolling(operations, operation_dates)
+    print(f"pandas rolling          {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    analytics = SpendingAnalytics()
+    analytics.append(operations, operation_dates)
+    print(f"prefix sums, all rows   {time.perf_counter() - start:8.3f} s")
+
+    history = SpendingAnalytics()
+    history.append(operations.iloc[:history_end], operation_dates[:history_end])
+    append_seconds = []
+    for day_start, day_end in zip([history_end, *day_ends[:-1]], day_ends):
+        start = time.perf_counter()
+        history.append(operations.iloc[day_start:day_end], operation_dates[day_start:day_end])
+        append_seconds.append(time.perf_counter() - start)
+    print(
+        f"append 7 days one by one: median {np.median(append_seconds) * 1000:.1f} ms, "
+        f"max {max(append_seconds) * 1000:.1f} ms (buffer growth)"
+    )
+    for card_num, card in analytics.cards.items():
+        assert np.allclose(history.cards[card_num].z_scores[: card.size], card.z_scores[: card.size])
+
+    start = time.perf_counter()
+    summary = analytics.summary(datetime(2021, 12, 1), datetime(2021, 12, 31, 23, 59, 59))
+    anomalies = sum(len(card["anomalies"]) for card in summary)
+    print(f"summary 7/30/90 days    {(time.perf_counter() - start) * 1000:8.1f} ms, anomalies in month: {anomalies}")
+
+
+if __name__ == "__main__":
+    main()
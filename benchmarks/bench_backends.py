@@ -0,0 +1,60 @@
+"""
+Сравнение хранилищ главной страницы: файл Excel (холодный и с кэшем Arrow) против SQLite с индексами.
+
+Запуск: python -m benchmarks.bench_backends --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.synthetic import make_operations, write_excel
+from src.backends import ExcelBackend, SqliteBackend
+from src.cache import get_cache_path
+from src.utils import get_period_date
+
+
+def measure(label: str, func: Callable[[], object], repeat: int = 1) -> None:
+    """
+    Функция замера среднего времени выполнения.
+    :param label: Подпись замера.
+    :param func: Измеряемая функция.
+    :param repeat: Количество повторов.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    print(f"  {label:<22} {(time.perf_counter() - start) / repeat * 1000:10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--date", default="2021-12-27 08:00:23")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    end_date, start_date = get_period_date(args.date)
+    for rows in args.rows:
+        print(f"rows: {rows}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "operations.xlsx")
+            operations = make_operations(rows)
+            write_excel(operations, filename)
+            excel = ExcelBackend(filename)
+            sqlite = SqliteBackend(os.path.join(tmp_dir, "operations.sqlite"))
+            try:
+                measure("excel cold", lambda: excel.period_summary(start_date, end_date))
+                measure("excel arrow cache", lambda: excel.period_summary(start_date, end_date), args.repeat)
+                measure("sqlite import", lambda: sqlite.import_operations(operations))
+                measure("sqlite query", lambda: sqlite.period_summary(start_date, end_date), args.repeat)
+            finally:
+                sqlite.connection.close()
+                if os.path.exists(get_cache_path(filename)):
+                    os.remove(get_cache_path(filename))
+
+
+if __name__ == "__main__":
+    main()
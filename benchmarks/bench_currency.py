@@ -0,0 +1,78 @@
+"""
+Пересчет сумм выписки в рубли по курсам на дату операции: построчный поиск курса против одного векторного поиска.
+Курсы берутся из заранее заполненной таблицы, сеть не используется.
+
+Запуск: python -m benchmarks.bench_currency --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import CURRENCIES, make_operations
+from src.currency import CurrencyConverter, RateTable
+from src.models import OPERATION_DATE_FORMAT, parse_operation_dates
+
+
+def make_rate_table(operations: pd.DataFrame) -> RateTable:
+    """
+    Функция построения таблицы дневных курсов на весь период выписки с колебанием курса.
+    :param operations: DataFrame с операциями.
+    :return: Таблица курсов.
+    """
+    days = parse_operation_dates(operations["Дата операции"]).astype("datetime64[D]")
+    index = pd.date_range(days.min(), days.max(), freq="D")
+    noise = np.random.default_rng(0).normal(1, 0.01, (len(index), len(CURRENCIES) - 1))
+    return RateTable("RUB", pd.DataFrame(noise * [CURRENCIES["USD"], CURRENCIES["EUR"]], index, ["USD", "EUR"]))
+
+
+def convert_per_row(operations: pd.DataFrame, table: RateTable) -> list[float]:
+    """
+    Функция построчного пересчета суммы операции: разбор даты и поиск курса в словаре для каждой строки.
+    :param operations: DataFrame с операциями.
+    :param table: Таблица курсов.
+    :return: Список сумм в рублях.
+    """
+    rates = {
+        (day.date(), str(currency)): float(rate)
+        for day, currency, rate in table.rates.stack().reset_index().itertuples(index=False)
+    }
+    amounts = []
+    for amount, currency, date_text in operations[["Сумма операции", "Валюта операции", "Дата операции"]].itertuples(
+        index=False
+    ):
+        day = datetime.strptime(date_text, OPERATION_DATE_FORMAT).date()
+        amounts.append(amount if currency == "RUB" else amount * rates[(day, currency)])
+    return amounts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    operations = make_operations(args.rows)
+    table = make_rate_table(operations)
+    converter = CurrencyConverter("RUB", os.path.join(tempfile.mkdtemp(), "rates_RUB.csv"))
+    converter.table = table
+    print(
+        f"rows: {args.rows}, foreign: {(operations['Валюта операции'] != 'RUB').sum()}, rate days: {len(table.rates)}"
+    )
+
+    start = time.perf_counter()
+    per_row = convert_per_row(operations, table)
+    print(f"per row      {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    normalized = converter.normalize(operations)
+    print(f"vectorized   {time.perf_counter() - start:8.3f} s")
+    assert np.allclose(normalized["Сумма операции"], np.round(per_row, 2), atol=0.01)
+
+
+if __name__ == "__main__":
+    main()
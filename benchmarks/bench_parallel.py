@@ -0,0 +1,40 @@
+"""
+Сравнение анализа нескольких выписок: последовательно в одном процессе против пула процессов.
+
+Запуск: python -m benchmarks.bench_parallel --files 8 --rows 20000 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_operations, write_excel
+from src.parallel import analyze_workbooks
+from src.utils import get_period_date
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--date", default="2021-12-27 08:00:23")
+    args = parser.parse_args()
+
+    period = get_period_date(args.date)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for number in range(args.files):
+            write_excel(make_operations(args.rows, seed=number), os.path.join(tmp_dir, f"account_{number}.xlsx"))
+        pattern = os.path.join(tmp_dir, "*.xlsx")
+        print(f"files: {args.files}, rows per file: {args.rows}, cpu: {os.cpu_count()}")
+        results = []
+        for workers in (1, args.workers):
+            start = time.perf_counter()
+            results.append(analyze_workbooks(pattern, period, max_workers=workers))
+            print(f"workers {workers:<3} {time.perf_counter() - start:8.3f} s")
+        assert results[0] == results[-1]
+
+
+if __name__ == "__main__":
+    main()
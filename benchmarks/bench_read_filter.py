@@ -0,0 +1,68 @@
+"""
+Сравнение фильтрации операций по периоду: построчный strptime против векторной маски.
+
+Запуск: python -m benchmarks.bench_read_filter --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic import make_operations
+from src.models import OPERATION_DATE_FORMAT
+from src.utils import filter_operations_by_period, get_period_date
+
+
+def legacy_filter(operations: pd.DataFrame, period_datetime: tuple[datetime, datetime]) -> list[dict]:
+    """
+    Прежняя реализация фильтрации из read_finance_excel_operation.
+    :param operations: DataFrame с операциями.
+    :param period_datetime: Кортеж с указанной датой и началом месяца.
+    :return: Список словарей с транзакциями.
+    """
+    end_date, start_date = period_datetime
+    return [
+        data
+        for data in operations.to_dict("records")
+        if datetime.strptime(data["Дата операции"], OPERATION_DATE_FORMAT) >= start_date
+        and datetime.strptime(data["Дата операции"], OPERATION_DATE_FORMAT) <= end_date
+    ]
+
+
+def measure(label: str, func: object, *args: object) -> object:
+    """
+    Функция замера времени выполнения.
+    :param label: Подпись замера.
+    :param func: Измеряемая функция.
+    :return: Результат функции.
+    """
+    start = time.perf_counter()
+    result = func(*args)  # type: ignore[operator]
+    print(f"{label:<12} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--date", default="2021-12-27 08:00:23")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "operations.csv")
+        make_operations(args.rows).to_csv(filename, index=False)
+        operations = pd.read_csv(filename)
+
+    period = get_period_date(args.date)
+    print(f"rows: {len(operations)}")
+    legacy = measure("strptime", legacy_filter, operations, period)
+    vectorized = measure("vectorized", filter_operations_by_period, operations, period)
+    assert len(legacy) == len(vectorized)  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":
+    main()
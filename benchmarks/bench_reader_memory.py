@@ -0,0 +1,67 @@
+"""
+Замер пиковой памяти (tracemalloc) при чтении выписки: полное чтение Excel против потокового чтения порциями.
+
+Запуск: python -m benchmarks.bench_reader_memory --rows 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import pandas as pd
+
+from benchmarks.synthetic import make_operations, write_excel
+from src.reader import iter_finance_excel_operation, summarize_operation_batches
+from src.utils import filter_operations_by_period, get_period_date, main_cards, top_transactions
+
+
+def measure(label: str, func: Callable[[], object]) -> None:
+    """
+    Функция замера времени и пиковой памяти.
+    :param label: Подпись замера.
+    :param func: Измеряемая функция.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:8.2f} s {peak / 2**20:10.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--date", default="2021-12-27 08:00:23")
+    args = parser.parse_args()
+    period = get_period_date(args.date)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "operations.xlsx")
+        write_excel(make_operations(args.rows), filename)
+
+        def full_read() -> None:
+            records = pd.read_excel(filename).to_dict("records")
+            df = filter_operations_by_period(pd.DataFrame(records), period)
+            main_cards(df)
+            top_transactions(df)
+
+        def stream_read() -> None:
+            summarize_operation_batches(iter_finance_excel_operation(period, filename, args.batch_size, order=None))
+
+        def stream_read_sorted() -> None:
+            summarize_operation_batches(iter_finance_excel_operation(period, filename, args.batch_size))
+
+        print(f"rows: {args.rows}")
+        measure("full", full_read)
+        measure("stream", stream_read)
+        measure("stream+stop", stream_read_sorted)
+
+
+if __name__ == "__main__":
+    main()
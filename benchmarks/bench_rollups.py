@@ -0,0 +1,47 @@
+"""
+Сравнение сводки по картам и категориям за несколько лет: по строкам операций против агрегатов.
+
+Запуск: python -m benchmarks.bench_rollups --rows 1000000
+"""
+
+import argparse
+import time
+from datetime import date, datetime
+
+from benchmarks.synthetic import make_operations
+from src.rollups import RollupTable
+from src.store import TransactionStore
+from src.utils import main_cards
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    operations = make_operations(args.rows)
+    store = TransactionStore(operations)
+    start = time.perf_counter()
+    rollups = RollupTable.from_operations(operations)
+    print(f"rows: {args.rows}, daily rollups: {len(rollups.daily)}, monthly rollups: {len(rollups.monthly)}")
+    print(f"build        {time.perf_counter() - start:8.3f} s")
+
+    first_day, last_day = date(2018, 3, 15), date(2021, 11, 20)
+    period = datetime(2018, 3, 15), datetime(2021, 11, 20, 23, 59, 59)
+    print(f"rollup rows touched: {len(rollups.query(first_day, last_day))}, raw rows: {len(store.slice(*period))}")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        raw = main_cards(store.slice(*period))
+        store.slice(*period).groupby("Категория")["Сумма операции с округлением"].sum()
+    print(f"raw          {(time.perf_counter() - start) / args.repeat * 1000:8.2f} ms")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        cards = rollups.card_summary(first_day, last_day)
+        rollups.category_report(first_day, last_day, status=None)
+    print(f"rollups      {(time.perf_counter() - start) / args.repeat * 1000:8.2f} ms")
+    assert [card["total_spent"] for card in cards] == [round(card["total_spent"], 2) for card in raw]
+
+
+if __name__ == "__main__":
+    main()
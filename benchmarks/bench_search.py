@@ -0,0 +1,66 @@
+"""
+Поиск операций по получателю, категории и MCC за период: просмотр всех строк pandas против инвертированного индекса.
+
+Запуск: python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.synthetic import make_operations
+from src.store import TransactionStore
+
+QUERY = "ozon.ru OR category:ЖКХ OR mcc:5814"
+PERIOD_END = datetime(2021, 12, 31, 23, 59, 59)
+PERIODS = {"month": (datetime(2021, 12, 1), PERIOD_END), "year": (datetime(2021, 1, 1), PERIOD_END)}
+
+
+def scan(store: TransactionStore, start: datetime, end: datetime) -> np.ndarray:
+    """
+    Функция поиска тех же операций просмотром всех строк периода.
+    :param store: Хранилище транзакций.
+    :param start: Начало периода.
+    :param end: Конец периода.
+    :return: Номера строк.
+    """
+    operations = store.slice(start, end)
+    found = (
+        operations["Описание"].str.lower().str.contains("ozon.ru", regex=False)
+        | (operations["Категория"] == "ЖКХ")
+        | (operations["MCC"] == 5814)
+    )
+    return store.bounds(start, end)[0] + np.flatnonzero(found.to_numpy())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    store = TransactionStore(make_operations(args.rows))
+    start = time.perf_counter()
+    index = store.get_search_index()
+    print(f"rows: {args.rows}, index build {time.perf_counter() - start:8.3f} s, keys: {len(index.postings)}")
+
+    for name, (period_start, period_end) in PERIODS.items():
+        start = time.perf_counter()
+        scanned = scan(store, period_start, period_end)
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = store.search(QUERY, period_start, period_end)
+        by_description = index.aggregate(rows, "description")
+        index.aggregate(rows, "category")
+        index_seconds = time.perf_counter() - start
+        assert np.array_equal(rows, scanned)
+        print(
+            f"{name:6} found {len(rows):8}  scan {scan_seconds * 1000:9.1f} ms  "
+            f"index + aggregates {index_seconds * 1000:7.1f} ms  top: {by_description[0]['description']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
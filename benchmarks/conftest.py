@@ -0,0 +1,69 @@
+import os
+from typing import Any, Iterator
+
+import pandas as pd
+import pytest
+
+import src.utils
+from benchmarks.synthetic import make_operations, write_statement
+from src.api_cache import ApiCache
+from src.cache import get_cache_path
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--bench-rows", type=int, default=20_000, help="Количество строк синтетической выписки")
+    parser.addoption("--bench-cards", type=int, default=None, help="Количество карт синтетической выписки")
+
+
+class FakeResponse:
+    """
+    Ответ API без обращения к сети.
+    """
+
+    status_code = 200
+
+    def __init__(self, params: dict) -> None:
+        self.params = params
+
+    def json(self) -> dict:
+        if "symbols" in self.params:
+            return {"rates": {symbol: 0.0125 for symbol in self.params["symbols"].split(",")}}
+        return {"Global Quote": {"05. price": "150.12"}}
+
+
+@pytest.fixture(autouse=True)
+def offline_api(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Фикстура подмены HTTP запросов к API и изолированного кэша ответов в памяти.
+    """
+
+    def fake_get(url: str, params: dict, **kwargs: Any) -> FakeResponse:
+        return FakeResponse(params)
+
+    monkeypatch.setattr(src.utils.get_http_session(), "get", fake_get)
+    monkeypatch.setattr(src.utils, "api_cache", ApiCache(path=None))
+
+
+@pytest.fixture(scope="session")
+def statement_file(request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory) -> Iterator[str]:
+    """
+    Фикстура синтетической выписки Excel размера --bench-rows.
+    :return: Путь к файлу Excel.
+    """
+    filename = str(tmp_path_factory.mktemp("statement") / "operations.xlsx")
+    write_statement(
+        make_operations(request.config.getoption("--bench-rows"), cards=request.config.getoption("--bench-cards")),
+        filename,
+    )
+    yield filename
+    if os.path.exists(get_cache_path(filename)):
+        os.remove(get_cache_path(filename))
+
+
+@pytest.fixture(scope="session")
+def statement(statement_file: str) -> pd.DataFrame:
+    """
+    Фикстура операций синтетической выписки.
+    :return: DataFrame с операциями.
+    """
+    return pd.read_excel(statement_file)
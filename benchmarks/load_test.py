@@ -0,0 +1,81 @@
+"""
+Нагрузочный тест сервиса GET /main?date=...: задержки p50/p99 и запросы в секунду.
+
+Запуск сервиса: python main.py serve --port 8000
+Запуск теста: python -m benchmarks.load_test --url http://127.0.0.1:8000 --requests 1000 --concurrency 8
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote, urlparse
+
+
+def make_dates(end: str, days: int) -> list[str]:
+    """
+    Функция формирования списка дат дашборда за последние дни.
+    :param end: Последняя дата.
+    :param days: Количество дней.
+    :return: Список дат в формате YYYY-MM-DD HH:MM:SS.
+    """
+    end_date = datetime.strptime(end, "%Y-%m-%d %H:%M:%S")
+    return [(end_date - timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S") for day in range(days)]
+
+
+def worker(url: str, dates: list[str], count: int, latencies: list[float], errors: list[int]) -> None:
+    """
+    Функция отправки запросов по одному keep-alive соединению.
+    :param url: Адрес сервиса.
+    :param dates: Даты для запросов.
+    :param count: Количество запросов.
+    :param latencies: Список для записи задержек.
+    :param errors: Список для записи статусов ошибок.
+    """
+    address = urlparse(url)
+    connection = http.client.HTTPConnection(address.hostname or "127.0.0.1", address.port)
+    for number in range(count):
+        start = time.perf_counter()
+        connection.request("GET", "/main?date=" + quote(dates[number % len(dates)]))
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            errors.append(response.status)
+    connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--date", default="2021-12-27 08:00:23")
+    parser.add_argument("--days", type=int, default=27)
+    args = parser.parse_args()
+
+    dates = make_dates(args.date, args.days)
+    latencies: list[float] = []
+    errors: list[int] = []
+    per_worker = args.requests // args.concurrency
+    threads = [
+        threading.Thread(target=worker, args=(args.url, dates, per_worker, latencies, errors))
+        for _ in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"requests: {len(latencies)}, errors: {len(errors)}, concurrency: {args.concurrency}")
+    print(f"p50: {quantiles[49] * 1000:.1f} ms, p99: {quantiles[98] * 1000:.1f} ms")
+    print(f"rps: {len(latencies) / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Генератор синтетических выписок в формате Тинькофф заданного размера: несколько карт, категорий,
+статусов и валют операций. Выписка сортируется по убыванию даты, как выгрузка банка.
+
+Запуск: python -m benchmarks.synthetic --rows 100000 --cards 8 --output data/synthetic.xlsx
+"""
+
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook  # type: ignore[import-untyped]
+
+CARDS = ["*7197", "*4556", "*5091", "*5441", "*1112", None]
+CATEGORIES = [
+    ("Супермаркеты", 5411.0, "Колхоз"),
+    ("Супермаркеты", 5411.0, "Магнит"),
+    ("Фастфуд", 5814.0, "McDonald's"),
+    ("Транспорт", 4121.0, "Яндекс Такси"),
+    ("Ж/д билеты", 4112.0, "РЖД"),
+    ("Различные товары", 5399.0, "Ozon.ru"),
+    ("Связь", 4814.0, "МТС"),
+    ("ЖКХ", 4900.0, "ЖКУ Квартира"),
+    ("Переводы", np.nan, "Перевод Кредитная карта. ТП 10.2 RUR"),
+    ("Пополнения", 6012.0, "Перевод с карты"),
+]
+INCOME_CATEGORIES = [8, 9]
+CURRENCIES = {"RUB": 1.0, "USD": 73.5, "EUR": 83.2}
+CURRENCY_WEIGHTS = [0.94, 0.04, 0.02]
+FAILED_SHARE = 0.01
+CASHBACK_SHARE = 0.1
+INVEST_ROUNDING_SHARE = 0.05
+
+
+def make_cards(cards: int | None) -> list[str | None]:
+    """
+    Функция формирования списка номеров карт, последний элемент None - операции без карты.
+    :param cards: Количество карт или None для набора по умолчанию.
+    :return: Список номеров карт.
+    """
+    if cards is None:
+        return CARDS
+    return [f"*{1000 + number * 37 % 9000:04d}" for number in range(cards)] + [None]
+
+
+def make_operations(
+    rows: int,
+    seed: int = 0,
+    end: datetime = datetime(2021, 12, 31, 23, 59, 59),
+    cards: int | None = None,
+    years: int = 4,
+) -> pd.DataFrame:
+    """
+    Функция генерации синтетической выписки в формате Тинькофф, отсортированной по убыванию даты.
+    :param rows: Количество строк.
+    :param seed: Зерно генератора случайных чисел.
+    :param end: Дата последней операции.
+    :param cards: Количество карт или None для набора по умолчанию.
+    :param years: Количество лет истории.
+    :return: DataFrame с операциями.
+    """
+    rng = np.random.default_rng(seed)
+    card_numbers = make_cards(cards)
+    seconds = np.sort(rng.integers(0, years * 365 * 24 * 3600, rows))
+    operation_dates = pd.Timestamp(end) - pd.to_timedelta(seconds, unit="s")
+    categories = rng.integers(0, len(CATEGORIES), rows)
+    amounts = np.round(rng.lognormal(6, 1.2, rows), 2)
+    income = np.isin(categories, INCOME_CATEGORIES)
+    payment_amounts = np.where(income, amounts, -amounts)
+    currencies = np.where(income, "RUB", rng.choice(list(CURRENCIES), rows, p=CURRENCY_WEIGHTS))
+    rates = pd.Series(currencies).map(CURRENCIES).to_numpy()
+    operation_amounts = np.round(payment_amounts / rates, 2)
+    failed = rng.random(rows) < FAILED_SHARE
+    cashback = np.where((rng.random(rows) < CASHBACK_SHARE) & ~income & ~failed, np.floor(amounts / 100), np.nan)
+    invest_rounding = np.where(
+        (rng.random(rows) < INVEST_ROUNDING_SHARE) & ~income & ~failed, np.ceil(amounts / 10) * 10 - amounts, 0
+    ).round(2)
+    return pd.DataFrame(
+        {
+            "Дата операции": operation_dates.strftime("%d.%m.%Y %H:%M:%S"),
+            "Дата платежа": (operation_dates + pd.Timedelta(days=1)).strftime("%d.%m.%Y"),
+            "Номер карты": np.array(card_numbers, dtype=object)[rng.integers(0, len(card_numbers), rows)],
+            "Статус": np.where(failed, "FAILED", "OK"),
+            "Сумма операции": operation_amounts,
+            "Валюта операции": currencies,
+            "Сумма платежа": payment_amounts,
+            "Валюта платежа": "RUB",
+            "Кэшбэк": cashback,
+            "Категория": [CATEGORIES[index][0] for index in categories],
+            "MCC": [CATEGORIES[index][1] for index in categories],
+            "Описание": [CATEGORIES[index][2] for index in categories],
+            "Бонусы (включая кэшбэк)": (amounts // 100).astype(int),
+            "Округление на инвесткопилку": invest_rounding,
+            "Сумма операции с округлением": np.round(amounts + invest_rounding, 2),
+        }
+    )
+
+
+def write_excel(operations: pd.DataFrame, filename: str) -> None:
+    """
+    Функция быстрой записи выписки в Excel в режиме write_only.
+    :param operations: DataFrame с операциями.
+    :param filename: Путь к файлу.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(operations.columns))
+    for row in operations.astype(object).where(operations.notna(), None).itertuples(index=False):
+        sheet.append(list(row))
+    workbook.save(filename)
+
+
+def write_statement(operations: pd.DataFrame, filename: str) -> None:
+    """
+    Функция записи выписки в файл xlsx или csv по расширению.
+    :param operations: DataFrame с операциями.
+    :param filename: Путь к файлу .xlsx или .csv.
+    """
+    if filename.endswith(".csv"):
+        operations.to_csv(filename, index=False)
+    elif filename.endswith(".xlsx"):
+        write_excel(operations, filename)
+    else:
+        raise ValueError(f"Неподдерживаемый формат файла {filename}, ожидается .xlsx или .csv")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cards", type=int, default=None)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=datetime(2021, 12, 31, 23, 59, 59))
+    parser.add_argument("--output", default="data/synthetic.xlsx", help="Файл .xlsx или .csv")
+    args = parser.parse_args()
+
+    operations = make_operations(args.rows, args.seed, args.end, args.cards, args.years)
+    write_statement(operations, args.output)
+    print(f"{args.output}: {len(operations)} строк")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Бенчмарки этапов главной страницы на синтетической выписке с подменой сети.
+
+Запуск: pytest benchmarks --bench-rows 100000 --benchmark-autosave
+Сравнение с сохраненным запуском: pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:25%
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+
+from src.backends import ExcelBackend
+from src.cache import read_operations
+from src.utils import (
+    filter_operations_by_period,
+    get_api_currencies,
+    get_api_stocks,
+    get_period_date,
+    main_cards,
+    read_finance_excel_operation,
+    top_transactions,
+    welcome_text,
+)
+from src.views import page_main
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+DATE = "2021-12-27 08:00:23"
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def period_operations(statement: pd.DataFrame) -> pd.DataFrame:
+    """
+    Фикстура операций синтетической выписки за период главной страницы.
+    :return: DataFrame с операциями за период.
+    """
+    return filter_operations_by_period(statement, get_period_date(DATE))
+
+
+def test_bench_get_period_date(benchmark: BenchmarkFixture) -> None:
+    """
+    [Бенчмарк] Разбор даты и периода.
+    """
+    benchmark(get_period_date, DATE)
+
+
+def test_bench_read_excel_cold(benchmark: BenchmarkFixture, statement_file: str) -> None:
+    """
+    [Бенчмарк] Чтение файла Excel без кэша.
+    """
+    benchmark.pedantic(pd.read_excel, args=(statement_file,), rounds=3, iterations=1)
+
+
+def test_bench_read_operations_cached(benchmark: BenchmarkFixture, statement_file: str) -> None:
+    """
+    [Бенчмарк] Чтение операций через кэш Arrow.
+    """
+    read_operations(statement_file)
+    benchmark(read_operations, statement_file)
+
+
+def test_bench_read_finance_excel_operation(benchmark: BenchmarkFixture, statement_file: str) -> None:
+    """
+    [Бенчмарк] Чтение операций за период через кэш Arrow с фильтрацией.
+    """
+    read_operations(statement_file)
+    benchmark(read_finance_excel_operation, get_period_date(DATE), statement_file)
+
+
+def test_bench_filter_operations_by_period(benchmark: BenchmarkFixture, statement: pd.DataFrame) -> None:
+    """
+    [Бенчмарк] Фильтрация операций по периоду.
+    """
+    benchmark(filter_operations_by_period, statement, get_period_date(DATE))
+
+
+def test_bench_main_cards(benchmark: BenchmarkFixture, period_operations: pd.DataFrame) -> None:
+    """
+    [Бенчмарк] Информация по картам за период.
+    """
+    benchmark(main_cards, period_operations)
+
+
+def test_bench_top_transactions(benchmark: BenchmarkFixture, period_operations: pd.DataFrame) -> None:
+    """
+    [Бенчмарк] ТОП 5 транзакций за период.
+    """
+    benchmark(top_transactions, period_operations)
+
+
+def test_bench_welcome_text(benchmark: BenchmarkFixture) -> None:
+    """
+    [Бенчмарк] Приветствие по времени.
+    """
+    benchmark(welcome_text, DATE)
+
+
+def test_bench_get_api_currencies(benchmark: BenchmarkFixture) -> None:
+    """
+    [Бенчмарк] Курсы валют без кэша с подменой сети.
+    """
+    benchmark(get_api_currencies, ["USD", "EUR"])
+
+
+def test_bench_get_api_stocks(benchmark: BenchmarkFixture) -> None:
+    """
+    [Бенчмарк] Стоимость акции без кэша с подменой сети.
+    """
+    benchmark(get_api_stocks, "AAPL")
+
+
+def test_bench_page_main(benchmark: BenchmarkFixture, statement_file: str) -> None:
+    """
+    [Бенчмарк] Главная страница целиком: чтение через кэш Arrow, агрегация и курсы из кэша ответов API.
+    """
+    backend = ExcelBackend(statement_file)
+    page_main(DATE, backend)
+    result = benchmark(page_main, DATE, backend)
+    assert result["cards"]
@@ -1,5 +1,87 @@
-from src.views import page_main
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+
+from src.backends import SqliteBackend
+from src.ingest import STORE_DIR, PersistentStore
+from src.instrumentation import write_metrics
+from src.log_setup import set_log_level
+from src.parallel import analyze_workbooks
+from src.rollups import RollupTable
+from src.server import serve
+from src.store import TransactionStore
+from src.utils import get_period_date
+from src.views import page_main, page_main_batch
 
 if __name__ == "__main__":
-    data = page_main("2021-12-27 08:00:23")
-    print(data)
+    parser = argparse.ArgumentParser(description="Анализ банковских операций")
+    parser.add_argument("--store", nargs="?", const=STORE_DIR, help="Читать операции из постоянного хранилища")
+    parser.add_argument("--timings", action="store_true", help="Добавить в ответ главной страницы блок _timings")
+    parser.add_argument("--metrics-file", help="Записать метрики вызовов в файл в формате Prometheus")
+    parser.add_argument(
+        "--log-level", help="Уровень журналов log/*.log, например WARNING, чтобы отключить строки INFO"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    serve_parser = subparsers.add_parser("serve", help="Запуск HTTP сервиса GET /main?date=...")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    batch_parser = subparsers.add_parser("batch", help="Главная страница для многих дат в формате JSON Lines")
+    batch_parser.add_argument("dates", nargs="*", help="Даты формата 'YYYY-MM-DD HH:MM:SS'")
+    batch_parser.add_argument("--dates-file", help="Файл с датами, по одной на строке")
+    batch_parser.add_argument("--output", help="Файл результата, по умолчанию стандартный вывод")
+    analyze_parser = subparsers.add_parser("analyze", help="Параллельный анализ нескольких выписок по шаблону пути")
+    analyze_parser.add_argument("pattern", help="Шаблон пути к файлам Excel, например 'data/*.xlsx'")
+    analyze_parser.add_argument("--date", default="2021-12-27 08:00:23")
+    analyze_parser.add_argument("--workers", type=int, default=None, help="Количество процессов")
+    analyze_parser.add_argument("--top", type=int, default=5, help="Количество ТОП транзакций")
+    ingest_parser = subparsers.add_parser("ingest", help="Загрузка новой выписки в постоянное хранилище")
+    ingest_parser.add_argument("filenames", nargs="+", help="Файлы Excel с выписками")
+    report_parser = subparsers.add_parser("report", help="Отчет по картам, категориям и кэшбэку из агрегатов")
+    report_parser.add_argument("--start", type=date.fromisoformat, default=date(2021, 12, 1))
+    report_parser.add_argument("--end", type=date.fromisoformat, default=date(2021, 12, 31))
+    import_parser = subparsers.add_parser("import-sqlite", help="Импорт файла Excel в хранилище SQLite")
+    import_parser.add_argument("filename", nargs="?", default="data/operations.xlsx")
+    import_parser.add_argument("--path", default=None, help="Путь к файлу базы SQLite")
+    args = parser.parse_args()
+    if args.log_level:
+        set_log_level(args.log_level.upper())
+    store = PersistentStore(args.store).load() if args.store and args.command in ("batch", None) else None
+
+    if args.command == "serve":
+        asyncio.run(serve(args.host, args.port))
+    elif args.command == "batch":
+        dates = list(args.dates)
+        if args.dates_file:
+            with open(args.dates_file, encoding="utf-8") as file:
+                dates += [line.strip() for line in file if line.strip()]
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        with output:
+            for page in page_main_batch(dates, store):
+                output.write(json.dumps(page, ensure_ascii=False) + "\n")
+    elif args.command == "analyze":
+        result = analyze_workbooks(args.pattern, get_period_date(args.date), args.top, args.workers)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif args.command == "ingest":
+        persistent_store = PersistentStore(args.store or STORE_DIR)
+        for filename in args.filenames:
+            print(f"{filename}: добавлено строк {len(persistent_store.ingest_excel(filename))}")
+    elif args.command == "import-sqlite":
+        (SqliteBackend(args.path) if args.path else SqliteBackend()).import_excel(args.filename)
+        print(f"{args.filename}: импортирован в SQLite")
+    elif args.command == "report":
+        rollups = PersistentStore(args.store).rollups() if args.store else None
+        if rollups is None:
+            rollups = RollupTable.from_operations(TransactionStore.from_excel().operations)
+        report = {
+            "cards": rollups.card_summary(args.start, args.end),
+            "categories": rollups.category_report(args.start, args.end),
+            "cashback": rollups.cashback_report(args.start, args.end),
+        }
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        data = page_main("2021-12-27 08:00:23", store, args.timings)
+        print(data)
+    if args.metrics_file:
+        write_metrics(args.metrics_file)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import OPERATION_DATE_FORMAT
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+WINDOWS = (7, 30, 90)
+BASELINE_DAYS = 90
+MIN_HISTORY = 10
+Z_THRESHOLD = 3.0
+
+analytics_logger = get_logger(__name__, "analytics")
+
+
+class CardRollingStats:
+    """
+    Скользящая статистика трат одной карты вдоль отсортированной по дате ленты операций.
+    Накопленные суммы трат, квадратов трат и кэшбэка дают итоги любого окна за O(log n), а для каждой операции
+    хранится отклонение суммы от среднего операций карты за предыдущие BASELINE_DAYS дней (z-оценка).
+    Окна смотрят только назад, поэтому при добавлении более поздних строк считаются только новые строки.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.operation_dates = np.empty(0, dtype="datetime64[s]")
+        self.amounts = np.zeros(0)
+        self.cashback = np.zeros(0)
+        self.z_scores = np.zeros(0)
+        self.baseline_mean = np.zeros(0)
+        self.categories = np.zeros(0, dtype=np.int32)
+        self.descriptions = np.zeros(0, dtype=np.int32)
+        self.prefix = np.zeros((3, 1))
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Функция увеличения емкости буферов с удвоением.
+        :param capacity: Требуемое количество строк.
+        """
+        if capacity <= len(self.operation_dates):
+            return
+        new_capacity = max(capacity, 2 * len(self.operation_dates), 16)
+        for name in (
+            "operation_dates",
+            "amounts",
+            "cashback",
+            "z_scores",
+            "baseline_mean",
+            "categories",
+            "descriptions",
+        ):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+        prefix = np.zeros((3, new_capacity + 1))
+        prefix[:, : self.size + 1] = self.prefix[:, : self.size + 1]
+        self.prefix = prefix
+
+    def append(
+        self,
+        operation_dates: np.ndarray,
+        amounts: np.ndarray,
+        cashback: np.ndarray,
+        categories: np.ndarray,
+        descriptions: np.ndarray,
+    ) -> None:
+        """
+        Функция добавления строк карты, отсортированных по дате.
+        Если новые строки раньше уже добавленных, пересчитываются только строки начиная с первой новой даты.
+        :param operation_dates: Даты операций datetime64[s].
+        :param amounts: Суммы операций с округлением.
+        :param cashback: Кэшбэк.
+        :param categories: Коды категорий в словаре SpendingAnalytics.
+        :param descriptions: Коды описаний в словаре SpendingAnalytics.
+        """
+        columns = [operation_dates, amounts, cashback, categories, descriptions]
+        if self.size and len(operation_dates) and operation_dates[0] < self.operation_dates[self.size - 1]:
+            position = int(np.searchsorted(self.operation_dates[: self.size], operation_dates[0], side="right"))
+            tail = slice(position, self.size)
+            old_columns = [self.operation_dates, self.amounts, self.cashback, self.categories, self.descriptions]
+            columns = [np.concatenate([old[tail], new]) for old, new in zip(old_columns, columns)]
+            order = np.argsort(columns[0], kind="stable")
+            columns = [column[order] for column in columns]
+            self.size = position
+        operation_dates, amounts, cashback, categories, descriptions = columns
+        start, end = self.size, self.size + len(operation_dates)
+        self._reserve(end)
+        rows, prefix_rows = slice(start, end), slice(start + 1, end + 1)
+        self.operation_dates[rows] = operation_dates
+        self.amounts[rows] = amounts
+        self.cashback[rows] = cashback
+        self.categories[rows] = categories
+        self.descriptions[rows] = descriptions
+        self.prefix[:, prefix_rows] = self.prefix[:, [start]] + np.cumsum([amounts, amounts**2, cashback], axis=1)
+        self.size = end
+        self._score(start, end)
+
+    def _score(self, start: int, end: int) -> None:
+        """
+        Функция расчета z-оценок строк [start, end) по предыдущим операциям карты за BASELINE_DAYS дней.
+        :param start: Первая строка.
+        :param end: Строка после последней.
+        """
+        operation_dates = self.operation_dates[: self.size]
+        rows = np.arange(start, end)
+        low = np.searchsorted(operation_dates, operation_dates[rows] - np.timedelta64(BASELINE_DAYS, "D"), side="left")
+        count = rows - low
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = (self.prefix[0, rows] - self.prefix[0, low]) / count
+            variance = (self.prefix[1, rows] - self.prefix[1, low]) / count - mean**2
+            z_scores = (self.amounts[rows] - mean) / np.sqrt(np.maximum(variance, 0))
+        enough = (count >= MIN_HISTORY) & np.isfinite(z_scores)
+        self.z_scores[start:end] = np.where(enough, z_scores, 0.0)
+        self.baseline_mean[start:end] = np.where(count > 0, mean, 0.0)
+
+    def bounds(self, start: datetime, end: datetime) -> tuple[int, int]:
+        """
+        Функция поиска строк карты за период.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Индексы начала и конца среза.
+        """
+        operation_dates = self.operation_dates[: self.size]
+        low = int(np.searchsorted(operation_dates, np.datetime64(start, "s"), side="left"))
+        high = int(np.searchsorted(operation_dates, np.datetime64(end, "s"), side="right"))
+        return low, max(low, high)
+
+    def window(self, end: datetime, days: int) -> dict:
+        """
+        Функция итогов карты за days дней, заканчивающихся датой end.
+        :param end: Конец окна включительно.
+        :param days: Длина окна в днях.
+        :return: Количество операций, траты, кэшбэк и доля кэшбэка в процентах.
+        """
+        low, high = self.bounds(end - timedelta(days=days), end)
+        spent = float(self.prefix[0, high] - self.prefix[0, low])
+        cashback = float(self.prefix[2, high] - self.prefix[2, low])
+        return {
+            "count": high - low,
+            "spent": round(spent, 2),
+            "cashback": round(cashback, 2),
+            "cashback_rate": round(100 * cashback / spent, 2) if spent else 0.0,
+        }
+
+    def anomalies(self, start: datetime, end: datetime, names: list[str | None]) -> list[dict]:
+        """
+        Функция вывода операций периода, сумма которых отклоняется от среднего карты больше чем на Z_THRESHOLD
+        стандартных отклонений.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :param names: Словарь категорий и описаний: код - значение, последний элемент None для пустых значений.
+        :return: Список операций по убыванию z-оценки.
+        """
+        low, high = self.bounds(start, end)
+        rows = low + np.flatnonzero(self.z_scores[low:high] >= Z_THRESHOLD)
+        rows = rows[np.argsort(-self.z_scores[rows], kind="stable")]
+        return [
+            {
+                "date": self.operation_dates[row].astype(datetime).strftime(OPERATION_DATE_FORMAT),
+                "amount": float(self.amounts[row]),
+                "category": names[self.categories[row]],
+                "description": names[self.descriptions[row]],
+                "baseline_mean": round(float(self.baseline_mean[row]), 2),
+                "z_score": round(float(self.z_scores[row]), 2),
+            }
+            for row in rows.tolist()
+        ]
+
+
+class SpendingAnalytics:
+    """
+    Скользящая статистика трат и аномальные операции по всем картам.
+    """
+
+    def __init__(self) -> None:
+        self.cards: dict[str, CardRollingStats] = {}
+        self.labels: dict[str, int] = {}
+        self.names: list[str | None] = []
+
+    def _encode(self, values: pd.Series) -> np.ndarray:
+        """
+        Функция кодирования категорий или описаний номерами в общем словаре, чтобы не хранить строки по строкам.
+        :param values: Значения столбца.
+        :return: Коды значений, -1 для пустых.
+        """
+        codes, uniques = pd.factorize(values)
+        mapping = np.full(len(uniques) + 1, -1, dtype=np.int32)
+        for code, value in enumerate(uniques):
+            if value not in self.labels:
+                self.labels[value] = len(self.names)
+                self.names.append(value)
+            mapping[code] = self.labels[value]
+        return mapping[codes]
+
+    def append(self, operations: pd.DataFrame, operation_dates: np.ndarray) -> None:
+        """
+        Функция добавления операций, отсортированных по дате, с расчетом статистики только новых строк.
+        :param operations: DataFrame с операциями в формате выписки.
+        :param operation_dates: Даты операций в виде datetime64[s].
+        """
+        codes, uniques = pd.factorize(operations["Номер карты"])
+        rows = np.flatnonzero(codes >= 0)
+        order = rows[np.argsort(codes[rows], kind="stable")]
+        boundaries = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        columns = [
+            operation_dates,
+            np.nan_to_num(operations["Сумма операции с округлением"].to_numpy(dtype=float)),
+            np.nan_to_num(operations["Кэшбэк"].to_numpy(dtype=float)),
+            self._encode(operations["Категория"]),
+            self._encode(operations["Описание"]),
+        ]
+        columns = [column[order] for column in columns]
+        for code, card_num in enumerate(uniques):
+            card_rows = slice(boundaries[code], boundaries[code + 1])
+            card = self.cards.setdefault(str(card_num), CardRollingStats())
+            card.append(*(column[card_rows] for column in columns))
+        analytics_logger.info("Статистика трат обновлена, строк: %s, карт: %s", len(rows), len(uniques))
+
+    def summary(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Функция скользящих итогов за 7, 30 и 90 дней до даты end и аномальных операций периода по картам.
+        :param start: Начало периода аномальных операций включительно.
+        :param end: Конец окон и периода включительно.
+        :return: Список карт с окнами и аномальными операциями.
+        """
+        cards = []
+        for card_num in sorted(self.cards):
+            card = self.cards[card_num]
+            windows = {f"{days}d": card.window(end, days) for days in WINDOWS}
+            if windows[f"{WINDOWS[-1]}d"]["count"]:
+                cards.append(
+                    {
+                        "last_digits": card_num[-4:],
+                        "windows": windows,
+                        "anomalies": card.anomalies(start, end, self.names + [None]),
+                    }
+                )
+        return cards
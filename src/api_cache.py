@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+from src.log_setup import get_logger
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_CACHE_PATH = ROOT_DIR + "/data/api_cache.sqlite"
+DEFAULT_TTL = {"currency": 6 * 3600.0, "stocks": 15 * 60.0}
+DEFAULT_MAX_ITEMS = 1024
+
+api_cache_logger = get_logger(__name__, "api_cache")
+
+CacheKey = tuple[str, str, str]
+
+
+class ApiCache:
+    """
+    Кэш ответов API с TTL, LRU ограничением в памяти и хранением на диске в SQLite.
+    Устаревшее значение отдается сразу, а обновление выполняется в фоне (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        path: str | None = API_CACHE_PATH,
+        ttl: dict[str, float] | None = None,
+        max_items: int = DEFAULT_MAX_ITEMS,
+    ) -> None:
+        """
+        :param path: Путь к файлу SQLite или None для кэша только в памяти.
+        :param ttl: Время жизни значений в секундах по провайдерам.
+        :param max_items: Максимальное количество значений в памяти.
+        """
+        self.path = path
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.max_items = max_items
+        self.memory: OrderedDict[CacheKey, tuple[float, float]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.refreshing: set[CacheKey] = set()
+        self.connection: sqlite3.Connection | None = None
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-cache")
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """
+        Функция ленивого открытия файла SQLite. Вызывается под блокировкой.
+        :return: Соединение или None, если хранение на диске отключено.
+        """
+        if self.path is None:
+            return None
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS api_cache ("
+                "provider TEXT, symbol TEXT, date TEXT, value REAL, stored_at REAL, "
+                "PRIMARY KEY (provider, symbol, date))"
+            )
+        return self.connection
+
+    def _remember(self, key: CacheKey, entry: tuple[float, float]) -> None:
+        """
+        Функция сохранения значения в памяти с вытеснением самых старых. Вызывается под блокировкой.
+        :param key: Ключ (провайдер, символ, дата).
+        :param entry: Значение и время сохранения.
+        """
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def get(self, key: CacheKey) -> tuple[float, float] | None:
+        """
+        Функция получения значения из памяти или с диска.
+        :param key: Ключ (провайдер, символ, дата).
+        :return: Значение и время сохранения или None.
+        """
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+            connection = self._connect()
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT value, stored_at FROM api_cache WHERE provider = ? AND symbol = ? AND date = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            self._remember(key, (row[0], row[1]))
+            return self.memory[key]
+
+    def set(self, key: CacheKey, value: float) -> None:
+        """
+        Функция сохранения значения в памяти и на диске.
+        :param key: Ключ (провайдер, символ, дата).
+        :param value: Значение.
+        """
+        entry = (value, time.time())
+        with self.lock:
+            self._remember(key, entry)
+            connection = self._connect()
+            if connection is not None:
+                connection.execute("INSERT OR REPLACE INTO api_cache VALUES (?, ?, ?, ?, ?)", (*key, *entry))
+                connection.commit()
+
+    def _refresh(
+        self, provider: str, symbols: list[str], fetch_many: Callable[[list[str]], dict[str, float]], date: str
+    ) -> None:
+        """
+        Функция фонового обновления устаревших значений одним запросом.
+        :param provider: Провайдер данных.
+        :param symbols: Символы с устаревшими значениями.
+        :param fetch_many: Функция запроса значений у API.
+        :param date: Дата значений.
+        """
+        try:
+            for symbol, value in fetch_many(symbols).items():
+                if value:
+                    self.set((provider, symbol, date), value)
+            api_cache_logger.info("Значения %s %s обновлены в фоне", provider, symbols)
+        except Exception:
+            api_cache_logger.warning("Не удалось обновить значения %s %s, остаются устаревшие", provider, symbols)
+        finally:
+            with self.lock:
+                self.refreshing.difference_update((provider, symbol, date) for symbol in symbols)
+
+    def get_many_or_fetch(
+        self,
+        provider: str,
+        symbols: list[str],
+        fetch_many: Callable[[list[str]], dict[str, float]],
+        date: str | None = None,
+    ) -> dict[str, float]:
+        """
+        Функция получения значений из кэша с запросом всех отсутствующих символов одним вызовом API.
+        Нулевые значения (ошибка API) не кэшируются.
+        :param provider: Провайдер данных, например "currency" или "stocks".
+        :param symbols: Валюты или тикеры.
+        :param fetch_many: Функция запроса значений у API по списку символов.
+        :param date: Дата значений, по умолчанию текущая.
+        :return: Словарь символ - значение.
+        """
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        values: dict[str, float] = {}
+        missing, stale = [], []
+        for symbol in symbols:
+            entry = self.get((provider, symbol, date))
+            if entry is None:
+                missing.append(symbol)
+                continue
+            values[symbol], stored_at = entry
+            if time.time() - stored_at > self.ttl.get(provider, 0):
+                with self.lock:
+                    if (provider, symbol, date) not in self.refreshing:
+                        self.refreshing.add((provider, symbol, date))
+                        stale.append(symbol)
+        if stale:
+            self.executor.submit(self._refresh, provider, stale, fetch_many, date)
+        if missing:
+            fetched = fetch_many(missing)
+            for symbol in missing:
+                values[symbol] = fetched.get(symbol, 0)
+                if values[symbol]:
+                    self.set((provider, symbol, date), values[symbol])
+        return values
+
+    def get_or_fetch(self, provider: str, symbol: str, fetch: Callable[[], float], date: str | None = None) -> float:
+        """
+        Функция получения значения из кэша или запроса его у API.
+        Нулевые значения (ошибка API) не кэшируются.
+        :param provider: Провайдер данных, например "currency" или "stocks".
+        :param symbol: Валюта или тикер.
+        :param fetch: Функция запроса значения у API.
+        :param date: Дата значения, по умолчанию текущая.
+        :return: Значение.
+        """
+        return self.get_many_or_fetch(provider, [symbol], lambda symbols: {symbol: fetch()}, date)[symbol]
+
+    def clear(self) -> None:
+        """
+        Функция очистки кэша в памяти и на диске.
+        """
+        with self.lock:
+            self.memory.clear()
+            connection = self._connect()
+            if connection is not None:
+                connection.execute("DELETE FROM api_cache")
+                connection.commit()
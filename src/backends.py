@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import FIELD_COLUMNS, parse_operation_dates
+from src.settings import UserSettings, get_settings
+from src.utils import ROOT_DIR, main_cards, read_finance_excel_operation, top_transactions
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+SQLITE_PATH = ROOT_DIR + "/data/operations.sqlite"
+SQL_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+backends_logger = get_logger(__name__, "backends")
+
+
+class StorageBackend(ABC):
+    """
+    Интерфейс хранилища транзакций для главной страницы: операции, сводка по картам и ТОП за период.
+    """
+
+    @abstractmethod
+    def read_period(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Функция получения операций за период.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: DataFrame с операциями в формате выписки.
+        """
+
+    @abstractmethod
+    def card_summary(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Функция вывода информации по картам за период в формате main_cards.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Информация по картам.
+        """
+
+    @abstractmethod
+    def top_transactions(self, start: datetime, end: datetime, k: int = 5) -> list[dict]:
+        """
+        Функция возврата ТОП K транзакций за период в формате top_transactions.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :param k: Количество транзакций.
+        :return: Список ТОП K транзакций.
+        """
+
+    def period_summary(self, start: datetime, end: datetime, k: int = 5) -> tuple[list[dict], list[dict]]:
+        """
+        Функция расчета сводки по картам и ТОП K транзакций для главной страницы.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :param k: Количество транзакций.
+        :return: Информация по картам и список ТОП K транзакций.
+        """
+        return self.card_summary(start, end), self.top_transactions(start, end, k)
+
+
+class ExcelBackend(StorageBackend):
+    """
+    Хранилище на файле Excel: операции читаются через кэш Arrow и фильтруются в pandas.
+    """
+
+    def __init__(self, filename: str = ROOT_DIR + "/data/operations.xlsx") -> None:
+        """
+        :param filename: Путь к файлу Excel.
+        """
+        self.filename = filename
+
+    def read_period(self, start: datetime, end: datetime) -> pd.DataFrame:
+        return read_finance_excel_operation((end, start), self.filename)
+
+    def card_summary(self, start: datetime, end: datetime) -> list[dict]:
+        return main_cards(self.read_period(start, end))
+
+    def top_transactions(self, start: datetime, end: datetime, k: int = 5) -> list[dict]:
+        return top_transactions(self.read_period(start, end), k)
+
+    def period_summary(self, start: datetime, end: datetime, k: int = 5) -> tuple[list[dict], list[dict]]:
+        operations = self.read_period(start, end)
+        return main_cards(operations), top_transactions(operations, k)
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Встроенное хранилище SQLite с индексами по дате операции и номеру карты.
+    Фильтр периода, группировка по картам и ТОП K выполняются SQL запросами по индексу даты.
+    """
+
+    def __init__(self, path: str = SQLITE_PATH) -> None:
+        """
+        :param path: Путь к файлу базы SQLite.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+    def import_operations(self, operations: pd.DataFrame) -> None:
+        """
+        Функция загрузки операций в базу с заменой таблицы и построением индексов.
+        Порядок строк выписки сохраняется в rowid, чтобы ничьи в ТОП решались как в pandas.
+        :param operations: DataFrame с операциями в формате выписки.
+        """
+        table = operations[list(FIELD_COLUMNS.values())].set_axis(list(FIELD_COLUMNS), axis=1)
+        operation_dates = pd.DatetimeIndex(parse_operation_dates(operations["Дата операции"]))
+        table.insert(0, "operation_ts", operation_dates.strftime(SQL_DATE_FORMAT))
+        with self.lock, self.connection:
+            table.to_sql("operations", self.connection, if_exists="replace", index=False)
+            self.connection.execute("CREATE INDEX idx_operations_ts ON operations (operation_ts)")
+            self.connection.execute("CREATE INDEX idx_operations_card ON operations (card_number, operation_ts)")
+        backends_logger.info("В SQLite загружено строк: %s", len(table))
+
+    def import_excel(self, filename: str = ROOT_DIR + "/data/operations.xlsx") -> None:
+        """
+        Функция импорта файла Excel в базу SQLite.
+        :param filename: Путь к файлу Excel.
+        """
+        self.import_operations(pd.read_excel(filename))
+
+    def _query(self, sql: str, parameters: tuple) -> list[tuple]:
+        """
+        Функция выполнения запроса под блокировкой соединения.
+        :param sql: Текст запроса.
+        :param parameters: Параметры запроса.
+        :return: Список строк результата.
+        """
+        with self.lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    @staticmethod
+    def _value(value: object) -> object:
+        """
+        Функция замены NULL SQLite на NaN, как в пустых ячейках DataFrame выписки.
+        :param value: Значение столбца.
+        :return: Значение или NaN.
+        """
+        return float("nan") if value is None else value
+
+    @staticmethod
+    def _period(start: datetime, end: datetime) -> tuple[str, str]:
+        return start.strftime(SQL_DATE_FORMAT), end.strftime(SQL_DATE_FORMAT)
+
+    def read_period(self, start: datetime, end: datetime) -> pd.DataFrame:
+        rows = self._query(
+            f"SELECT {', '.join(FIELD_COLUMNS)} FROM operations WHERE operation_ts BETWEEN ? AND ? ORDER BY rowid",
+            self._period(start, end),
+        )
+        return pd.DataFrame(rows, columns=list(FIELD_COLUMNS.values()))
+
+    def card_summary(self, start: datetime, end: datetime) -> list[dict]:
+        rows = self._query(
+            "SELECT card_number, COALESCE(SUM(rounded_amount), 0), TOTAL(cashback) FROM operations "
+            "WHERE operation_ts BETWEEN ? AND ? AND card_number IS NOT NULL "
+            "GROUP BY card_number ORDER BY card_number",
+            self._period(start, end),
+        )
+        if not rows:
+            backends_logger.error("Empty DataFrame - данные пусты, поменяйте дату")
+            raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
+        return [
+            {
+                "last_digits": str(card_num)[-4:],
+                "total_spent": round(float(spent), 2),
+                "cashback": round(float(cashback), 2),
+            }
+            for card_num, spent, cashback in rows
+        ]
+
+    def top_transactions(self, start: datetime, end: datetime, k: int = 5) -> list[dict]:
+        rows = self._query(
+            "SELECT payment_date, rounded_amount, category, description FROM operations "
+            "WHERE operation_ts BETWEEN ? AND ? AND rounded_amount IS NOT NULL "
+            "ORDER BY rounded_amount DESC, rowid LIMIT ?",
+            (*self._period(start, end), k),
+        )
+        return [
+            {
+                "date": self._value(payment_date),
+                "amount": float(amount),
+                "category": self._value(category),
+                "description": self._value(description),
+            }
+            for payment_date, amount, category, description in rows
+        ]
+
+
+BACKENDS = {"excel": ExcelBackend, "sqlite": SqliteBackend}
+_backends: dict[tuple[str, str | None], StorageBackend] = {}
+
+
+def get_backend(settings: UserSettings | dict | None = None) -> StorageBackend:
+    """
+    Функция выбора хранилища транзакций по ключам "storage_backend" и "storage_path" файла user_settings.json.
+    Экземпляры хранилищ переиспользуются между вызовами.
+    :param settings: Пользовательские настройки или словарь с ключами хранилища.
+    Если не переданы, берутся из кэша user_settings.json.
+    :return: Хранилище транзакций.
+    """
+    if isinstance(settings, dict):
+        name, path = settings.get("storage_backend", "excel"), settings.get("storage_path")
+    else:
+        settings = settings or get_settings()
+        name, path = settings.storage_backend, settings.storage_path
+    if name not in BACKENDS:
+        backends_logger.error("Неизвестное хранилище %s", name)
+        raise ValueError(f"Неизвестное хранилище {name}, доступны: {', '.join(BACKENDS)}")
+    if (name, path) not in _backends:
+        _backends[(name, path)] = BACKENDS[name](os.path.join(ROOT_DIR, path)) if path else BACKENDS[name]()
+    return _backends[(name, path)]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa  # type: ignore[import-untyped]
+else:
+    pd = lazy_import("pandas")
+    pa = lazy_import("pyarrow")
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = ROOT_DIR + "/data/cache"
+
+cache_logger = get_logger(__name__, "cache")
+
+
+def get_source_signature(filename: str) -> dict[str, str]:
+    """
+    Функция получения подписи файла Excel: путь, время изменения и размер.
+    :param filename: Путь к файлу Excel.
+    :return: Словарь с подписью файла.
+    """
+    stat = os.stat(filename)
+    return {
+        "path": os.path.abspath(filename),
+        "mtime_ns": str(stat.st_mtime_ns),
+        "size": str(stat.st_size),
+    }
+
+
+def get_cache_path(filename: str, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Функция получения пути к файлу кэша Arrow для файла Excel.
+    :param filename: Путь к файлу Excel.
+    :param cache_dir: Директория кэша.
+    :return: Путь к файлу кэша.
+    """
+    path_hash = hashlib.sha1(os.path.abspath(filename).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"operations_{path_hash}.arrow")
+
+
+def load_operations_cache(filename: str, cache_dir: str = CACHE_DIR) -> pd.DataFrame | None:
+    """
+    Функция чтения кэша операций через memory-map, если он соответствует текущему файлу Excel.
+    :param filename: Путь к файлу Excel.
+    :param cache_dir: Директория кэша.
+    :return: DataFrame с операциями или None, если кэш отсутствует или устарел.
+    """
+    cache_path = get_cache_path(filename, cache_dir)
+    if pa is None or not os.path.exists(cache_path):
+        return None
+    try:
+        with pa.memory_map(cache_path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            metadata = {key.decode(): value.decode() for key, value in (reader.schema.metadata or {}).items()}
+            signature = get_source_signature(filename)
+            if any(metadata.get(key) != value for key, value in signature.items()):
+                cache_logger.info("Кэш операций устарел и будет перестроен")
+                return None
+            table = reader.read_all()
+        cache_logger.info("Операции загружены из кэша Arrow")
+        cached_data: pd.DataFrame = table.to_pandas()
+        return cached_data
+    except (OSError, pa.ArrowException):
+        cache_logger.warning("Файл кэша поврежден, будет использован файл Excel")
+        return None
+
+
+def build_operations_cache(filename: str, cache_dir: str = CACHE_DIR) -> pd.DataFrame:
+    """
+    Функция чтения файла Excel и сохранения его в колоночный кэш Arrow IPC.
+    :param filename: Путь к файлу Excel.
+    :param cache_dir: Директория кэша.
+    :return: DataFrame с операциями.
+    """
+    signature = get_source_signature(filename)
+    excel_data = pd.read_excel(filename)
+    if pa is None:
+        cache_logger.warning("pyarrow не установлен, кэш операций не создается")
+        return excel_data
+    cache_path = get_cache_path(filename, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        table = pa.Table.from_pandas(excel_data, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **signature})
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, cache_path)
+        cache_logger.info("Кэш операций успешно создан")
+    except (OSError, pa.ArrowException):
+        cache_logger.warning("Не удалось записать кэш операций, продолжаем без кэша")
+    return excel_data
+
+
+def read_operations(filename: str, cache_dir: str = CACHE_DIR) -> pd.DataFrame:
+    """
+    Функция чтения операций: из кэша Arrow, если он актуален, иначе из Excel с пересборкой кэша.
+    :param filename: Путь к файлу Excel.
+    :param cache_dir: Директория кэша.
+    :return: DataFrame с операциями.
+    """
+    cached_data = load_operations_cache(filename, cache_dir)
+    if cached_data is not None:
+        return cached_data
+    return build_operations_cache(filename, cache_dir)
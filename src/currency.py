@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import os
+import threading
+from datetime import timedelta
+from typing import TYPE_CHECKING, Iterable
+
+import src.utils
+from src.instrumentation import timed
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import parse_operation_dates
+from src.utils import ROOT_DIR, get_http_session
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+RATES_DIR = ROOT_DIR + "/data"
+TIMESERIES_MAX_DAYS = 365
+AMOUNT_COLUMNS = {
+    "Сумма операции": "Валюта операции",
+    "Сумма платежа": "Валюта платежа",
+    "Сумма операции с округлением": "Валюта платежа",
+}
+
+currency_logger = get_logger(__name__, "currency")
+
+
+class RateTable:
+    """
+    Таблица исторических курсов валют к базовой валюте: строки - дни, столбцы - валюты.
+    Курс на день без котировки (выходные, праздники) берется с последнего предыдущего дня с котировкой.
+    """
+
+    def __init__(self, base: str, rates: pd.DataFrame | None = None) -> None:
+        """
+        :param base: Базовая валюта отчета, например "RUB".
+        :param rates: DataFrame курсов: индекс - дни datetime64, столбцы - валюты, значение - цена единицы валюты.
+        """
+        self.base = base
+        self.rates = pd.DataFrame(dtype="float64") if rates is None else rates.sort_index()
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """
+        Функция подготовки массивов для векторного поиска курсов.
+        """
+        self.days = self.rates.index.to_numpy().astype("datetime64[D]")
+        self.filled = self.rates.ffill().to_numpy(dtype="float64")
+
+    def update(self, rates: pd.DataFrame) -> None:
+        """
+        Функция добавления курсов, новые значения заменяют старые на те же дни.
+        :param rates: DataFrame курсов в формате таблицы.
+        """
+        self.rates = rates.combine_first(self.rates).sort_index()
+        self._build_index()
+
+    def missing(self, currencies: np.ndarray, days: np.ndarray) -> dict[str, tuple[np.datetime64, np.datetime64]]:
+        """
+        Функция поиска диапазонов дней, не покрытых таблицей, по каждой валюте.
+        :param currencies: Массив валют.
+        :param days: Массив дней datetime64[D] той же длины.
+        :return: Словарь валюта - (первый, последний) день, которые нужно запросить.
+        """
+        ranges = {}
+        pairs = pd.DataFrame({"currency": currencies, "day": days}).drop_duplicates()
+        for currency, currency_days in pairs.groupby("currency")["day"]:
+            values = currency_days.to_numpy().astype("datetime64[D]")
+            column = self.rates[currency].dropna() if currency in self.rates else None
+            if column is None or column.empty:
+                uncovered = values
+            else:
+                first, last = column.index.to_numpy().astype("datetime64[D]")[[0, -1]]
+                uncovered = values[(values < first) | (values > last)]
+            if len(uncovered):
+                ranges[str(currency)] = (uncovered.min(), uncovered.max())
+        return ranges
+
+    def lookup(self, currencies: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        Функция векторного поиска курсов по парам (валюта, день).
+        :param currencies: Массив валют.
+        :param days: Массив дней datetime64[D] той же длины.
+        :return: Массив курсов к базовой валюте, 1 для базовой валюты, NaN для пар без курса.
+        """
+        result = np.full(len(currencies), np.nan)
+        result[currencies == self.base] = 1.0
+        if self.rates.empty:
+            return result
+        rows = np.searchsorted(self.days, days, side="right") - 1
+        columns = self.rates.columns.get_indexer(pd.Index(currencies))
+        found = (rows >= 0) & (columns >= 0)
+        result[found] = self.filled[rows[found], columns[found]]
+        return result
+
+    @classmethod
+    def load(cls, path: str, base: str) -> "RateTable":
+        """
+        Функция чтения таблицы курсов из файла CSV с колонками date, currency, rate.
+        :param path: Путь к файлу курсов.
+        :param base: Базовая валюта.
+        :return: Таблица курсов.
+        """
+        records = pd.read_csv(path, parse_dates=["date"])
+        return cls(base, records.pivot_table(index="date", columns="currency", values="rate", aggfunc="last"))
+
+    def save(self, path: str) -> None:
+        """
+        Функция записи таблицы курсов в файл CSV с колонками date, currency, rate.
+        :param path: Путь к файлу курсов.
+        """
+        records = (
+            self.rates.rename_axis(index="date", columns="currency")
+            .melt(value_name="rate", ignore_index=False)
+            .dropna()
+            .reset_index()
+        )
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        records.to_csv(tmp_path, index=False, date_format="%Y-%m-%d")
+        os.replace(tmp_path, path)
+
+
+@timed
+def get_api_timeseries(currencies: list[str], start: np.datetime64, end: np.datetime64, base: str) -> pd.DataFrame:
+    """
+    Функция получения исторических курсов валют за период одним запросом API timeseries на каждые 365 дней.
+    Запрашиваются курсы базовой валюты к переданным валютам, курс валюты к базовой - обратная величина.
+    :param currencies: Список валют.
+    :param start: Первый день.
+    :param end: Последний день.
+    :param base: Базовая валюта.
+    :return: DataFrame курсов в формате RateTable.
+    """
+    frames = []
+    window_start = start.astype("O")
+    last_day = end.astype("O")
+    while window_start <= last_day:
+        window_end = min(window_start + timedelta(days=TIMESERIES_MAX_DAYS - 1), last_day)
+        response = get_http_session().get(
+            f"{src.utils.CURRENCY_API_URL}/timeseries",
+            params={
+                "start_date": window_start.isoformat(),
+                "end_date": window_end.isoformat(),
+                "base": base,
+                "symbols": ",".join(currencies),
+            },
+            headers={"apikey": src.utils.API_KEY},
+            timeout=src.utils.API_TIMEOUT,
+        )
+        response.raise_for_status()
+        rates = pd.DataFrame.from_dict(response.json()["rates"], orient="index", dtype="float64")
+        frames.append(1 / rates.reindex(columns=currencies))
+        window_start = window_end + timedelta(days=1)
+    result = pd.concat(frames)
+    result.index = pd.to_datetime(result.index)
+    currency_logger.info("Получены курсы %s с %s по %s", ", ".join(currencies), start, end)
+    return result
+
+
+class CurrencyConverter:
+    """
+    Пересчет сумм выписки в валюту отчета по курсам на дату операции.
+    Недостающие курсы запрашиваются пакетно через API timeseries и сохраняются в локальный файл
+    data/rates_<валюта>.csv, который переиспользуется между запусками и служит источником курсов без сети.
+    """
+
+    def __init__(self, base: str = "RUB", path: str | None = None) -> None:
+        """
+        :param base: Валюта отчета.
+        :param path: Путь к локальному файлу курсов или None для файла по умолчанию.
+        """
+        self.base = base
+        self.path = path or os.path.join(RATES_DIR, f"rates_{base}.csv")
+        self.lock = threading.Lock()
+        self.table = RateTable.load(self.path, base) if os.path.exists(self.path) else RateTable(base)
+
+    def ensure_rates(self, currencies: np.ndarray, days: np.ndarray) -> None:
+        """
+        Функция загрузки курсов для пар (валюта, день), которых нет в таблице. При ошибке сети используется
+        локальная таблица.
+        :param currencies: Массив валют.
+        :param days: Массив дней datetime64[D].
+        """
+        with self.lock:
+            ranges = self.table.missing(currencies, days)
+            if not ranges:
+                return
+            start = min(first for first, last in ranges.values())
+            end = max(last for first, last in ranges.values())
+            try:
+                rates = get_api_timeseries(sorted(ranges), start, end, self.base)
+            except Exception as error:
+                currency_logger.warning("Курсы не получены, используется локальный файл курсов: %s", error)
+                return
+            self.table.update(rates)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.table.save(self.path)
+
+    def rates(self, currencies: Iterable, days: np.ndarray) -> np.ndarray:
+        """
+        Функция получения курсов к валюте отчета для пар (валюта, день) с загрузкой недостающих.
+        :param currencies: Валюты.
+        :param days: Массив дней datetime64[D].
+        :return: Массив курсов.
+        """
+        currencies = np.asarray(currencies, dtype=object)
+        foreign = currencies != self.base
+        if foreign.any():
+            self.ensure_rates(currencies[foreign], days[foreign])
+        rates = self.table.lookup(currencies, days)
+        missing = np.isnan(rates)
+        if missing.any():
+            pairs = sorted({(str(currency), str(day)) for currency, day in zip(currencies[missing], days[missing])})
+            currency_logger.error("Нет курсов валют: %s", pairs[:5])
+            raise ValueError(f"Нет курса {pairs[0][0]} на {pairs[0][1]} для пересчета в {self.base}")
+        return rates
+
+    @timed
+    def normalize(self, operations: pd.DataFrame) -> pd.DataFrame:
+        """
+        Функция пересчета сумм операций и платежей в валюту отчета по курсу на день операции.
+        Пересчет выполняется одним векторным поиском курсов по всем строкам.
+        :param operations: DataFrame с операциями в формате выписки.
+        :return: Копия DataFrame с суммами и валютами в валюте отчета.
+        """
+        normalized = operations.copy()
+        if operations.empty:
+            return normalized
+        days = parse_operation_dates(operations["Дата операции"]).astype("datetime64[D]")
+        currency_columns = sorted(set(AMOUNT_COLUMNS.values()))
+        currencies = np.concatenate([operations[column].to_numpy(dtype=object) for column in currency_columns])
+        all_rates = self.rates(currencies, np.tile(days, len(currency_columns))).reshape(len(currency_columns), -1)
+        for amount_column, currency_column in AMOUNT_COLUMNS.items():
+            rates = all_rates[currency_columns.index(currency_column)]
+            amounts = operations[amount_column].to_numpy(dtype="float64", na_value=np.nan)
+            normalized[amount_column] = np.round(amounts * rates, 2)
+        for currency_column in currency_columns:
+            normalized[currency_column] = self.base
+        currency_logger.info("Суммы %s строк пересчитаны в %s", len(operations), self.base)
+        return normalized
+
+
+_converters: dict[str, CurrencyConverter] = {}
+_converters_lock = threading.Lock()
+
+
+def get_converter(base: str = "RUB") -> CurrencyConverter:
+    """
+    Функция получения общего конвертера валюты отчета, таблица курсов переиспользуется между вызовами.
+    :param base: Валюта отчета.
+    :return: Конвертер.
+    """
+    with _converters_lock:
+        if base not in _converters:
+            _converters[base] = CurrencyConverter(base)
+        return _converters[base]
+
+
+def normalize_currency(operations: pd.DataFrame, base: str = "RUB") -> pd.DataFrame:
+    """
+    Функция пересчета сумм выписки в валюту отчета для main_cards и top_transactions.
+    :param operations: DataFrame с операциями в формате выписки.
+    :param base: Валюта отчета.
+    :return: Копия DataFrame с суммами в валюте отчета.
+    """
+    return get_converter(base).normalize(operations)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import parse_operation_dates
+from src.rollups import RollupTable
+from src.store import TransactionStore
+from src.utils import ROOT_DIR
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa  # type: ignore[import-untyped]
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    pa = lazy_import("pyarrow")
+
+STORE_DIR = ROOT_DIR + "/data/store"
+
+ingest_logger = get_logger(__name__, "ingest")
+
+
+def operation_keys(operations: pd.DataFrame) -> np.ndarray:
+    """
+    Функция расчета стабильного ключа строки: дата операции, карта, сумма, описание и номер повтора.
+    Номер повтора различает одинаковые операции внутри выписки, чтобы они не схлопывались в одну.
+    :param operations: DataFrame с операциями.
+    :return: Массив ключей uint64.
+    """
+    key_data = pd.DataFrame(
+        {
+            "date": operations["Дата операции"].astype(str).to_numpy(),
+            "card": operations["Номер карты"].fillna("").astype(str).to_numpy(),
+            "amount": operations["Сумма операции"].astype(float).round(2).to_numpy(),
+            "description": operations["Описание"].fillna("").astype(str).to_numpy(),
+        }
+    )
+    base_keys = pd.util.hash_pandas_object(key_data, index=False)
+    occurrence = base_keys.groupby(base_keys).cumcount()
+    keys = pd.util.hash_pandas_object(pd.DataFrame({"key": base_keys, "occurrence": occurrence}), index=False)
+    return keys.to_numpy(dtype="uint64")
+
+
+class PersistentStore:
+    """
+    Постоянное хранилище операций на диске: части Arrow IPC с отсортированными ключами строк,
+    агрегаты по картам и месяцам и дневные агрегаты RollupTable. Новая выписка добавляет только новые строки,
+    поэтому стоимость загрузки пропорциональна новым строкам, а не всей истории.
+    """
+
+    def __init__(self, path: str = STORE_DIR) -> None:
+        """
+        :param path: Директория хранилища.
+        """
+        if pa is None:
+            raise ImportError("Для постоянного хранилища операций требуется pyarrow")
+        self.path = path
+        self.aggregates_path = os.path.join(path, "aggregates.json")
+        self.rollups_path = os.path.join(path, "rollups.arrow")
+        os.makedirs(path, exist_ok=True)
+
+    def part_paths(self) -> list[str]:
+        """
+        Функция получения путей к частям хранилища в порядке загрузки.
+        :return: Список путей к файлам Arrow.
+        """
+        return sorted(glob.glob(os.path.join(self.path, "part_*.arrow")))
+
+    def is_stored(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Функция проверки ключей по всем частям бинарным поиском в отсортированных ключах через memory-map.
+        :param keys: Массив ключей uint64.
+        :return: Булева маска уже сохраненных ключей.
+        """
+        stored = np.zeros(len(keys), dtype=bool)
+        for part_path in self.part_paths():
+            part_keys = np.load(part_path.replace(".arrow", ".keys.npy"), mmap_mode="r")
+            positions = np.minimum(np.searchsorted(part_keys, keys), len(part_keys) - 1)
+            stored |= part_keys[positions] == keys
+        return stored
+
+    def aggregates(self) -> dict[str, dict[str, list[float]]]:
+        """
+        Функция чтения агрегатов: карта - месяц YYYY-MM - [количество, сумма операций, кэшбэк].
+        :return: Словарь агрегатов.
+        """
+        if not os.path.exists(self.aggregates_path):
+            return {}
+        with open(self.aggregates_path, encoding="utf-8") as file:
+            aggregates: dict[str, dict[str, list[float]]] = json.load(file)
+        return aggregates
+
+    def _update_aggregates(self, operations: pd.DataFrame) -> None:
+        """
+        Функция добавления новых строк к агрегатам по картам и месяцам.
+        :param operations: DataFrame с новыми операциями.
+        """
+        aggregates = self.aggregates()
+        months = pd.DatetimeIndex(parse_operation_dates(operations["Дата операции"])).strftime("%Y-%m")
+        partial = (
+            operations.assign(month=months)
+            .groupby(["Номер карты", "month"])
+            .agg(
+                count=("Сумма операции с округлением", "size"),
+                spent=("Сумма операции с округлением", "sum"),
+                cashback=("Кэшбэк", "sum"),
+            )
+        )
+        for card_num, month, count, spent, cashback in partial.reset_index().itertuples(index=False):
+            totals = aggregates.setdefault(str(card_num), {}).setdefault(str(month), [0, 0.0, 0.0])
+            totals[0] += int(count)
+            totals[1] = round(totals[1] + float(spent), 2)
+            totals[2] = round(totals[2] + float(cashback), 2)
+        tmp_path = f"{self.aggregates_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(aggregates, file, ensure_ascii=False)
+        os.replace(tmp_path, self.aggregates_path)
+
+    def rollups(self) -> RollupTable | None:
+        """
+        Функция чтения дневных агрегатов хранилища.
+        :return: Таблица агрегатов или None, если хранилище пусто.
+        """
+        if not os.path.exists(self.rollups_path):
+            return None
+        return RollupTable.load(self.rollups_path)
+
+    def ingest(self, operations: pd.DataFrame) -> pd.DataFrame:
+        """
+        Функция добавления операций в хранилище без повторов уже сохраненных строк.
+        :param operations: DataFrame с операциями в формате выписки.
+        :return: DataFrame с новыми строками, которые были добавлены.
+        """
+        keys = operation_keys(operations)
+        new_rows = ~self.is_stored(keys)
+        new_operations = operations.loc[new_rows].reset_index(drop=True)
+        if new_operations.empty:
+            ingest_logger.info("Новых строк нет, хранилище не изменилось")
+            return new_operations
+        part_path = os.path.join(self.path, f"part_{len(self.part_paths()) + 1:06d}.arrow")
+        table = pa.Table.from_pandas(new_operations, preserve_index=False)
+        with pa.OSFile(f"{part_path}.tmp", "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        with open(part_path.replace(".arrow", ".keys.npy"), "wb") as file:
+            np.save(file, np.sort(keys[new_rows]))
+        os.replace(f"{part_path}.tmp", part_path)
+        self._update_aggregates(new_operations)
+        rollups = self.rollups()
+        (RollupTable.from_operations(new_operations) if rollups is None else rollups.append(new_operations)).save(
+            self.rollups_path
+        )
+        ingest_logger.info("В хранилище добавлено строк: %s из %s", len(new_operations), len(operations))
+        return new_operations
+
+    def ingest_excel(self, filename: str) -> pd.DataFrame:
+        """
+        Функция загрузки новой выписки Excel в хранилище.
+        :param filename: Путь к файлу Excel.
+        :return: DataFrame с новыми строками, которые были добавлены.
+        """
+        return self.ingest(pd.read_excel(filename))
+
+    def read(self) -> pd.DataFrame:
+        """
+        Функция чтения всех операций хранилища через memory-map.
+        :return: DataFrame с операциями.
+        """
+        frames = []
+        for part_path in self.part_paths():
+            with pa.memory_map(part_path, "r") as source:
+                frames.append(pa.ipc.open_file(source).read_all().to_pandas())
+        if not frames:
+            ingest_logger.error("Хранилище %s пусто", self.path)
+            raise ValueError(f"Хранилище {self.path} пусто, загрузите выписку")
+        operations: pd.DataFrame = pd.concat(frames, ignore_index=True)
+        return operations
+
+    def load(self) -> TransactionStore:
+        """
+        Функция загрузки хранилища в память для page_main и read_finance_excel_operation.
+        :return: Хранилище транзакций.
+        """
+        return TransactionStore(self.read())
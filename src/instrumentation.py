@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    import requests
+
+
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+METRICS_PREFIX = "bank_analyzer"
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+_timings: contextvars.ContextVar[list[dict] | None] = contextvars.ContextVar("timings", default=None)
+_current_call: contextvars.ContextVar[dict | None] = contextvars.ContextVar("current_call", default=None)
+
+
+class Metrics:
+    """
+    Накопленные метрики вызовов функций и HTTP ответов для экспорта в формате Prometheus.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: dict[str, list[float]] = {}
+        self.http: dict[str, list[float]] = {}
+        self.cache: dict[str, list[int]] = {}
+
+    def observe_call(self, stage: str, seconds: float, rows: int | None, error: bool) -> None:
+        """
+        Функция учета вызова функции.
+        :param stage: Имя функции.
+        :param seconds: Длительность вызова.
+        :param rows: Количество строк или None.
+        :param error: Вызов завершился исключением.
+        """
+        with self.lock:
+            totals = self.calls.setdefault(stage, [0, 0.0, 0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += rows or 0
+            totals[3] += error
+
+    def observe_http(self, host: str, size: int) -> None:
+        """
+        Функция учета HTTP ответа.
+        :param host: Хост API.
+        :param size: Размер тела ответа в байтах.
+        """
+        with self.lock:
+            totals = self.http.setdefault(host, [0, 0])
+            totals[0] += 1
+            totals[1] += size
+
+    def observe_cache(self, cache: str, hit: bool) -> None:
+        """
+        Функция учета обращения к кэшу.
+        :param cache: Имя кэша.
+        :param hit: Попадание в кэш.
+        """
+        with self.lock:
+            totals = self.cache.setdefault(cache, [0, 0])
+            totals[0 if hit else 1] += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.calls.clear()
+            self.http.clear()
+            self.cache.clear()
+
+    def render(self) -> str:
+        """
+        Функция вывода метрик в текстовом формате Prometheus.
+        :return: Текст метрик.
+        """
+        lines = [
+            f"# HELP {METRICS_PREFIX}_call_duration_seconds Длительность вызовов функций.",
+            f"# TYPE {METRICS_PREFIX}_call_duration_seconds summary",
+        ]
+        with self.lock:
+            calls = sorted(self.calls.items())
+            http = sorted(self.http.items())
+            cache = sorted(self.cache.items())
+        for stage, (count, seconds, rows, errors) in calls:
+            lines.append(f'{METRICS_PREFIX}_call_duration_seconds_count{{function="{stage}"}} {count}')
+            lines.append(f'{METRICS_PREFIX}_call_duration_seconds_sum{{function="{stage}"}} {seconds:.6f}')
+        lines += [
+            f"# HELP {METRICS_PREFIX}_call_rows_total Количество обработанных строк.",
+            f"# TYPE {METRICS_PREFIX}_call_rows_total counter",
+        ]
+        lines += [f'{METRICS_PREFIX}_call_rows_total{{function="{stage}"}} {totals[2]}' for stage, totals in calls]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_call_errors_total Количество вызовов с исключением.",
+            f"# TYPE {METRICS_PREFIX}_call_errors_total counter",
+        ]
+        lines += [f'{METRICS_PREFIX}_call_errors_total{{function="{stage}"}} {totals[3]}' for stage, totals in calls]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_http_responses_total Количество HTTP ответов API.",
+            f"# TYPE {METRICS_PREFIX}_http_responses_total counter",
+        ]
+        lines += [f'{METRICS_PREFIX}_http_responses_total{{host="{host}"}} {totals[0]}' for host, totals in http]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_http_response_bytes_total Размер тел HTTP ответов API.",
+            f"# TYPE {METRICS_PREFIX}_http_response_bytes_total counter",
+        ]
+        lines += [f'{METRICS_PREFIX}_http_response_bytes_total{{host="{host}"}} {totals[1]}' for host, totals in http]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_cache_requests_total Количество обращений к кэшам по результату.",
+            f"# TYPE {METRICS_PREFIX}_cache_requests_total counter",
+        ]
+        for name, (hits, misses) in cache:
+            lines.append(f'{METRICS_PREFIX}_cache_requests_total{{cache="{name}",result="hit"}} {hits}')
+            lines.append(f'{METRICS_PREFIX}_cache_requests_total{{cache="{name}",result="miss"}} {misses}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def _count_rows(value: Any) -> int | None:
+    """
+    Функция определения количества строк DataFrame, списка или пакета транзакций.
+    :param value: Аргумент или результат функции.
+    :return: Количество строк или None.
+    """
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, "__len__"):
+        return None
+    return len(value)
+
+
+def timed(func: F) -> F:
+    """
+    Декоратор замера длительности, количества строк и байтов сети вызова функции.
+    Строки берутся из первого аргумента, если это таблица или список, иначе из результата.
+    :param func: Функция.
+    :return: Функция с замером.
+    """
+    stage = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        record: dict = {"stage": stage, "seconds": 0.0, "rows": None, "bytes": 0}
+        token = _current_call.set(record)
+        start = time.perf_counter()
+        error = True
+        try:
+            result = func(*args, **kwargs)
+            error = False
+            record["rows"] = _count_rows(args[0]) if args and _count_rows(args[0]) is not None else _count_rows(result)
+            return result
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            _current_call.reset(token)
+            parent = _current_call.get()
+            if parent is not None:
+                parent["bytes"] += record["bytes"]
+            metrics.observe_call(stage, record["seconds"], record["rows"], error)
+            timings = _timings.get()
+            if timings is not None:
+                timings.append(record)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def record_http_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """
+    Обработчик ответа requests: учитывает размер тела ответа в текущем вызове и в метриках.
+    :param response: Ответ HTTP.
+    """
+    size = len(response.content or b"")
+    record = _current_call.get()
+    if record is not None:
+        record["bytes"] += size
+    metrics.observe_http(urlparse(response.url).hostname or "", size)
+
+
+@contextmanager
+def collect_timings() -> Iterator[list[dict]]:
+    """
+    Контекстный менеджер сбора замеров вызовов функций в текущем контексте.
+    :return: Список замеров: функция, длительность в секундах, строки, байты сети.
+    """
+    timings: list[dict] = []
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def submit_in_context(executor: Executor, func: Callable[..., T], *args: Any) -> "Future[T]":
+    """
+    Функция запуска задачи в пуле потоков с копией текущего контекста, чтобы замеры попадали в сбор вызывающего.
+    :param executor: Пул потоков.
+    :param func: Функция.
+    :return: Future задачи.
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def map_in_context(executor: Executor, func: Callable[[Any], T], items: Iterable[Any]) -> Iterator[T]:
+    """
+    Функция map в пуле потоков с копией текущего контекста для каждой задачи.
+    :param executor: Пул потоков.
+    :param func: Функция одного аргумента.
+    :param items: Аргументы.
+    :return: Итератор результатов в порядке аргументов.
+    """
+    items = list(items)
+    contexts = [contextvars.copy_context() for _ in items]
+    return executor.map(lambda context, item: context.run(func, item), contexts, items)
+
+
+@contextmanager
+def profiled(name: str, profile_dir: str | None = PROFILE_DIR) -> Iterator[None]:
+    """
+    Контекстный менеджер записи профиля cProfile в файл, если задана директория профилей PROFILE_DIR.
+    :param name: Имя профилируемого вызова для имени файла.
+    :param profile_dir: Директория профилей или None, чтобы не профилировать.
+    """
+    if not profile_dir:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        os.makedirs(profile_dir, exist_ok=True)
+        profile.dump_stats(os.path.join(profile_dir, f"{name}_{datetime.now():%Y%m%d_%H%M%S_%f}.prof"))
+
+
+def write_metrics(path: str) -> None:
+    """
+    Функция записи метрик в файл в формате Prometheus (для textfile collector node_exporter).
+    :param path: Путь к файлу метрик.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(metrics.render())
+    os.replace(tmp_path, path)
@@ -0,0 +1,35 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+from typing import Any
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Модуль, который импортируется при первом обращении к атрибуту.
+    После импорта атрибуты копируются в словарь модуля, и повторные обращения не проходят через __getattr__.
+    """
+
+    def __getattr__(self, attr: str) -> Any:
+        with _lock:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> Any:
+    """
+    Функция отложенного импорта тяжелых зависимостей (pandas, numpy, requests, pyarrow, openpyxl).
+    Модуль импортируется при первом обращении к его атрибуту, а не при импорте модулей src.
+    :param name: Имя модуля, например "pandas" или "pyarrow.compute".
+    :return: Модуль, если он уже импортирован, ленивый модуль или None, если пакет не установлен.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name.partition(".")[0]) is None:
+        return None
+    return LazyModule(name)
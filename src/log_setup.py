@@ -0,0 +1,127 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = ROOT_DIR + "/log"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+LOG_FORMAT = "%(asctime)s %(module)s %(funcName)s %(levelname)s: %(message)s"
+LOG_OWNER_ENV = "BANK_ANALYZER_LOG_OWNER"
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_files: dict[str, str] = {}
+_opened_files: set[str] = set()
+_lock = threading.Lock()
+# Процесс, который первым импортировал модуль, записывает свой pid в окружение. Рабочие процессы наследуют его
+# и при fork, и при spawn/forkserver, где модуль импортируется заново, поэтому журналы перезаписывает только родитель.
+_owner_pid = int(os.environ.setdefault(LOG_OWNER_ENV, str(os.getpid())))
+_listener: QueueListener | None = None
+_listener_pid: int | None = None
+
+
+class ModuleFileHandler(logging.Handler):
+    """
+    Обработчик потока записи журналов: пишет запись в файл log/logging_<модуль>.log своего логгера.
+    Файл открывается при первой записи, а не при импорте модуля.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.handlers: dict[str, logging.FileHandler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        path = _log_files.get(record.name)
+        if path is None:
+            return
+        if path not in self.handlers:
+            # Журнал очищается один раз за запуск процессом-владельцем, а все процессы пишут в режиме дозаписи,
+            # чтобы записи рабочих процессов не затирались.
+            if os.getpid() == _owner_pid and path not in _opened_files:
+                open(path, "w").close()
+            _opened_files.add(path)
+            handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            self.handlers[path] = handler
+        self.handlers[path].emit(record)
+
+    def close(self) -> None:
+        for handler in self.handlers.values():
+            handler.close()
+        self.handlers.clear()
+        super().close()
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Обработчик логгеров модулей: кладет запись в очередь и при первой записи в процессе запускает поток записи.
+    Вызывающий код не ждет записи в файл.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _listener_pid != os.getpid():
+            start_logging()
+        super().emit(record)
+
+
+_queue_handler = LazyQueueHandler(_queue)
+
+
+def get_logger(name: str, log_name: str) -> logging.Logger:
+    """
+    Функция настройки логгера модуля без открытия файлов при импорте.
+    :param name: Имя логгера, обычно __name__ модуля.
+    :param log_name: Имя журнала: записи пишутся в log/logging_<log_name>.log.
+    :return: Логгер с уровнем из переменной окружения LOG_LEVEL (по умолчанию DEBUG).
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(LOG_LEVEL)
+    _log_files[name] = f"{LOG_DIR}/logging_{log_name}.log"
+    if _queue_handler not in logger.handlers:
+        logger.addHandler(_queue_handler)
+    return logger
+
+
+def set_log_level(level: int | str) -> None:
+    """
+    Функция изменения уровня всех логгеров модулей, например WARNING, чтобы отключить строки INFO каждого вызова.
+    :param level: Уровень журнала.
+    """
+    for name in _log_files:
+        logging.getLogger(name).setLevel(level)
+
+
+def start_logging() -> None:
+    """
+    Функция запуска потока записи журналов в текущем процессе.
+    """
+    global _listener, _listener_pid
+    with _lock:
+        if _listener_pid == os.getpid():
+            return
+        _listener = QueueListener(_queue, ModuleFileHandler())
+        _listener.start()
+        _listener_pid = os.getpid()
+    if os.getpid() == _owner_pid:
+        atexit.register(stop_logging)
+    else:
+        # Рабочие процессы multiprocessing завершаются через os._exit без atexit, но вызывают финализаторы.
+        from multiprocessing.util import Finalize
+
+        Finalize(None, stop_logging, exitpriority=0)
+
+
+def stop_logging() -> None:
+    """
+    Функция остановки потока записи: записывает оставшиеся в очереди записи и закрывает файлы.
+    """
+    global _listener, _listener_pid
+    with _lock:
+        if _listener is None or _listener_pid != os.getpid():
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener, _listener_pid = None, None
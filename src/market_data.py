@@ -0,0 +1,263 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, TypeVar, cast
+
+from src.log_setup import get_logger
+
+T = TypeVar("T")
+
+market_data_logger = get_logger(__name__, "market_data")
+
+
+class MarketDataError(Exception):
+    """
+    Ошибка получения рыночных данных: сеть, ответ API без данных, исчерпанная квота или открытый предохранитель.
+    """
+
+
+class MarketDataUnavailable(MarketDataError):
+    """
+    Ответ API без данных: сообщение о квоте, неверный ключ или неизвестный символ. Такой запрос не повторяется,
+    повтор только расходует квоту.
+    """
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов: корзина на capacity токенов, пополняемая со скоростью rate токенов в секунду.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param rate: Скорость пополнения, токенов в секунду.
+        :param capacity: Размер корзины - допустимая пачка запросов подряд.
+        :param clock: Монотонные часы в секундах.
+        :param sleep: Функция ожидания в секундах.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Функция получения токена с ожиданием пополнения.
+        :param timeout: Максимальное время ожидания в секундах.
+        :return: True, если токен получен, False, если токена не будет дольше timeout.
+        """
+        deadline = self.clock() + timeout
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            self.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель: после failure_threshold неудач подряд запросы не выполняются reset_timeout секунд,
+    затем пропускается один пробный запрос.
+    """
+
+    def __init__(
+        self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param failure_threshold: Количество неудач подряд для размыкания.
+        :param reset_timeout: Время в секундах до пробного запроса.
+        :param clock: Монотонные часы в секундах.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Функция проверки, можно ли выполнить запрос.
+        :return: True для замкнутого предохранителя или пробного запроса.
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.trial and self.clock() - self.opened_at >= self.reset_timeout:
+                self.trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Функция учета успешного запроса: счетчик неудач сбрасывается, предохранитель замыкается.
+        """
+        with self.lock:
+            self.failures, self.opened_at, self.trial = 0, None, False
+
+    def record_failure(self) -> None:
+        """
+        Функция учета неудачного запроса: после failure_threshold неудач подряд или неудачного пробного запроса
+        предохранитель размыкается.
+        """
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.failure_threshold:
+                self.opened_at, self.trial = self.clock(), False
+
+
+class SingleFlight:
+    """
+    Объединение одновременных запросов: вызовы с одним ключом, пришедшие во время выполнения запроса,
+    ждут его результат вместо нового запроса.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.flights: dict[str, Future] = {}
+
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        """
+        Функция выполнения запроса по ключу или ожидания уже выполняемого.
+        :param key: Ключ запроса.
+        :param func: Функция запроса.
+        :return: Результат запроса.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self.flights[key] = Future()
+        if not leader:
+            result: T = flight.result()
+            return result
+        try:
+            value = func()
+            flight.set_result(value)
+            return value
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+
+
+class MarketDataClient:
+    """
+    Общий клиент API рыночных данных одного провайдера: ограничение частоты запросов,
+    объединение одновременных запросов одного символа, повтор с джиттером и предохранитель,
+    при срабатывании которого возвращается последнее известное значение.
+    Ответы без данных (MarketDataUnavailable) не повторяются, каждая неудачная попытка учитывается предохранителем.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: float,
+        burst: float,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 60.0,
+        max_wait: float = 30.0,
+    ) -> None:
+        """
+        :param provider: Провайдер данных, например "stocks".
+        :param requests_per_minute: Квота запросов в минуту.
+        :param burst: Количество запросов, которые можно выполнить подряд.
+        :param retries: Количество повторов после неудачного запроса.
+        :param backoff: Базовая задержка повтора в секундах, удваивается с каждой попыткой.
+        :param max_backoff: Максимальная задержка повтора в секундах.
+        :param failure_threshold: Количество неудачных вызовов подряд для размыкания предохранителя.
+        :param reset_timeout: Время в секундах до пробного запроса после размыкания.
+        :param max_wait: Максимальное ожидание квоты в секундах.
+        """
+        self.provider = provider
+        self.bucket = TokenBucket(requests_per_minute / 60, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.flight = SingleFlight()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self.last_values: dict[str, object] = {}
+        self.upstream_calls = 0
+        self.lock = threading.Lock()
+
+    def call(self, key: str, request: Callable[[], T]) -> T:
+        """
+        Функция запроса значения по символу через все механизмы клиента.
+        :param key: Символ или набор символов запроса.
+        :param request: Функция одного запроса к API, при ошибке вызывает исключение.
+        :return: Значение API или последнее известное значение, если API недоступно.
+        """
+        return self.flight.do(key, lambda: self._call(key, request))
+
+    def _fallback(self, key: str, error: Exception) -> object:
+        """
+        Функция возврата последнего известного значения вместо ошибки.
+        :param key: Символ запроса.
+        :param error: Ошибка запроса.
+        :return: Последнее известное значение.
+        """
+        if key in self.last_values:
+            market_data_logger.warning("%s %s: %s, возвращено последнее известное значение", self.provider, key, error)
+            return self.last_values[key]
+        market_data_logger.error("%s %s: %s", self.provider, key, error)
+        if isinstance(error, MarketDataError):
+            raise error
+        raise MarketDataError(f"Не удалось получить данные {self.provider} {key}: {error}") from error
+
+    def _call(self, key: str, request: Callable[[], T]) -> T:
+        """
+        Функция запроса значения с предохранителем, квотой и повторами.
+        :param key: Символ или набор символов запроса.
+        :param request: Функция одного запроса к API.
+        :return: Значение API или последнее известное значение.
+        """
+        if not self.breaker.allow():
+            return cast(T, self._fallback(key, MarketDataError(f"Предохранитель {self.provider} разомкнут")))
+        error: Exception = MarketDataError("Запрос не выполнялся")
+        for attempt in range(self.retries + 1):
+            if attempt:
+                if not self.breaker.allow():
+                    break
+                time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt)))
+            if not self.bucket.acquire(self.max_wait):
+                return cast(T, self._fallback(key, MarketDataError(f"Исчерпана квота запросов {self.provider}")))
+            with self.lock:
+                self.upstream_calls += 1
+            try:
+                value = request()
+            except Exception as request_error:
+                error = request_error
+                self.breaker.record_failure()
+                market_data_logger.info("%s %s: попытка %s неудачна: %s", self.provider, key, attempt + 1, error)
+                if isinstance(error, MarketDataUnavailable):
+                    break
+                continue
+            self.breaker.record_success()
+            with self.lock:
+                self.last_values[key] = value
+            return value
+        return cast(T, self._fallback(key, error))
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterator
+
+from src.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.compute as pc  # type: ignore[import-untyped]
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    pa = lazy_import("pyarrow")
+    pc = lazy_import("pyarrow.compute")
+
+
+OPERATION_DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+FIELD_COLUMNS = {
+    "operation_date": "Дата операции",
+    "payment_date": "Дата платежа",
+    "card_number": "Номер карты",
+    "status": "Статус",
+    "operation_amount": "Сумма операции",
+    "operation_currency": "Валюта операции",
+    "payment_amount": "Сумма платежа",
+    "payment_currency": "Валюта платежа",
+    "cashback": "Кэшбэк",
+    "category": "Категория",
+    "mcc": "MCC",
+    "description": "Описание",
+    "bonuses": "Бонусы (включая кэшбэк)",
+    "invest_rounding": "Округление на инвесткопилку",
+    "rounded_amount": "Сумма операции с округлением",
+}
+CATEGORICAL_FIELDS = ("payment_date", "card_number", "status", "operation_currency", "payment_currency", "category")
+NUMERIC_FIELDS = (
+    "operation_amount",
+    "payment_amount",
+    "cashback",
+    "mcc",
+    "bonuses",
+    "invest_rounding",
+    "rounded_amount",
+)
+
+
+def parse_operation_dates(operation_dates: pd.Series) -> np.ndarray:
+    """
+    Функция разбора столбца "Дата операции" в массив datetime64 с явным форматом.
+    При наличии pyarrow разбор выполняется его векторным strptime, иначе через pandas.
+    :param operation_dates: Столбец дат операций в виде строк.
+    :return: Массив datetime64[s].
+    """
+    if pa is not None:
+        parsed_dates = pc.strptime(pa.array(operation_dates, type=pa.string()), OPERATION_DATE_FORMAT, unit="s")
+        result: np.ndarray = parsed_dates.to_numpy(zero_copy_only=False).astype("datetime64[s]")
+        return result
+    return pd.to_datetime(operation_dates, format=OPERATION_DATE_FORMAT).to_numpy().astype("datetime64[s]")
+
+
+@dataclass(slots=True, frozen=True)
+class Transaction:
+    """
+    Типизированная запись одной транзакции выписки.
+    """
+
+    operation_date: datetime
+    payment_date: str
+    card_number: str | None
+    status: str
+    operation_amount: float
+    operation_currency: str
+    payment_amount: float
+    payment_currency: str
+    cashback: float
+    category: str
+    mcc: float
+    description: str
+    bonuses: float
+    invest_rounding: float
+    rounded_amount: float
+
+
+class TransactionBatch:
+    """
+    Колоночное представление транзакций: NumPy массивы для чисел и дат,
+    категориальные столбцы для карты, категории, статуса, валют и даты платежа.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: dict[str, Any]) -> None:
+        """
+        :param columns: Словарь поле - массив значений одинаковой длины.
+        """
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, operations: pd.DataFrame) -> "TransactionBatch":
+        """
+        Функция создания пакета из DataFrame в формате выписки.
+        :param operations: DataFrame с операциями.
+        :return: Пакет транзакций.
+        """
+        columns: dict[str, Any] = {
+            "operation_date": parse_operation_dates(operations[FIELD_COLUMNS["operation_date"]])
+        }
+        for field in CATEGORICAL_FIELDS:
+            columns[field] = pd.Categorical(operations[FIELD_COLUMNS[field]].to_numpy(dtype=object))
+        for field in NUMERIC_FIELDS:
+            columns[field] = operations[FIELD_COLUMNS[field]].to_numpy(dtype="float64", na_value=np.nan)
+        columns["description"] = operations[FIELD_COLUMNS["description"]].to_numpy(dtype=object)
+        return cls(columns)
+
+    @classmethod
+    def from_records(cls, transactions: list[dict]) -> "TransactionBatch":
+        """
+        Функция создания пакета из списка словарей с транзакциями.
+        :param transactions: Список транзакций.
+        :return: Пакет транзакций.
+        """
+        return cls.from_frame(pd.DataFrame(transactions, columns=list(FIELD_COLUMNS.values())))
+
+    def __len__(self) -> int:
+        return len(self.columns["operation_date"])
+
+    def __getitem__(self, rows: slice | np.ndarray) -> "TransactionBatch":
+        """
+        Функция выбора строк пакета срезом, маской или массивом индексов.
+        :param rows: Срез, булева маска или индексы строк.
+        :return: Пакет транзакций с выбранными строками.
+        """
+        return TransactionBatch({field: values[rows] for field, values in self.columns.items()})
+
+    def __iter__(self) -> Iterator[Transaction]:
+        operation_dates = self.columns["operation_date"].astype(datetime)
+        values = [operation_dates] + [np.asarray(self.columns[field], dtype=object) for field in FIELD_COLUMNS][1:]
+        for row in zip(*values):
+            yield Transaction(*row)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Функция преобразования пакета в DataFrame в формате выписки.
+        :return: DataFrame с операциями.
+        """
+        data = {column: self.columns[field] for field, column in FIELD_COLUMNS.items()}
+        data[FIELD_COLUMNS["operation_date"]] = pd.DatetimeIndex(self.columns["operation_date"]).strftime(
+            OPERATION_DATE_FORMAT
+        )
+        return pd.DataFrame(data)
+
+    def card_summary(self) -> list[dict]:
+        """
+        Функция вывода информации по картам подсчетом по кодам категориального столбца.
+        :return: Информация по картам в формате main_cards.
+        """
+        card_numbers = self.columns["card_number"]
+        codes = card_numbers.codes
+        has_card = codes >= 0
+        size = len(card_numbers.categories)
+        counts = np.bincount(codes[has_card], minlength=size)
+        spent = np.bincount(codes[has_card], weights=self.columns["rounded_amount"][has_card], minlength=size)
+        cashback = np.bincount(
+            codes[has_card], weights=np.nan_to_num(self.columns["cashback"][has_card]), minlength=size
+        )
+        order = np.argsort(np.asarray(card_numbers.categories, dtype=str), kind="stable")
+        return [
+            {
+                "last_digits": str(card_numbers.categories[code])[-4:],
+                "total_spent": round(float(spent[code]), 2),
+                "cashback": round(float(cashback[code]), 2),
+            }
+            for code in order
+            if counts[code]
+        ]
+
+    def top(self, k: int = 5, by_abs: bool = False, amount_field: str = "rounded_amount") -> list[dict]:
+        """
+        Функция возврата ТОП K транзакций частичной сортировкой argpartition.
+        Строки с суммой, равной K-й, тоже сортируются, чтобы при равных суммах порядок был как в выписке.
+        :param k: Количество транзакций.
+        :param by_abs: Ранжировать по модулю суммы.
+        :param amount_field: Поле суммы транзакции.
+        :return: Список ТОП K транзакций в формате top_transactions.
+        """
+        amounts = self.columns[amount_field]
+        keys = np.nan_to_num(np.abs(amounts) if by_abs else amounts, nan=-np.inf)
+        if k <= 0:
+            return []
+        if k < len(keys):
+            threshold = keys[np.argpartition(-keys, k - 1)[k - 1]]
+            candidates = np.flatnonzero(keys >= threshold)
+        else:
+            candidates = np.arange(len(keys))
+        candidates = candidates[keys[candidates] > -np.inf]
+        top_rows = candidates[np.lexsort((candidates, -keys[candidates]))][:k]
+        return [
+            {
+                "date": self.columns["payment_date"][row],
+                "amount": float(amounts[row]),
+                "category": self.columns["category"][row],
+                "description": self.columns["description"][row],
+            }
+            for row in top_rows
+        ]
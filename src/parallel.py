@@ -0,0 +1,107 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.log_setup import get_logger
+from src.reader import iter_finance_excel_operation
+
+PARALLEL_MAX_WORKERS = int(os.getenv("PARALLEL_MAX_WORKERS", "0")) or None
+
+parallel_logger = get_logger(__name__, "parallel")
+
+
+def analyze_workbook(filename: str, period_datetime: tuple[datetime, datetime], k: int = 5) -> dict:
+    """
+    Функция разбора одного файла Excel и предварительной агрегации в процессе-исполнителе.
+    Возвращает компактный частичный результат: суммы по полным номерам карт и локальный ТОП K.
+    :param filename: Путь к файлу Excel.
+    :param period_datetime: Кортеж с указанной датой и началом месяца.
+    :param k: Количество ТОП транзакций.
+    :return: Словарь с ключами "filename", "rows", "cards" (карта - [потрачено, кэшбэк])
+    и "top" (список [сумма, номер строки, транзакция]).
+    """
+    cards: dict[str, list[float]] = {}
+    top: list[tuple[float, int, dict]] = []
+    rows = 0
+    for batch in iter_finance_excel_operation(period_datetime, filename):
+        sums = batch.groupby("Номер карты").agg({"Сумма операции с округлением": "sum", "Кэшбэк": "sum"})
+        for card_num, row in sums.iterrows():
+            totals = cards.setdefault(str(card_num), [0.0, 0.0])
+            totals[0] += float(row["Сумма операции с округлением"])
+            totals[1] += float(row["Кэшбэк"])
+        top_data = batch.loc[batch["Сумма операции с округлением"].nlargest(k).index]
+        for position, top_row in zip(top_data.index.tolist(), top_data.to_dict("records")):
+            record = {
+                "date": top_row["Дата платежа"],
+                "amount": float(top_row["Сумма операции с округлением"]),
+                "category": top_row["Категория"],
+                "description": top_row["Описание"],
+            }
+            top.append((record["amount"], rows + position, record))
+        top = sorted(top, key=lambda item: (-item[0], item[1]))[:k]
+        rows += len(batch)
+    parallel_logger.info("Файл %s разобран, строк за период: %s", filename, rows)
+    return {"filename": filename, "rows": rows, "cards": cards, "top": top}
+
+
+def merge_partial_results(partials: list[dict], k: int = 5) -> dict:
+    """
+    Функция объединения частичных результатов файлов в общий ответ.
+    Результат детерминирован: файлы обходятся по имени, ничьи в ТОП решаются порядком файла и строки.
+    :param partials: Список частичных результатов analyze_workbook.
+    :param k: Количество ТОП транзакций.
+    :return: Словарь с ключами "files", "rows", "cards" и "top_transactions".
+    """
+    partials = sorted(partials, key=lambda partial: partial["filename"])
+    cards: dict[str, list[float]] = {}
+    top = []
+    for file_number, partial in enumerate(partials):
+        for card_num, (spent, cashback) in partial["cards"].items():
+            totals = cards.setdefault(card_num, [0.0, 0.0])
+            totals[0] += spent
+            totals[1] += cashback
+        top += [(amount, file_number, position, record) for amount, position, record in partial["top"]]
+    return {
+        "files": len(partials),
+        "rows": sum(partial["rows"] for partial in partials),
+        "cards": [
+            {"last_digits": card_num[-4:], "total_spent": round(spent, 2), "cashback": round(cashback, 2)}
+            for card_num, (spent, cashback) in sorted(cards.items())
+        ],
+        "top_transactions": [item[-1] for item in sorted(top, key=lambda item: (-item[0], item[1], item[2]))[:k]],
+    }
+
+
+def analyze_workbooks(
+    pattern: str,
+    period_datetime: tuple[datetime, datetime],
+    k: int = 5,
+    max_workers: int | None = PARALLEL_MAX_WORKERS,
+) -> dict:
+    """
+    Функция параллельного анализа нескольких выписок по шаблону пути в пуле процессов.
+    Разбор Excel в openpyxl нагружает процессор, поэтому каждый файл разбирается в отдельном процессе.
+    :param pattern: Шаблон пути к файлам Excel, например "data/*.xlsx".
+    :param period_datetime: Кортеж с указанной датой и началом месяца.
+    :param k: Количество ТОП транзакций.
+    :param max_workers: Количество процессов, None - по числу ядер, 1 - без пула в текущем процессе.
+    :return: Словарь с ключами "files", "rows", "cards" и "top_transactions".
+    """
+    filenames = sorted(glob.glob(pattern))
+    if not filenames:
+        parallel_logger.error("Файлы по шаблону %s не найдены", pattern)
+        raise ValueError(f"Файлы по шаблону {pattern} не найдены")
+    if max_workers == 1:
+        partials = [analyze_workbook(filename, period_datetime, k) for filename in filenames]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            partials = list(
+                executor.map(analyze_workbook, filenames, [period_datetime] * len(filenames), [k] * len(filenames))
+            )
+    result = merge_partial_results(partials, k)
+    if not result["rows"]:
+        parallel_logger.error("Empty DataFrame - данные пусты, поменяйте дату")
+        raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
+    parallel_logger.info("Проанализировано файлов: %s, строк: %s", result["files"], result["rows"])
+    return result
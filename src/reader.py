@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import parse_operation_dates
+from src.utils import ROOT_DIR, main_cards_stream, top_transactions_stream
+
+if TYPE_CHECKING:
+    import numpy as np
+    import openpyxl  # type: ignore[import-untyped]
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    openpyxl = lazy_import("openpyxl")
+
+NUMERIC_COLUMNS = {
+    "Сумма операции": "float64",
+    "Сумма платежа": "float64",
+    "Кэшбэк": "float64",
+    "MCC": "float64",
+    "Бонусы (включая кэшбэк)": "float64",
+    "Округление на инвесткопилку": "float64",
+    "Сумма операции с округлением": "float64",
+}
+
+reader_logger = get_logger(__name__, "reader")
+
+
+def iter_finance_excel_operation(
+    period_datetime: tuple[datetime, datetime],
+    filename: str | None = ROOT_DIR + "/data/operations.xlsx",
+    batch_size: int = 10_000,
+    order: str | None = "desc",
+) -> Iterator[pd.DataFrame]:
+    """
+    Функция потокового чтения операций из Excel порциями с фильтрацией по периоду при чтении.
+    Строки читаются через openpyxl в режиме read_only, поэтому память ограничена размером порции.
+    :param period_datetime: Кортеж с указанной датой и началом месяца.
+    :param filename: Путь к файлу Excel.
+    :param batch_size: Количество строк в порции.
+    :param order: Порядок строк по дате в файле: "desc" (выписка Тинькофф), "asc" или None, если не отсортирован.
+    Для отсортированного файла чтение прекращается, как только дата выходит за период.
+    :return: Итератор DataFrame с операциями за период.
+    """
+    if not filename:
+        reader_logger.error("filename не указан и равен None")
+        raise ValueError("filename не указан и равен None")
+    end_date, start_date = np.datetime64(period_datetime[0], "s"), np.datetime64(period_datetime[1], "s")
+    workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = list(next(rows, ()))
+        while batch := list(islice(rows, batch_size)):
+            batch_data = pd.DataFrame(batch, columns=columns)
+            batch_data = batch_data.astype({key: value for key, value in NUMERIC_COLUMNS.items() if key in columns})
+            operation_dates = parse_operation_dates(batch_data["Дата операции"])
+            period_mask = (operation_dates >= start_date) & (operation_dates <= end_date)
+            if period_mask.any():
+                yield batch_data.loc[period_mask].reset_index(drop=True)
+            if (order == "desc" and operation_dates.min() < start_date) or (
+                order == "asc" and operation_dates.max() > end_date
+            ):
+                reader_logger.info("Чтение остановлено: дата вышла за период")
+                break
+    finally:
+        workbook.close()
+
+
+def summarize_operation_batches(batches: Iterable[pd.DataFrame], k: int = 5) -> dict:
+    """
+    Функция расчета информации по картам и ТОП K транзакций за один проход по порциям.
+    :param batches: Итератор порций операций.
+    :param k: Количество ТОП транзакций.
+    :return: Словарь с блоками "cards" и "top_transactions".
+    """
+    top_candidates = []
+
+    def collect_top(batches: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for batch in batches:
+            top_candidates.append(batch.loc[batch["Сумма операции с округлением"].nlargest(k).index])
+            yield batch
+
+    cards = main_cards_stream(collect_top(batches))
+    reader_logger.info("Сводка по потоку операций сформирована")
+    return {"cards": cards, "top_transactions": top_transactions_stream(top_candidates, k)}
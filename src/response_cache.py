@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable
+
+from src.instrumentation import metrics
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.settings import UserSettings, get_settings
+from src.views import page_main, page_main_market
+
+if TYPE_CHECKING:
+    from src.backends import StorageBackend
+    from src.store import TransactionStore
+
+orjson = lazy_import("orjson")
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_MARKET_TTL = float(os.getenv("RESPONSE_MARKET_TTL", "60"))
+
+response_cache_logger = get_logger(__name__, "response_cache")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Функция сериализации ответа в JSON UTF-8: через orjson, если он установлен, иначе через json.
+    :param data: Ответ.
+    :return: Байты JSON.
+    """
+    if orjson is not None:
+        try:
+            return bytes(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+        except TypeError:
+            response_cache_logger.warning("orjson не сериализовал ответ, используется json")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    Кэш ответов главной страницы в виде готовых байтов JSON с LRU ограничением.
+    Часть ответа, которая зависит от даты, данных и настроек (приветствие, карты, ТОП транзакций), хранится
+    по ключу (дата, версия данных, настройки). Курсы валют и акций хранятся по настройкам с отдельным коротким TTL.
+    При попадании ответ собирается склейкой байтов без расчета и сериализации.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, market_ttl: float = RESPONSE_MARKET_TTL) -> None:
+        """
+        :param max_entries: Максимальное количество ответов в памяти.
+        :param market_ttl: Время жизни курсов валют и акций в секундах.
+        """
+        self.max_entries = max_entries
+        self.market_ttl = market_ttl
+        self.pages: OrderedDict[tuple, bytes] = OrderedDict()
+        self.market: OrderedDict[UserSettings, tuple[float, bytes]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = {"page": 0, "market": 0}
+        self.misses = {"page": 0, "market": 0}
+
+    def _count(self, cache: str, hit: bool) -> None:
+        """
+        Функция учета попадания или промаха. Вызывается под блокировкой.
+        :param cache: Часть ответа: "page" или "market".
+        :param hit: Попадание в кэш.
+        """
+        (self.hits if hit else self.misses)[cache] += 1
+        metrics.observe_cache(f"response_{cache}", hit)
+
+    def _remember(self, entries: OrderedDict, key: Hashable, value: Any) -> None:
+        """
+        Функция сохранения значения с вытеснением самых старых. Вызывается под блокировкой.
+        :param entries: Словарь кэша.
+        :param key: Ключ.
+        :param value: Значение.
+        """
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def page_main_json(
+        self,
+        date: str,
+        data_version: Hashable,
+        store: TransactionStore | StorageBackend | None = None,
+        settings: UserSettings | None = None,
+    ) -> bytes:
+        """
+        Функция получения ответа главной страницы в виде байтов JSON из кэша или расчетом page_main.
+        :param date: Входящая дата.
+        :param data_version: Версия данных хранилища, например подпись файла Excel (время изменения и размер).
+        :param store: Хранилище транзакций, передается в page_main.
+        :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
+        :return: Байты JSON ответа.
+        """
+        settings = settings or get_settings()
+        key = (date, data_version, settings)
+        now = time.monotonic()
+        with self.lock:
+            page = self.pages.get(key)
+            if page is not None:
+                self.pages.move_to_end(key)
+            self._count("page", page is not None)
+            market_entry = self.market.get(settings)
+            market = market_entry[1] if market_entry and now - market_entry[0] <= self.market_ttl else None
+            if page is not None:
+                self._count("market", market is not None)
+        if page is None:
+            response = page_main(date, store, settings=settings)
+            market_data = {name: response.pop(name) for name in ("currency_rates", "stock_prices")}
+            page, market = dumps(response), dumps(market_data)
+            with self.lock:
+                self._remember(self.pages, key, page)
+                self._remember(self.market, settings, (now, market))
+            response_cache_logger.info("Ответ главной страницы на %s сохранен в кэш", date)
+        elif market is None:
+            market = dumps(page_main_market(settings))
+            with self.lock:
+                self._remember(self.market, settings, (now, market))
+            response_cache_logger.info("Курсы валют и акций главной страницы обновлены в кэше")
+        return page[:-1] + b"," + market[1:]
+
+    def stats(self) -> dict:
+        """
+        Функция получения счетчиков кэша.
+        :return: Словарь с количеством попаданий, промахов и ответов в памяти.
+        """
+        with self.lock:
+            return {"hits": dict(self.hits), "misses": dict(self.misses), "entries": len(self.pages)}
+
+    def clear(self) -> None:
+        """
+        Функция очистки кэша ответов и рыночных данных, счетчики сохраняются.
+        """
+        with self.lock:
+            self.pages.clear()
+            self.market.clear()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+from datetime import date
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import parse_operation_dates
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa  # type: ignore[import-untyped]
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    pa = lazy_import("pyarrow")
+
+ROLLUP_KEYS = ["card", "category", "status"]
+ROLLUP_MEASURES = {
+    "spent": "Сумма операции с округлением",
+    "cashback": "Кэшбэк",
+    "bonuses": "Бонусы (включая кэшбэк)",
+    "invest_rounding": "Округление на инвесткопилку",
+}
+
+rollups_logger = get_logger(__name__, "rollups")
+
+
+def build_daily_rollups(operations: pd.DataFrame) -> pd.DataFrame:
+    """
+    Функция построения дневных агрегатов по (день, карта, категория, статус).
+    :param operations: DataFrame с операциями в формате выписки.
+    :return: DataFrame агрегатов с суммой операций, кэшбэком, бонусами, округлением на инвесткопилку и количеством.
+    """
+    days = parse_operation_dates(operations["Дата операции"]).astype("datetime64[D]").astype("datetime64[s]")
+    data = pd.DataFrame(
+        {
+            "period": days,
+            "card": operations["Номер карты"].to_numpy(dtype=object),
+            "category": operations["Категория"].to_numpy(dtype=object),
+            "status": operations["Статус"].to_numpy(dtype=object),
+            "count": 1,
+            **{
+                measure: operations[column].to_numpy(dtype="float64", na_value=np.nan)
+                for measure, column in ROLLUP_MEASURES.items()
+            },
+        }
+    )
+    return _group_rollups(data)
+
+
+def _group_rollups(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Функция суммирования строк агрегатов с одинаковыми периодом и ключами.
+    :param data: DataFrame агрегатов или операций в колонках агрегатов.
+    :return: DataFrame агрегатов, отсортированный по периоду.
+    """
+    grouped = data.groupby(["period"] + ROLLUP_KEYS, dropna=False, sort=True).agg(
+        {"count": "sum", **{measure: "sum" for measure in ROLLUP_MEASURES}}
+    )
+    return grouped.reset_index()
+
+
+class RollupTable:
+    """
+    Материализованные агрегаты операций по дням и месяцам.
+    Запрос за период берет полные месяцы из месячной таблицы и только крайние дни из дневной,
+    поэтому период в несколько лет читает тысячи строк агрегатов вместо миллионов строк операций.
+    """
+
+    def __init__(self, daily: pd.DataFrame) -> None:
+        """
+        :param daily: DataFrame дневных агрегатов build_daily_rollups.
+        """
+        self.daily = daily.sort_values("period", kind="stable").reset_index(drop=True)
+        monthly = self.daily.assign(
+            period=self.daily["period"].to_numpy().astype("datetime64[M]").astype("datetime64[s]")
+        )
+        self.monthly = _group_rollups(monthly)
+        self.daily_periods = self.daily["period"].to_numpy().astype("datetime64[D]")
+        self.monthly_periods = self.monthly["period"].to_numpy().astype("datetime64[D]")
+
+    @classmethod
+    def from_operations(cls, operations: pd.DataFrame) -> "RollupTable":
+        """
+        Функция построения агрегатов по операциям.
+        :param operations: DataFrame с операциями в формате выписки.
+        :return: Таблица агрегатов.
+        """
+        return cls(build_daily_rollups(operations))
+
+    @classmethod
+    def load(cls, path: str) -> "RollupTable":
+        """
+        Функция чтения дневных агрегатов из файла Arrow IPC через memory-map.
+        :param path: Путь к файлу агрегатов.
+        :return: Таблица агрегатов.
+        """
+        with pa.memory_map(path, "r") as source:
+            daily: pd.DataFrame = pa.ipc.open_file(source).read_all().to_pandas()
+        return cls(daily)
+
+    def save(self, path: str) -> None:
+        """
+        Функция записи дневных агрегатов в колоночный файл Arrow IPC.
+        :param path: Путь к файлу агрегатов.
+        """
+        table = pa.Table.from_pandas(self.daily, preserve_index=False)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        rollups_logger.info("Агрегаты сохранены, дневных строк: %s", len(self.daily))
+
+    def append(self, operations: pd.DataFrame) -> "RollupTable":
+        """
+        Функция добавления новых операций к агрегатам без пересчета истории операций.
+        :param operations: DataFrame с новыми операциями.
+        :return: Новая таблица агрегатов.
+        """
+        return RollupTable(_group_rollups(pd.concat([self.daily, build_daily_rollups(operations)])))
+
+    def query(self, start: date, end: date, status: str | None = None) -> pd.DataFrame:
+        """
+        Функция выбора строк агрегатов за период по дням включительно.
+        :param start: Первый день периода.
+        :param end: Последний день периода.
+        :param status: Статус операций, например "OK". По умолчанию все статусы.
+        :return: DataFrame строк агрегатов, покрывающих период.
+        """
+        first_day, last_day = np.datetime64(start, "D"), np.datetime64(end, "D")
+        first_month = first_day.astype("datetime64[M]")
+        if first_month.astype("datetime64[D]") != first_day:
+            first_month += 1
+        end_month = (last_day + 1).astype("datetime64[M]")
+        if first_month < end_month:
+            month_bounds = np.searchsorted(self.monthly_periods, [first_month, end_month])
+            head_bounds = np.searchsorted(self.daily_periods, [first_day, first_month])
+            tail_bounds = np.searchsorted(self.daily_periods, [end_month, last_day + 1])
+            rows = pd.concat(
+                [
+                    self.daily.iloc[slice(*head_bounds)],
+                    self.monthly.iloc[slice(*month_bounds)],
+                    self.daily.iloc[slice(*tail_bounds)],
+                ]
+            )
+        else:
+            day_bounds = np.searchsorted(self.daily_periods, [first_day, last_day + 1])
+            rows = self.daily.iloc[slice(*day_bounds)]
+        if status is not None:
+            rows = rows[rows["status"] == status]
+        rollups_logger.info("Выбрано строк агрегатов: %s", len(rows))
+        return rows
+
+    def card_summary(self, start: date, end: date, status: str | None = None) -> list[dict]:
+        """
+        Функция вывода информации по картам за период в формате main_cards.
+        :param start: Первый день периода.
+        :param end: Последний день периода.
+        :param status: Статус операций. По умолчанию все статусы.
+        :return: Информация по картам.
+        """
+        rows = self.query(start, end, status)
+        totals = rows.groupby("card", sort=True).agg({"spent": "sum", "cashback": "sum"})
+        return [
+            {
+                "last_digits": str(card_num)[-4:],
+                "total_spent": round(float(spent), 2),
+                "cashback": round(float(cashback), 2),
+            }
+            for card_num, spent, cashback in totals.itertuples()
+        ]
+
+    def category_report(self, start: date, end: date, status: str | None = "OK") -> list[dict]:
+        """
+        Функция отчета по категориям за период по убыванию суммы операций.
+        :param start: Первый день периода.
+        :param end: Последний день периода.
+        :param status: Статус операций. По умолчанию только успешные.
+        :return: Список категорий с суммой операций, кэшбэком и количеством.
+        """
+        rows = self.query(start, end, status)
+        totals = rows.groupby("category", sort=True).agg({"spent": "sum", "cashback": "sum", "count": "sum"})
+        totals = totals.sort_values("spent", ascending=False, kind="stable")
+        return [
+            {
+                "category": category,
+                "total_spent": round(float(spent), 2),
+                "cashback": round(float(cashback), 2),
+                "count": int(count),
+            }
+            for category, spent, cashback, count in totals.itertuples()
+        ]
+
+    def cashback_report(self, start: date, end: date, status: str | None = "OK") -> list[dict]:
+        """
+        Функция отчета по кэшбэку, бонусам и округлению на инвесткопилку по картам за период.
+        :param start: Первый день периода.
+        :param end: Последний день периода.
+        :param status: Статус операций. По умолчанию только успешные.
+        :return: Список карт с кэшбэком, бонусами и округлением.
+        """
+        rows = self.query(start, end, status)
+        totals = rows.groupby("card", sort=True).agg({"cashback": "sum", "bonuses": "sum", "invest_rounding": "sum"})
+        return [
+            {
+                "last_digits": str(card_num)[-4:],
+                "cashback": round(float(cashback), 2),
+                "bonuses": round(float(bonuses), 2),
+                "invest_rounding": round(float(invest_rounding), 2),
+            }
+            for card_num, cashback, bonuses, invest_rounding in totals.itertuples()
+        ]
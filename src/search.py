@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TERM_PATTERN = re.compile(r'(?:[^\s"]+|"[^"]*"?)+')
+OR_PATTERN = re.compile(r"\s+(?:OR|ИЛИ)\s+|\s*\|\s*")
+FIELDS = ("category", "mcc")
+GROUP_COLUMNS = {"description": "Описание", "category": "Категория", "mcc": "MCC"}
+
+search_logger = get_logger(__name__, "search")
+
+
+def normalize_tokens(text: str) -> list[str]:
+    """
+    Функция разбиения текста на нормализованные токены: нижний регистр, ё заменяется на е.
+    :param text: Текст, например описание операции "Ozon.ru".
+    :return: Список токенов, например ["ozon", "ru"].
+    """
+    return TOKEN_PATTERN.findall(text.lower().replace("ё", "е"))
+
+
+def _field_key(field: str, value: object) -> str:
+    """
+    Функция ключа индекса для значения категории или MCC.
+    :param field: Поле: "category" или "mcc".
+    :param value: Значение поля.
+    :return: Ключ, например "category:супермаркеты" или "mcc:5411".
+    """
+    if field == "mcc":
+        try:
+            return f"mcc:{int(float(str(value)))}"
+        except ValueError:
+            return f"mcc:{value}"
+    return f"{field}:{' '.join(normalize_tokens(str(value)))}"
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс операций: токен описания, категория или MCC - отсортированный массив номеров строк
+    в ленте операций, отсортированной по дате. Период - непрерывный диапазон строк, поэтому запрос за период
+    выполняется пересечением и объединением массивов и двумя бинарными поисками.
+    """
+
+    def __init__(self, operations: pd.DataFrame) -> None:
+        """
+        :param operations: DataFrame с операциями в формате выписки, отсортированный по дате операции.
+        """
+        parts: dict[str, list[np.ndarray]] = {}
+        self.size = len(operations)
+        self.codes: dict[str, tuple[np.ndarray, pd.Index]] = {}
+        for name, column in GROUP_COLUMNS.items():
+            values = operations[column].to_numpy(dtype=object)
+            codes, uniques = pd.factorize(values)
+            self.codes[name] = (codes, pd.Index(uniques))
+            rows_by_value = self._group_rows(codes, len(uniques))
+            for code, value in enumerate(uniques):
+                keys = {_field_key(name, value)} if name in FIELDS else set(normalize_tokens(str(value)))
+                for key in keys:
+                    parts.setdefault(key, []).append(rows_by_value[code])
+        self.postings = {
+            key: np.sort(np.concatenate(rows)) if len(rows) > 1 else rows[0] for key, rows in parts.items()
+        }
+        self.amounts = np.nan_to_num(operations["Сумма операции с округлением"].to_numpy(dtype=float))
+        self.cashback = np.nan_to_num(operations["Кэшбэк"].to_numpy(dtype=float))
+        self.payment_dates = operations["Дата платежа"].to_numpy(dtype=object)
+        search_logger.info("Индекс поиска построен: строк %s, ключей %s", self.size, len(self.postings))
+
+    @staticmethod
+    def _group_rows(codes: np.ndarray, count: int) -> list[np.ndarray]:
+        """
+        Функция группировки номеров строк по кодам значений одной сортировкой.
+        :param codes: Коды значений строк, -1 для пустых.
+        :param count: Количество значений.
+        :return: Список отсортированных массивов номеров строк по кодам.
+        """
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.searchsorted(codes[order], np.arange(count + 1))
+        first, last = boundaries[0], boundaries[-1]
+        return np.split(order[first:last], boundaries[1:-1] - first)
+
+    def term_rows(self, term: str, low: int = 0, high: int | None = None) -> np.ndarray:
+        """
+        Функция поиска строк по одному условию запроса в диапазоне строк периода.
+        Массивы строк сначала обрезаются бинарным поиском по периоду, затем пересекаются.
+        :param term: Слово описания, "category:<категория>" или "mcc:<код>".
+        :param low: Первая строка периода.
+        :param high: Строка после последней строки периода, по умолчанию конец ленты.
+        :return: Отсортированный массив номеров строк.
+        """
+        high = self.size if high is None else high
+        field, _, value = term.partition(":")
+        if field.lower() in FIELDS and value:
+            keys = [_field_key(field.lower(), value)]
+        else:
+            keys = normalize_tokens(term)
+        rows = None
+        for key in keys:
+            posting = self.postings.get(key, np.empty(0, dtype=np.int64))
+            start, end = np.searchsorted(posting, [low, high])
+            posting = posting[start:end]
+            rows = posting if rows is None else np.intersect1d(rows, posting, assume_unique=True)
+        return np.empty(0, dtype=np.int64) if rows is None else rows
+
+    def query(self, expression: str, low: int = 0, high: int | None = None) -> np.ndarray:
+        """
+        Функция поиска строк по запросу в диапазоне строк периода.
+        Условия через пробел объединяются по И, группы условий через OR, ИЛИ или | - по ИЛИ.
+        Значения с пробелами берутся в двойные кавычки, например: лента OR category:"Дом и ремонт" OR mcc:5411,
+        апострофы и незакрытые кавычки считаются частью слова.
+        :param expression: Запрос.
+        :param low: Первая строка периода.
+        :param high: Строка после последней строки периода, по умолчанию конец ленты.
+        :return: Отсортированный массив номеров строк.
+        """
+        clauses = []
+        for clause in OR_PATTERN.split(expression.strip()):
+            terms = [term.replace('"', "") for term in TERM_PATTERN.findall(clause) if term.strip('"')]
+            if not terms:
+                continue
+            clause_rows = self.term_rows(terms[0], low, high)
+            for term in terms[1:]:
+                clause_rows = np.intersect1d(clause_rows, self.term_rows(term, low, high), assume_unique=True)
+            clauses.append(clause_rows)
+        if len(clauses) < 2:
+            return clauses[0] if clauses else np.empty(0, dtype=np.int64)
+        high = self.size if high is None else high
+        found = np.zeros(high - low, dtype=bool)
+        for clause_rows in clauses:
+            found[clause_rows - low] = True
+        return np.flatnonzero(found) + low
+
+    def aggregate(self, rows: np.ndarray, by: str = "category") -> list[dict]:
+        """
+        Функция сумм операций по получателям, категориям или MCC для найденных строк.
+        :param rows: Номера строк.
+        :param by: Группировка: "description", "category" или "mcc".
+        :return: Список словарей с количеством, суммой и кэшбэком по убыванию суммы.
+        """
+        codes, uniques = self.codes[by]
+        row_codes = codes[rows]
+        known = row_codes >= 0
+        row_codes, rows = row_codes[known], rows[known]
+        counts = np.bincount(row_codes, minlength=len(uniques))
+        spent = np.bincount(row_codes, weights=self.amounts[rows], minlength=len(uniques))
+        cashback = np.bincount(row_codes, weights=self.cashback[rows], minlength=len(uniques))
+        groups = np.flatnonzero(counts)
+        groups = groups[np.argsort(-spent[groups], kind="stable")]
+        return [
+            {
+                by: int(uniques[code]) if by == "mcc" else str(uniques[code]),
+                "count": int(counts[code]),
+                "total_spent": round(float(spent[code]), 2),
+                "cashback": round(float(cashback[code]), 2),
+            }
+            for code in groups.tolist()
+        ]
+
+    def transactions(self, rows: np.ndarray, limit: int = 20) -> list[dict]:
+        """
+        Функция вывода последних найденных транзакций в формате ТОП транзакций.
+        :param rows: Номера строк по возрастанию даты.
+        :param limit: Количество транзакций.
+        :return: Список транзакций от новых к старым.
+        """
+        descriptions, categories = self.codes["description"], self.codes["category"]
+        return [
+            {
+                "date": self.payment_dates[row],
+                "amount": float(self.amounts[row]),
+                "category": categories[1][categories[0][row]] if categories[0][row] >= 0 else None,
+                "description": descriptions[1][descriptions[0][row]] if descriptions[0][row] >= 0 else None,
+            }
+            for row in rows[::-1][:limit].tolist()
+        ]
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+
+from src.cache import get_source_signature
+from src.instrumentation import metrics
+from src.log_setup import get_logger
+from src.response_cache import ResponseCache
+from src.store import TransactionStore
+from src.utils import ROOT_DIR
+from src.views import page_main, page_search
+
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+server_logger = get_logger(__name__, "server")
+
+
+class DashboardState:
+    """
+    Теплое состояние сервиса: загруженное хранилище транзакций, которое перечитывается при изменении файла Excel,
+    и кэш готовых ответов главной страницы по дате, подписи файла Excel и настройкам.
+    Кэши курсов и HTTP сессии живут на уровне модуля utils и переиспользуются между запросами.
+    """
+
+    def __init__(self, filename: str = ROOT_DIR + "/data/operations.xlsx") -> None:
+        """
+        :param filename: Путь к файлу Excel.
+        """
+        self.filename = filename
+        self.signature: dict[str, str] | None = None
+        self.store: TransactionStore | None = None
+        self.lock = threading.Lock()
+        self.response_cache = ResponseCache()
+
+    def get_versioned_store(self) -> tuple[TransactionStore, tuple]:
+        """
+        Функция получения хранилища с перезагрузкой, если файл Excel изменился.
+        :return: Хранилище транзакций и версия его данных - подпись файла Excel.
+        """
+        signature = get_source_signature(self.filename)
+        with self.lock:
+            if self.store is None or signature != self.signature:
+                self.store = TransactionStore.from_excel(self.filename)
+                self.store.get_search_index()
+                self.signature = signature
+                server_logger.info("Хранилище транзакций загружено из %s", self.filename)
+            return self.store, tuple(signature.values())
+
+    def get_store(self) -> TransactionStore:
+        """
+        Функция получения хранилища с перезагрузкой, если файл Excel изменился.
+        :return: Хранилище транзакций.
+        """
+        return self.get_versioned_store()[0]
+
+    def handle(self, path: str) -> tuple[HTTPStatus, dict | str | bytes]:
+        """
+        Функция обработки запроса по пути и параметрам.
+        GET /metrics возвращает метрики вызовов функций utils в текстовом формате Prometheus,
+        GET /search?q=...&start=...&end=... - результат поиска операций page_search.
+        Ответы GET /main без timings отдаются из кэша готовых ответов.
+        :param path: Путь запроса с параметрами.
+        :return: Статус ответа и тело ответа: словарь для JSON, готовые байты JSON или текст метрик.
+        """
+        url = urlparse(path)
+        if url.path == "/metrics":
+            return HTTPStatus.OK, metrics.render()
+        query = parse_qs(url.query)
+        if url.path == "/search":
+            if not all(query.get(key) for key in ("q", "start", "end")):
+                return HTTPStatus.BAD_REQUEST, {"error": "Не указаны параметры q, start и end"}
+            try:
+                return HTTPStatus.OK, page_search(query["q"][0], query["start"][0], query["end"][0], self.get_store())
+            except ValueError as error:
+                return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        if url.path != "/main":
+            return HTTPStatus.NOT_FOUND, {"error": "Страница не найдена"}
+        date = query.get("date")
+        if not date:
+            return HTTPStatus.BAD_REQUEST, {"error": "Не указан параметр date"}
+        timings = query.get("timings", ["0"])[0] in ("1", "true")
+        try:
+            store, data_version = self.get_versioned_store()
+            if timings:
+                return HTTPStatus.OK, page_main(date[0], store, timings)
+            return HTTPStatus.OK, self.response_cache.page_main_json(date[0], data_version, store)
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except Exception:
+            server_logger.exception("Ошибка обработки запроса %s", path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Внутренняя ошибка сервера"}
+
+
+async def handle_connection(state: DashboardState, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Функция обработки HTTP/1.1 соединения с поддержкой keep-alive.
+    :param state: Состояние сервиса.
+    :param reader: Поток чтения соединения.
+    :param writer: Поток записи соединения.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while request_line := await reader.readline():
+            method, path, version = request_line.decode("latin-1").split()
+            headers = {}
+            body: dict | str | bytes
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if method != "GET":
+                status, body = HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Поддерживается только GET"}
+            else:
+                status, body = await loop.run_in_executor(None, state.handle, path)
+            if isinstance(body, bytes):
+                payload, content_type = body, JSON_CONTENT_TYPE
+            elif isinstance(body, str):
+                payload, content_type = body.encode("utf-8"), METRICS_CONTENT_TYPE
+            else:
+                payload, content_type = json.dumps(body, ensure_ascii=False).encode("utf-8"), JSON_CONTENT_TYPE
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError):
+        server_logger.warning("Соединение закрыто из-за некорректного запроса")
+    finally:
+        writer.close()
+
+
+async def create_server(state: DashboardState, host: str = "127.0.0.1", port: int = 8000) -> asyncio.Server:
+    """
+    Функция создания HTTP сервера главной страницы.
+    :param state: Состояние сервиса.
+    :param host: Адрес.
+    :param port: Порт, 0 для случайного свободного порта.
+    :return: Запущенный сервер asyncio.
+    """
+    return await asyncio.start_server(lambda reader, writer: handle_connection(state, reader, writer), host, port)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, filename: str = ROOT_DIR + "/data/operations.xlsx") -> None:
+    """
+    Функция запуска сервиса с GET /main?date=YYYY-MM-DD HH:MM:SS[&timings=1], GET /search и GET /metrics.
+    Данные загружаются при старте, чтобы первый запрос не ждал чтения Excel.
+    :param host: Адрес.
+    :param port: Порт.
+    :param filename: Путь к файлу Excel.
+    """
+    state = DashboardState(filename)
+    state.get_store()
+    server = await create_server(state, host, port)
+    server_logger.info("Сервис запущен на %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+from src.log_setup import get_logger
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTINGS_PATH = ROOT_DIR + "/user_settings.json"
+CURRENCY_PATTERN = re.compile(r"^[A-Z]{3}$")
+SETTINGS_KEYS = ("user_currencies", "user_stocks", "storage_backend", "storage_path", "reporting_currency")
+
+settings_logger = get_logger(__name__, "settings")
+
+
+class SettingsError(ValueError):
+    """
+    Ошибка чтения или проверки файла пользовательских настроек.
+    """
+
+
+@dataclass(frozen=True)
+class UserSettings:
+    """
+    Проверенные пользовательские настройки: валюты, акции, хранилище транзакций и валюта отчета.
+    """
+
+    user_currencies: tuple[str, ...]
+    user_stocks: tuple[str, ...]
+    storage_backend: str = "excel"
+    storage_path: str | None = None
+    reporting_currency: str | None = None
+    extra: dict = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserSettings":
+        """
+        Функция проверки настроек по схеме.
+        :param data: Словарь настроек из user_settings.json.
+        :return: Проверенные настройки.
+        """
+        if not isinstance(data, dict):
+            raise SettingsError("Настройки должны быть объектом JSON")
+        currencies = _string_list(data, "user_currencies")
+        invalid = [currency for currency in currencies if not CURRENCY_PATTERN.match(currency)]
+        if invalid:
+            raise SettingsError(f"Некорректные коды валют в user_currencies: {', '.join(invalid)}")
+        storage_backend = data.get("storage_backend", "excel")
+        if not isinstance(storage_backend, str) or not storage_backend:
+            raise SettingsError("storage_backend должен быть непустой строкой")
+        storage_path = data.get("storage_path")
+        if storage_path is not None and not isinstance(storage_path, str):
+            raise SettingsError("storage_path должен быть строкой")
+        reporting_currency = data.get("reporting_currency")
+        if reporting_currency is not None and not (
+            isinstance(reporting_currency, str) and CURRENCY_PATTERN.match(reporting_currency)
+        ):
+            raise SettingsError("reporting_currency должен быть кодом валюты из трех заглавных букв")
+        extra = {key: value for key, value in data.items() if key not in SETTINGS_KEYS}
+        if extra:
+            settings_logger.warning("Неизвестные ключи настроек: %s", ", ".join(extra))
+        return cls(
+            currencies, _string_list(data, "user_stocks"), storage_backend, storage_path, reporting_currency, extra
+        )
+
+    def as_dict(self) -> dict:
+        """
+        Функция возврата настроек в формате user_settings.json.
+        :return: Словарь настроек.
+        """
+        data = {
+            **self.extra,
+            "user_currencies": list(self.user_currencies),
+            "user_stocks": list(self.user_stocks),
+            "storage_backend": self.storage_backend,
+        }
+        if self.storage_path is not None:
+            data["storage_path"] = self.storage_path
+        if self.reporting_currency is not None:
+            data["reporting_currency"] = self.reporting_currency
+        return data
+
+
+def _string_list(data: dict, key: str) -> tuple[str, ...]:
+    """
+    Функция проверки обязательного списка непустых строк.
+    :param data: Словарь настроек.
+    :param key: Ключ списка.
+    :return: Кортеж строк.
+    """
+    values = data.get(key)
+    if not isinstance(values, list) or not all(isinstance(value, str) and value for value in values):
+        raise SettingsError(f"{key} должен быть списком непустых строк")
+    return tuple(values)
+
+
+class SettingsLoader:
+    """
+    Загрузчик настроек с кэшем: файл читается и проверяется один раз и перечитывается,
+    только если изменились время изменения или размер файла. Безопасен для вызова из нескольких потоков.
+    """
+
+    def __init__(self, path: str = SETTINGS_PATH) -> None:
+        """
+        :param path: Путь к файлу настроек.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.cached: tuple[tuple[int, int], UserSettings] | None = None
+
+    def get(self) -> UserSettings:
+        """
+        Функция получения настроек с перечитыванием при изменении файла.
+        :return: Проверенные настройки.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError as error:
+            settings_logger.error("Файл настроек %s отсутствует", self.path)
+            raise SettingsError(f"Файл настроек {self.path} отсутствует") from error
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.cached
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with self.lock:
+            if self.cached is None or self.cached[0] != signature:
+                try:
+                    with open(self.path, encoding="utf-8") as file:
+                        data = json.load(file)
+                except (OSError, ValueError) as error:
+                    settings_logger.error("Ошибка чтения структуры json файла %s", self.path)
+                    raise SettingsError(f"Ошибка чтения структуры json файла {self.path}") from error
+                self.cached = (signature, UserSettings.from_dict(data))
+                settings_logger.info("Файл настроек %s загружен", self.path)
+            return self.cached[1]
+
+
+settings_loader = SettingsLoader()
+
+
+def get_settings() -> UserSettings:
+    """
+    Функция получения пользовательских настроек из кэша загрузчика user_settings.json.
+    :return: Проверенные настройки.
+    """
+    return settings_loader.get()
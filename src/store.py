@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src.analytics import SpendingAnalytics
+from src.cache import read_operations
+from src.currency import normalize_currency
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.models import parse_operation_dates
+from src.search import SearchIndex
+from src.utils import ROOT_DIR
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+store_logger = get_logger(__name__, "store")
+
+
+class CardPrefixSums:
+    """
+    Накопленные суммы операций и кэшбэка одной карты вдоль отсортированной ленты.
+    Буферы растут с удвоением емкости, поэтому добавление новых строк стоит O(новых строк).
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.operation_dates = np.empty(0, dtype="datetime64[s]")
+        self.spent = np.zeros(1)
+        self.cashback = np.zeros(1)
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Функция увеличения емкости буферов.
+        :param capacity: Требуемое количество строк.
+        """
+        if capacity <= len(self.operation_dates):
+            return
+        new_capacity = max(capacity, 2 * len(self.operation_dates), 16)
+        operation_dates = np.empty(new_capacity, dtype="datetime64[s]")
+        operation_dates[: self.size] = self.operation_dates[: self.size]
+        spent = np.zeros(new_capacity + 1)
+        spent[: self.size + 1] = self.spent[: self.size + 1]
+        cashback = np.zeros(new_capacity + 1)
+        cashback[: self.size + 1] = self.cashback[: self.size + 1]
+        self.operation_dates, self.spent, self.cashback = operation_dates, spent, cashback
+
+    def append(self, operation_dates: np.ndarray, spent: np.ndarray, cashback: np.ndarray) -> None:
+        """
+        Функция добавления строк карты, отсортированных по дате.
+        Если новые строки раньше уже добавленных, накопленные суммы карты пересчитываются.
+        :param operation_dates: Даты операций.
+        :param spent: Суммы операций с округлением.
+        :param cashback: Кэшбэк.
+        """
+        if self.size and len(operation_dates) and operation_dates[0] < self.operation_dates[self.size - 1]:
+            all_dates = np.concatenate([self.operation_dates[: self.size], operation_dates])
+            all_spent = np.concatenate([np.diff(self.spent[: self.size + 1]), spent])
+            all_cashback = np.concatenate([np.diff(self.cashback[: self.size + 1]), cashback])
+            order = np.argsort(all_dates, kind="stable")
+            self.size = 0
+            operation_dates, spent, cashback = all_dates[order], all_spent[order], all_cashback[order]
+        start, end = self.size, self.size + len(operation_dates)
+        self._reserve(end)
+        prefix_rows = slice(start + 1, end + 1)
+        self.operation_dates[start:end] = operation_dates
+        self.spent[prefix_rows] = self.spent[start] + np.cumsum(spent)
+        self.cashback[prefix_rows] = self.cashback[start] + np.cumsum(cashback)
+        self.size = end
+
+    def totals(self, start: datetime, end: datetime) -> tuple[int, float, float]:
+        """
+        Функция расчета итогов карты за период двумя бинарными поисками и вычитанием.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Количество операций, сумма операций и кэшбэк за период.
+        """
+        operation_dates = self.operation_dates[: self.size]
+        low = int(np.searchsorted(operation_dates, np.datetime64(start, "s"), side="left"))
+        high = max(low, int(np.searchsorted(operation_dates, np.datetime64(end, "s"), side="right")))
+        return high - low, self.spent[high] - self.spent[low], self.cashback[high] - self.cashback[low]
+
+
+class CardTotalsIndex:
+    """
+    Индекс накопленных сумм по картам для расчета итогов за любой период за O(карт).
+    """
+
+    def __init__(self) -> None:
+        self.cards: dict[str, CardPrefixSums] = {}
+
+    def append(self, operations: pd.DataFrame, operation_dates: np.ndarray) -> None:
+        """
+        Функция добавления операций в индекс.
+        :param operations: DataFrame с операциями.
+        :param operation_dates: Даты операций в виде datetime64[s].
+        """
+        card_numbers = operations["Номер карты"].to_numpy(dtype=object)
+        has_card = pd.notna(card_numbers)
+        codes, uniques = pd.factorize(card_numbers[has_card])
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        spent = np.nan_to_num(operations["Сумма операции с округлением"].to_numpy(dtype=float)[has_card][order])
+        cashback = np.nan_to_num(operations["Кэшбэк"].to_numpy(dtype=float)[has_card][order])
+        card_dates = operation_dates[has_card][order]
+        for code, card_num in enumerate(uniques):
+            rows = slice(boundaries[code], boundaries[code + 1])
+            card = self.cards.setdefault(str(card_num), CardPrefixSums())
+            card.append(card_dates[rows], spent[rows], cashback[rows])
+
+    def summary(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Функция вывода информации по картам за период в формате main_cards.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Информация по картам.
+        """
+        cards = []
+        for card_num in sorted(self.cards):
+            count, total_spent, cashback = self.cards[card_num].totals(start, end)
+            if count:
+                cards.append(
+                    {
+                        "last_digits": card_num[-4:],
+                        "total_spent": round(float(total_spent), 2),
+                        "cashback": round(float(cashback), 2),
+                    }
+                )
+        return cards
+
+
+class TransactionStore:
+    """
+    Хранилище транзакций в памяти, отсортированных по дате операции.
+    Загружается один раз и отдает срезы за период бинарным поиском за O(log n).
+    Для каждой строки хранится ее позиция в исходной выписке, чтобы при равных суммах ТОП транзакций
+    выбирался в порядке файла, как при чтении Excel.
+    """
+
+    def __init__(self, operations: pd.DataFrame, positions: np.ndarray | None = None) -> None:
+        """
+        :param operations: DataFrame с операциями в формате выписки.
+        :param positions: Позиции строк в исходной выписке. Если не переданы, берется порядок строк operations.
+        """
+        operation_dates = parse_operation_dates(operations["Дата операции"])
+        order = np.argsort(operation_dates, kind="stable")
+        source_positions = np.arange(len(operations)) if positions is None else np.asarray(positions)
+        self.operations = operations.iloc[order].reset_index(drop=True)
+        self.operation_dates = operation_dates[order]
+        self.positions = source_positions[order]
+        self.card_index = CardTotalsIndex()
+        self.card_index.append(self.operations, self.operation_dates)
+        self.search_index: SearchIndex | None = None
+        self.analytics: SpendingAnalytics | None = None
+        self.normalized: dict[str, TransactionStore] = {}
+        store_logger.info("Хранилище транзакций создано, строк: %s", len(self.operations))
+
+    @classmethod
+    def from_excel(cls, filename: str = ROOT_DIR + "/data/operations.xlsx") -> "TransactionStore":
+        """
+        Функция создания хранилища из файла Excel.
+        :param filename: Путь к файлу Excel.
+        :return: Хранилище транзакций.
+        """
+        return cls(read_operations(filename))
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def append(self, operations: pd.DataFrame) -> None:
+        """
+        Функция добавления новых операций в хранилище с обновлением индекса карт.
+        :param operations: DataFrame с новыми операциями.
+        """
+        operation_dates = parse_operation_dates(operations["Дата операции"])
+        order = np.argsort(operation_dates, kind="stable")
+        new_operations = operations.iloc[order].reset_index(drop=True)
+        new_dates = operation_dates[order]
+        all_operations = pd.concat([self.operations, new_operations], ignore_index=True)
+        all_dates = np.concatenate([self.operation_dates, new_dates])
+        all_positions = np.concatenate([self.positions, len(self.positions) + order])
+        if len(self.operation_dates) and len(new_dates) and new_dates[0] < self.operation_dates[-1]:
+            merge_order = np.argsort(all_dates, kind="stable")
+            all_operations = all_operations.iloc[merge_order].reset_index(drop=True)
+            all_dates = all_dates[merge_order]
+            all_positions = all_positions[merge_order]
+        self.operations, self.operation_dates, self.positions = all_operations, all_dates, all_positions
+        self.card_index.append(new_operations, new_dates)
+        self.search_index = None
+        if self.analytics is not None:
+            self.analytics.append(new_operations, new_dates)
+        for currency, normalized in self.normalized.items():
+            normalized.append(normalize_currency(operations, currency))
+        store_logger.info("В хранилище добавлено строк: %s", len(new_operations))
+
+    def bounds(self, start: datetime, end: datetime) -> tuple[int, int]:
+        """
+        Функция поиска границ периода в отсортированной ленте операций.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Индексы начала и конца среза.
+        """
+        low = int(np.searchsorted(self.operation_dates, np.datetime64(start, "s"), side="left"))
+        high = int(np.searchsorted(self.operation_dates, np.datetime64(end, "s"), side="right"))
+        return low, max(low, high)
+
+    def slice(self, start: datetime, end: datetime, source_order: bool = False) -> pd.DataFrame:
+        """
+        Функция получения операций за период.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :param source_order: Вернуть строки в порядке исходной выписки, а не по возрастанию даты.
+        :return: DataFrame с операциями за период.
+        """
+        low, high = self.bounds(start, end)
+        operations = self.operations.iloc[low:high]
+        if source_order:
+            operations = operations.iloc[np.argsort(self.positions[low:high], kind="stable")]
+        return operations
+
+    def get_search_index(self) -> SearchIndex:
+        """
+        Функция получения индекса поиска по описанию, категории и MCC. Индекс строится при первом вызове
+        и после добавления операций.
+        :return: Индекс поиска.
+        """
+        if self.search_index is None:
+            self.search_index = SearchIndex(self.operations)
+        return self.search_index
+
+    def get_analytics(self) -> SpendingAnalytics:
+        """
+        Функция получения скользящей статистики трат по картам. Статистика считается при первом вызове,
+        а новые операции из append() добавляются в нее без пересчета окон старых строк.
+        :return: Статистика трат.
+        """
+        if self.analytics is None:
+            self.analytics = SpendingAnalytics()
+            self.analytics.append(self.operations, self.operation_dates)
+        return self.analytics
+
+    def get_normalized(self, currency: str) -> TransactionStore:
+        """
+        Функция получения хранилища с суммами в валюте отчета по курсу на дату операции.
+        Хранилище пересчитывается при первом вызове, а новые операции из append() пересчитываются и добавляются в него.
+        :param currency: Валюта отчета.
+        :return: Хранилище транзакций в валюте отчета.
+        """
+        if currency not in self.normalized:
+            self.normalized[currency] = TransactionStore(normalize_currency(self.operations, currency), self.positions)
+        return self.normalized[currency]
+
+    def search(self, expression: str, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Функция поиска операций за период по запросу к индексу.
+        :param expression: Запрос, например: лента OR category:"Дом и ремонт" OR mcc:5411.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Номера строк ленты по возрастанию даты.
+        """
+        low, high = self.bounds(start, end)
+        return self.get_search_index().query(expression, low, high)
+
+    def card_summary(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Функция вывода информации по картам за период по индексу накопленных сумм.
+        :param start: Начало периода включительно.
+        :param end: Конец периода включительно.
+        :return: Информация по картам.
+        """
+        cards = self.card_index.summary(start, end)
+        if not cards:
+            store_logger.error("Empty DataFrame - данные пусты, поменяйте дату")
+            raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
+        return cards
@@ -1,27 +1,81 @@
+from __future__ import annotations
+
+import heapq
 import json
-import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Iterable, TypeVar
+
+from src.api_cache import ApiCache
+from src.cache import read_operations
+from src.instrumentation import map_in_context, record_http_response, timed
+from src.lazy import lazy_import
+from src.log_setup import get_logger
+from src.market_data import MarketDataClient, MarketDataError, MarketDataUnavailable
+from src.models import FIELD_COLUMNS, TransactionBatch, parse_operation_dates
+from src.settings import UserSettings, get_settings
+
+if TYPE_CHECKING:
+    import dotenv
+    import numpy as np
+    import pandas as pd
+    import requests
 
-import pandas as pd
-import requests
-from dotenv import load_dotenv
+    from src.store import TransactionStore
+
+    Transactions = list[dict] | pd.DataFrame | TransactionBatch
+else:
+    dotenv = lazy_import("dotenv")
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    requests = lazy_import("requests")
+
+OperationsT = TypeVar("OperationsT", "pd.DataFrame", TransactionBatch)
 
-load_dotenv()
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.exists(ROOT_DIR + "/.env"):
+    dotenv.load_dotenv(ROOT_DIR + "/.env")
 
-utils_logger = logging.getLogger(__name__)
-utils_logger.setLevel(logging.DEBUG)
-file_handler = logging.FileHandler(ROOT_DIR + "/log/logging_utils.log", mode="w", encoding="utf-8")
-file_formatter = logging.Formatter("%(asctime)s %(module)s %(funcName)s %(levelname)s: %(message)s")
-file_handler.setFormatter(file_formatter)
-utils_logger.addHandler(file_handler)
+utils_logger = get_logger(__name__, "utils")
 
 API_KEY = os.getenv("API_KEY")
 API_KEY_STOCKS = os.getenv("API_KEY_STOCKS")
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_MAX_WORKERS = 8
+CURRENCY_API_URL = os.getenv("CURRENCY_API_URL", "https://api.apilayer.com/exchangerates_data")
+STOCKS_API_URL = os.getenv("STOCKS_API_URL", "https://www.alphavantage.co/query")
+STOCKS_RATE_PER_MINUTE = float(os.getenv("STOCKS_RATE_PER_MINUTE", "5"))
+CURRENCY_RATE_PER_MINUTE = float(os.getenv("CURRENCY_RATE_PER_MINUTE", "60"))
+MARKET_DATA_MAX_WAIT = float(os.getenv("MARKET_DATA_MAX_WAIT", "0"))
+
+http_session: requests.Session | None = None
+http_session_lock = threading.Lock()
+api_executor = ThreadPoolExecutor(max_workers=API_MAX_WORKERS, thread_name_prefix="api")
+api_cache = ApiCache()
+# Главная страница ждет квоту не дольше MARKET_DATA_MAX_WAIT, после чего возвращает последнее известное значение.
+stocks_client = MarketDataClient(
+    "stocks", STOCKS_RATE_PER_MINUTE, burst=STOCKS_RATE_PER_MINUTE, max_wait=MARKET_DATA_MAX_WAIT
+)
+currency_client = MarketDataClient("currency", CURRENCY_RATE_PER_MINUTE, burst=10, max_wait=MARKET_DATA_MAX_WAIT)
 
 
+def get_http_session() -> requests.Session:
+    """
+    Функция получения общей keep-alive сессии HTTP для запросов API. Сессия создается при первом запросе,
+    чтобы импорт модуля не загружал requests.
+    :return: Сессия requests.
+    """
+    global http_session
+    with http_session_lock:
+        if http_session is None:
+            http_session = requests.Session()
+            http_session.hooks["response"].append(record_http_response)
+        return http_session
+
+
+@timed
 def get_period_date(date: str) -> tuple[datetime, datetime]:
     """
     Функция получения периода дат с начала месяца до указанной даты
@@ -33,28 +87,61 @@ def get_period_date(date: str) -> tuple[datetime, datetime]:
     return format_date, format_date.replace(day=1)
 
 
+def _as_frame(transactions: Transactions) -> pd.DataFrame:
+    """
+    Функция приведения транзакций к DataFrame.
+    :param transactions: Список словарей, DataFrame или пакет транзакций.
+    :return: DataFrame с транзакциями.
+    """
+    if isinstance(transactions, TransactionBatch):
+        return transactions.to_frame()
+    return pd.DataFrame(transactions)
+
+
+@timed
+def filter_operations_by_period(operations: OperationsT, period_datetime: tuple[datetime, datetime]) -> OperationsT:
+    """
+    Функция фильтрации операций по периоду дат одной векторной маской.
+    :param operations: DataFrame или пакет транзакций.
+    :param period_datetime: Кортеж с указанной датой и началом месяца.
+    :return: Операции за период того же типа, что и на входе.
+    """
+    end_date, start_date = period_datetime
+    if isinstance(operations, TransactionBatch):
+        operation_dates = operations.columns["operation_date"]
+    else:
+        operation_dates = parse_operation_dates(operations["Дата операции"])
+    period_mask = (operation_dates >= np.datetime64(start_date, "s")) & (
+        operation_dates <= np.datetime64(end_date, "s")
+    )
+    if isinstance(operations, TransactionBatch):
+        return operations[period_mask]
+    return operations.loc[period_mask].reset_index(drop=True)
+
+
+@timed
 def read_finance_excel_operation(
-    period_datetime: tuple[datetime, datetime], filename: str | None = ROOT_DIR + "/data/operations.xlsx"
-) -> list[dict[Any, Any]]:
+    period_datetime: tuple[datetime, datetime],
+    filename: "str | TransactionStore | None" = ROOT_DIR + "/data/operations.xlsx",
+) -> pd.DataFrame:
     """
-    Функция для считывания финансовых операций из Excel выдает список словарей с транзакциями.
-    :param filename: Путь к файлу Excel.
+    Функция для считывания финансовых операций из Excel выдает DataFrame с транзакциями за период.
+    Файл Excel читается через колоночный кэш Arrow, который пересобирается при изменении файла.
+    Вместо пути можно передать TransactionStore, тогда период берется срезом из памяти в порядке строк выписки.
+    :param filename: Путь к файлу Excel или хранилище транзакций.
     :param period_datetime: Лист с периодом начала мес и указанной датой для сортировки
-    :return: Список словарей с транзакциями.
+    :return: DataFrame с транзакциями.
     """
+    if filename is not None and not isinstance(filename, str):
+        end_date, start_date = period_datetime
+        utils_logger.info("Данные транзакций получены срезом из хранилища")
+        return filename.slice(start_date, end_date, source_order=True)
     if filename:
         try:
-            excel_data = pd.read_excel(filename)
-            end_date, start_date = period_datetime
-            group_data = excel_data.to_dict("records")
-            filtered_data = [
-                data
-                for data in list(group_data)
-                if datetime.strptime(data["Дата операции"], "%d.%m.%Y %H:%M:%S") >= start_date
-                and datetime.strptime(data["Дата операции"], "%d.%m.%Y %H:%M:%S") <= end_date
-            ]
+            excel_data = read_operations(filename)
+            filtered_data = filter_operations_by_period(excel_data, period_datetime)
             utils_logger.info("Данные по файлу транзакций отфильтрован по дате и готов к работе")
-            return list(filtered_data)
+            return filtered_data
         except Exception:
             utils_logger.error("Произошла ошибка в чтении файла и/или в преобразовании ячейки в формат даты")
             raise Exception("Произошла ошибка в чтении файла и/или в преобразовании ячейки в формат даты")
@@ -63,6 +150,7 @@ def read_finance_excel_operation(
         raise ValueError("filename не указан и равен None")
 
 
+@timed
 def welcome_text(date: str) -> str:
     """
     Функция возврата строки приветствия по дате форматом YYYY-MM-DD HH:MM:SS.
@@ -83,22 +171,32 @@ def welcome_text(date: str) -> str:
     return welcome
 
 
-def main_cards(transactions: list[dict]) -> list[dict]:
+@timed
+def main_cards(transactions: Transactions) -> list[dict]:
     """
     Функция вывода всей информации по картам.
     :param transactions: Входные данные с транзакциями.
     :return: Информация по картам.
     """
+    if isinstance(transactions, TransactionBatch):
+        if not len(transactions):
+            utils_logger.error("Empty DataFrame - данные пусты, поменяйте дату")
+            raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
+        utils_logger.info("Список карт сформирован по пакету транзакций")
+        return transactions.card_summary()
+    df = pd.DataFrame(transactions)
+    if df.empty:
+        utils_logger.error("Empty DataFrame - данные пусты, поменяйте дату")
+        raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
     try:
-        df = pd.DataFrame(transactions)
         cards = []
 
         add_group_data = df.groupby("Номер карты").agg({"Сумма операции с округлением": "sum", "Кэшбэк": "sum"})
         for card_num, row in add_group_data.iterrows():
             info_card = {
                 "last_digits": str(card_num)[-4:],
-                "total_spent": float(row["Сумма операции с округлением"]),
-                "cashback": float(row["Кэшбэк"]),
+                "total_spent": round(float(row["Сумма операции с округлением"]), 2),
+                "cashback": round(float(row["Кэшбэк"]), 2),
             }
             cards.append(info_card)
         utils_logger.info("Список карт успешно сформирован в лист")
@@ -108,28 +206,157 @@ def main_cards(transactions: list[dict]) -> list[dict]:
         raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
 
 
-def top_transactions(transactions: list[dict]) -> list[dict]:
+@timed
+def main_cards_stream(chunks: Iterable[Transactions]) -> list[dict]:
     """
-    Функция возврата ТОП 5 транзакций.
-    :param transactions: Список транзакций.
-    :return: Список ТОП 5 транзакций по сумме.
+    Функция вывода информации по картам по потоку порций строк без сборки полного списка.
+    :param chunks: Итератор порций транзакций.
+    :return: Информация по картам.
+    """
+    totals: pd.DataFrame | None = None
+    for chunk in chunks:
+        df = _as_frame(chunk)
+        if df.empty:
+            continue
+        partial = df.groupby("Номер карты").agg({"Сумма операции с округлением": "sum", "Кэшбэк": "sum"})
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+    if totals is None:
+        utils_logger.error("Empty DataFrame - данные пусты, поменяйте дату")
+        raise ValueError("Empty DataFrame - данные пусты, поменяйте дату")
+    cards = [
+        {
+            "last_digits": str(card_num)[-4:],
+            "total_spent": round(float(row["Сумма операции с округлением"]), 2),
+            "cashback": round(float(row["Кэшбэк"]), 2),
+        }
+        for card_num, row in totals.sort_index().iterrows()
+    ]
+    utils_logger.info("Список карт по потоку успешно сформирован в лист")
+    return cards
+
+
+def _top_transaction_records(top_data: pd.DataFrame, amount_column: str) -> list[dict]:
+    """
+    Функция преобразования строк ТОП транзакций в список словарей ответа.
+    :param top_data: DataFrame с отобранными транзакциями.
+    :param amount_column: Столбец суммы транзакции.
+    :return: Список ТОП транзакций.
     """
     top_transaction = []
-    df = pd.DataFrame(transactions)
-    top_data = df.sort_values(by="Сумма операции с округлением", ascending=False).head(5)
     for data, row in top_data.iterrows():
         top_transaction.append(
             {
                 "date": row["Дата платежа"],
-                "amount": float(row["Сумма операции с округлением"]),
+                "amount": float(row[amount_column]),
                 "category": row["Категория"],
                 "description": row["Описание"],
             }
         )
-    utils_logger.info("Список ТОП 5 транзакций сформирован")
     return top_transaction
 
 
+def _top_rows(df: pd.DataFrame, k: int, by_abs: bool, amount_column: str) -> pd.DataFrame:
+    """
+    Функция отбора K наибольших строк за один проход без полной сортировки.
+    :param df: DataFrame с транзакциями.
+    :param k: Количество транзакций.
+    :param by_abs: Ранжировать по модулю суммы.
+    :param amount_column: Столбец суммы транзакции.
+    :return: K строк по убыванию суммы.
+    """
+    amounts = df[amount_column].abs() if by_abs else df[amount_column]
+    return df.loc[amounts.nlargest(k).index]
+
+
+@timed
+def top_transactions(
+    transactions: Transactions,
+    k: int = 5,
+    by_abs: bool = False,
+    amount_column: str = "Сумма операции с округлением",
+) -> list[dict]:
+    """
+    Функция возврата ТОП K транзакций (по умолчанию ТОП 5).
+    :param transactions: Список транзакций.
+    :param k: Количество транзакций.
+    :param by_abs: Ранжировать по модулю суммы, чтобы крупные списания тоже попадали в ТОП.
+    :param amount_column: Столбец суммы транзакции.
+    :return: Список ТОП K транзакций по сумме.
+    """
+    if isinstance(transactions, TransactionBatch):
+        amount_field = {column: field for field, column in FIELD_COLUMNS.items()}[amount_column]
+        utils_logger.info("Список ТОП %s транзакций сформирован по пакету транзакций", k)
+        return transactions.top(k, by_abs, amount_field)
+    df = pd.DataFrame(transactions)
+    top_transaction = _top_transaction_records(_top_rows(df, k, by_abs, amount_column), amount_column)
+    utils_logger.info("Список ТОП %s транзакций сформирован", k)
+    return top_transaction
+
+
+@timed
+def top_transactions_stream(
+    chunks: Iterable[Transactions],
+    k: int = 5,
+    by_abs: bool = False,
+    amount_column: str = "Сумма операции с округлением",
+) -> list[dict]:
+    """
+    Функция возврата ТОП K транзакций по потоку порций строк с ограниченной кучей.
+    :param chunks: Итератор порций транзакций.
+    :param k: Количество транзакций.
+    :param by_abs: Ранжировать по модулю суммы.
+    :param amount_column: Столбец суммы транзакции.
+    :return: Список ТОП K транзакций по сумме.
+    """
+    heap: list[tuple[float, int, dict]] = []
+    position = 0
+    for chunk in chunks:
+        df = _as_frame(chunk)
+        if df.empty:
+            continue
+        chunk_top = _top_rows(df, k, by_abs, amount_column)
+        keys = chunk_top[amount_column].abs() if by_abs else chunk_top[amount_column]
+        for key, record in zip(keys, _top_transaction_records(chunk_top, amount_column)):
+            item = (float(key), -position, record)
+            position += 1
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+    utils_logger.info("Список ТОП %s транзакций по потоку сформирован", k)
+    return [record for key, order, record in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+
+@timed
+def top_transactions_by_group(
+    transactions: Transactions,
+    group_by: str = "Номер карты",
+    k: int = 5,
+    by_abs: bool = False,
+    amount_column: str = "Сумма операции с округлением",
+) -> dict[str, list[dict]]:
+    """
+    Функция возврата ТОП K транзакций по каждой карте или категории.
+    :param transactions: Список транзакций.
+    :param group_by: Столбец группировки, например "Номер карты" или "Категория".
+    :param k: Количество транзакций в группе.
+    :param by_abs: Ранжировать по модулю суммы.
+    :param amount_column: Столбец суммы транзакции.
+    :return: Словарь группа - список ТОП K транзакций.
+    """
+    df = _as_frame(transactions)
+    amounts = df[amount_column].abs() if by_abs else df[amount_column]
+    top_index = amounts.groupby(df[group_by]).nlargest(k).index
+    top_data = df.loc[top_index.get_level_values(-1)]
+    top_groups = {
+        str(group): _top_transaction_records(group_data, amount_column)
+        for group, group_data in top_data.groupby(group_by, sort=True)
+    }
+    utils_logger.info("ТОП %s транзакций по группам %s сформирован", k, group_by)
+    return top_groups
+
+
+@timed
 def get_api_currency(currency: str) -> float:
     """
     Функция получения курса валюты по API
@@ -137,11 +364,11 @@ def get_api_currency(currency: str) -> float:
     :return: Результат курса валюты
     """
     date = datetime.now().strftime("%Y-%m-%d")
-    url = f"https://api.apilayer.com/exchangerates_data/{date}"
+    url = f"{CURRENCY_API_URL}/{date}"
     params = {"base": currency, "symbols": "RUB"}
     headers = {"apikey": API_KEY}
     try:
-        response = requests.get(url, params=params, headers=headers)
+        response = get_http_session().get(url, params=params, headers=headers, timeout=API_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             rates = data["rates"]["RUB"]
@@ -154,64 +381,169 @@ def get_api_currency(currency: str) -> float:
     return 0
 
 
+@timed
+def get_api_currencies(currencies: list[str]) -> dict[str, float]:
+    """
+    Функция получения курсов всех валют к рублю одним запросом API.
+    Запрашиваются курсы рубля к переданным валютам, курс X к рублю вычисляется как обратная величина.
+    :param currencies: Список названий валют
+    :return: Словарь валюта - курс к рублю, 0 для валют без курса
+    """
+    date = datetime.now().strftime("%Y-%m-%d")
+    url = f"{CURRENCY_API_URL}/{date}"
+    params = {"base": "RUB", "symbols": ",".join(currencies)}
+    headers = {"apikey": API_KEY}
+    try:
+        response = get_http_session().get(url, params=params, headers=headers, timeout=API_TIMEOUT)
+        if response.status_code == 200:
+            data = response.json()
+            if not data.get("rates"):
+                utils_logger.error("API не вернуло курсы %s: %s", currencies, data.get("message"))
+                raise MarketDataUnavailable(f"API не вернуло курсы {', '.join(currencies)}: {data.get('message')}")
+            rates = data["rates"]
+            utils_logger.info("Данные API успешно запрошены")
+            return {currency: 1 / float(rates[currency]) if rates.get(currency) else 0 for currency in currencies}
+    except requests.exceptions.ReadTimeout:
+        utils_logger.error("Превышено время соединения с сервером API")
+        raise requests.exceptions.ReadTimeout("Превышено время соединения с сервером API")
+    utils_logger.warning("Возвращаем '0' что-то с запросом API пошло не так")
+    return {currency: 0 for currency in currencies}
+
+
+@timed
 def get_api_stocks(stocks: str) -> float:
     """
     Функция получения стоимости акций.
     :param stocks: Название акции.
     :return: Стоимость.
     """
-    url = "https://www.alphavantage.co/query"
+    url = STOCKS_API_URL
     params = {
         "function": "GLOBAL_QUOTE",
         "symbol": stocks,
         "apikey": API_KEY_STOCKS,
     }
     try:
-        response = requests.get(url, params=params)
+        response = get_http_session().get(url, params=params, timeout=API_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
+            quote = data.get("Global Quote")
+            if not quote:
+                # Alpha Vantage отвечает 200 с сообщением Note/Information при исчерпанной квоте или неверном ключе.
+                message = data.get("Note") or data.get("Information")
+                utils_logger.error("API не вернуло стоимость акции %s: %s", stocks, message)
+                raise MarketDataUnavailable(f"API не вернуло стоимость акции {stocks}: {message}")
             utils_logger.info("Данные API успешно запрошены")
-            return float(data["Global Quote"]["05. price"])
-    except Exception:
+            return float(quote["05. price"])
+    except MarketDataUnavailable:
+        raise
+    except Exception as error:
         utils_logger.error("Произошла ошибка")
-        raise Exception("Произошла ошибка")
+        raise MarketDataError(f"Ошибка запроса стоимости акции {stocks}") from error
     utils_logger.warning("Возвращаем '0' что-то с запросом API пошло не так")
     return 0
 
 
-def currency_rates() -> list[dict]:
+@timed
+def fetch_api_currencies(currencies: list[str]) -> dict[str, float]:
+    """
+    Функция запроса курсов валют, для которой ответ API без курсов - ошибка.
+    :param currencies: Список названий валют
+    :return: Словарь валюта - курс к рублю
+    """
+    rates = get_api_currencies(currencies)
+    if not any(rates.values()):
+        raise MarketDataError(f"API не вернуло курсы {', '.join(currencies)}")
+    return rates
+
+
+@timed
+def fetch_api_stocks(stocks: str) -> float:
+    """
+    Функция запроса стоимости акции, для которой ответ API без стоимости - ошибка.
+    :param stocks: Название акции.
+    :return: Стоимость.
+    """
+    price = get_api_stocks(stocks)
+    if not price:
+        raise MarketDataError(f"API не вернуло стоимость акции {stocks}")
+    return price
+
+
+@timed
+def cached_api_currencies(currencies: list[str]) -> dict[str, float]:
+    """
+    Функция получения курсов валют через кэш ответов API, отсутствующие курсы запрашиваются одним запросом
+    через общий клиент API курсов: с ограничением частоты, объединением одновременных запросов и повторами.
+    :param currencies: Список названий валют
+    :return: Словарь валюта - курс к рублю, 0 для всех валют, если API недоступно и последних курсов нет
+    """
+
+    def fetch_many(symbols: list[str]) -> dict[str, float]:
+        return currency_client.call(",".join(symbols), lambda: fetch_api_currencies(symbols))
+
+    try:
+        return api_cache.get_many_or_fetch("currency", currencies, fetch_many)
+    except MarketDataError:
+        utils_logger.warning("Возвращаем '0' курсы валют %s недоступны", currencies)
+        return {currency: 0 for currency in currencies}
+
+
+@timed
+def cached_api_stocks(stocks: str) -> float:
+    """
+    Функция получения стоимости акций через кэш ответов API и общий клиент API акций.
+    :param stocks: Название акции.
+    :return: Стоимость, 0, если API недоступно и последней стоимости нет.
+    """
+    try:
+        return api_cache.get_or_fetch(
+            "stocks", stocks, lambda: stocks_client.call(stocks, lambda: fetch_api_stocks(stocks))
+        )
+    except MarketDataError:
+        utils_logger.warning("Возвращаем '0' стоимость акции %s недоступна", stocks)
+        return 0
+
+
+@timed
+def currency_rates(settings: UserSettings | None = None) -> list[dict]:
     """
     Функция возвращает курс валют.
+    Все курсы запрашиваются одним запросом API и кэшируются по ключу (провайдер, валюта, дата).
+    :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
     :return: Курсы валют.
     """
-    user_settings = get_user_settings()
-    user_currencies = user_settings["user_currencies"]
+    user_currencies = list((settings or get_settings()).user_currencies)
+    all_rates = cached_api_currencies(user_currencies)
     data_rates = []
     for currency in user_currencies:
-        rates = get_api_currency(currency)
-        data_rates.append({"currency": currency, "rate": round(rates, 2)})
+        data_rates.append({"currency": currency, "rate": round(all_rates[currency], 2)})
     utils_logger.info("Курс валют успешно возвращен")
     return data_rates
 
 
-def user_stocks() -> list[dict]:
+@timed
+def user_stocks(settings: UserSettings | None = None) -> list[dict]:
     """
     Функция возвращает стоимость акций.
+    Запросы по акциям выполняются параллельно в общем пуле потоков через одну keep-alive сессию
+    и кэшируются по ключу (провайдер, тикер, дата).
+    :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
     :return: Список стоимости акций.
     """
-    user_settings = get_user_settings()
-    all_stocks = user_settings["user_stocks"]
+    all_stocks = (settings or get_settings()).user_stocks
     data_stocks = []
-    for stocks in all_stocks:
-        stock = get_api_stocks(stocks)
+    for stocks, stock in zip(all_stocks, map_in_context(api_executor, cached_api_stocks, all_stocks)):
         data_stocks.append({"stock": stocks, "price": round(stock, 2)})
     utils_logger.info("Стоимости акций успешно возвращены")
     return data_stocks
 
 
+@timed
 def get_user_settings() -> dict:
     """
-    Функция чтения пользовательских настроек.
+    Функция чтения пользовательских настроек с диска без кэша и проверки схемы.
+    Функции utils используют get_settings() из src.settings с кэшем по времени изменения файла.
     :return: Json объект Python.
     """
     try:
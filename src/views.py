@@ -1,3 +1,17 @@
+from __future__ import annotations
+
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src.backends import StorageBackend, get_backend
+from src.currency import normalize_currency
+from src.instrumentation import collect_timings, profiled, submit_in_context
+from src.lazy import lazy_import
+from src.settings import UserSettings, get_settings
+from src.store import TransactionStore
 from src.utils import (
     currency_rates,
     get_period_date,
@@ -8,20 +22,212 @@ from src.utils import (
     welcome_text,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_import("numpy")
+
 
-def page_main(date: str) -> dict:
+def page_main(
+    date: str,
+    store: TransactionStore | StorageBackend | None = None,
+    timings: bool = False,
+    settings: UserSettings | None = None,
+) -> dict:
     """
     Функция главной страницы возвращает основную информацию.
+    Курсы валют и акций запрашиваются в фоне, пока читаются и агрегируются транзакции.
+    Если в настройках задана валюта отчета reporting_currency, суммы пересчитываются в нее по курсу на дату операции.
+    Если задана переменная окружения PROFILE_DIR, профиль cProfile вызова записывается в эту директорию.
     :param date: Входящая дата.
+    :param store: Хранилище транзакций, загруженное заранее, или хранилище StorageBackend.
+    Если не передано, хранилище выбирается по ключу "storage_backend" файла user_settings.json.
+    :param timings: Добавить в ответ блок "_timings" с длительностью, строками и байтами сети каждой функции utils.
+    :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
     :return: Json объект содержащий информацию.
     """
-    period_date = get_period_date(date)
-    struct_file_json = read_finance_excel_operation(period_date)
-    json_response = {
-        "greeting": welcome_text(date),
-        "cards": main_cards(struct_file_json),
-        "top_transactions": top_transactions(struct_file_json),
-        "currency_rates": currency_rates(),
-        "stock_prices": user_stocks(),
-    }
+    start = time.perf_counter()
+    with profiled("page_main"), collect_timings() as stages:
+        settings = settings or get_settings()
+        period_date = get_period_date(date)
+        end_date, start_date = period_date
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rates_future = submit_in_context(executor, currency_rates, settings)
+            stocks_future = submit_in_context(executor, user_stocks, settings)
+            if settings.reporting_currency:
+                if isinstance(store, TransactionStore):
+                    operations = read_finance_excel_operation(period_date, store)
+                else:
+                    operations = (store or get_backend(settings)).read_period(start_date, end_date)
+                operations = normalize_currency(operations, settings.reporting_currency)
+                cards, transactions = main_cards(operations), top_transactions(operations)
+            elif isinstance(store, TransactionStore):
+                cards = store.card_summary(start_date, end_date)
+                transactions = top_transactions(read_finance_excel_operation(period_date, store))
+            else:
+                cards, transactions = (store or get_backend(settings)).period_summary(start_date, end_date)
+            json_response: dict = {
+                "greeting": welcome_text(date),
+                "cards": cards,
+                "top_transactions": transactions,
+                "currency_rates": rates_future.result(),
+                "stock_prices": stocks_future.result(),
+            }
+    if timings:
+        json_response["_timings"] = {"total_seconds": round(time.perf_counter() - start, 6), "stages": stages}
     return json_response
+
+
+def page_analytics(date: str, store: TransactionStore | None = None, settings: UserSettings | None = None) -> dict:
+    """
+    Функция главной страницы со скользящей статистикой трат: рядом с блоком "cards" добавляется блок
+    "card_analytics" с тратами, кэшбэком и долей кэшбэка за 7, 30 и 90 дней до даты и аномальными операциями
+    месяца, сумма которых сильно отклоняется от среднего трат карты за предыдущие 90 дней.
+    Отклонение считается только от скользящего среднего: скользящая медиана не реализована, так как ее нельзя
+    получить из накопленных сумм и обновлять по новым строкам.
+    Если в настройках задана валюта отчета reporting_currency, статистика считается по суммам в этой валюте.
+    :param date: Входящая дата.
+    :param store: Хранилище транзакций, загруженное заранее. Если не передано, читается файл Excel.
+    :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
+    :return: Json объект главной страницы с блоком "card_analytics".
+    """
+    settings = settings or get_settings()
+    if store is None:
+        store = TransactionStore.from_excel()
+    end_date, start_date = get_period_date(date)
+    analytics_store = store.get_normalized(settings.reporting_currency) if settings.reporting_currency else store
+    response = {}
+    for key, value in page_main(date, store, settings=settings).items():
+        response[key] = value
+        if key == "cards":
+            response["card_analytics"] = analytics_store.get_analytics().summary(start_date, end_date)
+    return response
+
+
+def page_main_market(settings: UserSettings | None = None) -> dict:
+    """
+    Функция части главной страницы с рыночными данными: курсы валют и акций запрашиваются параллельно.
+    :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
+    :return: Словарь с ключами "currency_rates" и "stock_prices".
+    """
+    settings = settings or get_settings()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rates_future = submit_in_context(executor, currency_rates, settings)
+        stocks_future = submit_in_context(executor, user_stocks, settings)
+        return {"currency_rates": rates_future.result(), "stock_prices": stocks_future.result()}
+
+
+def page_search(query: str, start: str, end: str, store: TransactionStore | None = None, limit: int = 20) -> dict:
+    """
+    Функция страницы поиска операций по получателю, категории или MCC за период по индексу хранилища.
+    :param query: Запрос: слова описания через пробел (И), группы через OR (ИЛИ),
+    условия "category:<категория>" и "mcc:<код>", например: лента OR category:"Дом и ремонт".
+    :param start: Начало периода формата YYYY-MM-DD HH:MM:SS.
+    :param end: Конец периода формата YYYY-MM-DD HH:MM:SS.
+    :param store: Хранилище транзакций, загруженное заранее. Если не передано, читается файл Excel.
+    :param limit: Количество последних найденных транзакций в ответе.
+    :return: Json объект с итогами, суммами по получателям, категориям и MCC и последними транзакциями.
+    """
+    try:
+        start_date, end_date = (datetime.strptime(value, "%Y-%m-%d %H:%M:%S") for value in (start, end))
+    except ValueError as error:
+        raise ValueError("Даты должны быть в формате YYYY-MM-DD HH:MM:SS") from error
+    if store is None:
+        store = TransactionStore.from_excel()
+    index = store.get_search_index()
+    rows = store.search(query, start_date, end_date)
+    return {
+        "query": query,
+        "count": len(rows),
+        "total_spent": round(float(index.amounts[rows].sum()), 2),
+        "cashback": round(float(index.cashback[rows].sum()), 2),
+        "by_description": index.aggregate(rows, "description"),
+        "by_category": index.aggregate(rows, "category"),
+        "by_mcc": index.aggregate(rows, "mcc"),
+        "transactions": index.transactions(rows, limit),
+    }
+
+
+def page_main_batch(
+    dates: list[str], store: TransactionStore | None = None, k: int = 5, settings: UserSettings | None = None
+) -> list[dict]:
+    """
+    Функция главной страницы для многих дат за один проход по ленте операций.
+    Даты сортируются, суммы по картам берутся из индекса накопленных сумм хранилища,
+    а ТОП K поддерживается кучей, которая дополняется строками по мере движения по датам месяца.
+    При равных суммах выше строка, которая раньше в исходной выписке, как при чтении Excel.
+    Строки первого дня месяца отбираются отдельно, так как начало периода зависит от времени даты.
+    Если в настройках задана валюта отчета reporting_currency, проход выполняется по хранилищу с суммами в этой валюте.
+    :param dates: Список дат формата YYYY-MM-DD HH:MM:SS.
+    :param store: Хранилище транзакций, загруженное заранее. Если не передано, читается файл Excel.
+    :param k: Количество ТОП транзакций.
+    :param settings: Пользовательские настройки. Если не переданы, берутся из кэша user_settings.json.
+    :return: Список ответов главной страницы по возрастанию даты с полем date,
+    для дат без операций - с полем error.
+    """
+    settings = settings or get_settings()
+    periods = sorted((get_period_date(date), date) for date in set(dates))
+    if store is None:
+        store = TransactionStore.from_excel()
+    if settings.reporting_currency:
+        store = store.get_normalized(settings.reporting_currency)
+    amount_column = "Сумма операции с округлением"
+    amounts = store.operations[amount_column].to_numpy(dtype="float64", na_value=np.nan)
+    payment_dates, categories, descriptions = (
+        store.operations[column].to_numpy(dtype=object) for column in ("Дата платежа", "Категория", "Описание")
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rates_future = executor.submit(currency_rates, settings)
+        stocks_future = executor.submit(user_stocks, settings)
+        rates, stocks = rates_future.result(), stocks_future.result()
+
+    pages: list[dict] = []
+    month = None
+    heap: list[tuple[float, int, int]] = []
+    position = 0
+    for (end_date, start_date), date in periods:
+        low, high = store.bounds(start_date, end_date)
+        second_day = store.bounds(datetime(start_date.year, start_date.month, 2), end_date)[0]
+        if month != (start_date.year, start_date.month):
+            month, heap, position = (start_date.year, start_date.month), [], second_day
+        new_rows = np.arange(position, max(position, high))
+        new_rows = new_rows[~np.isnan(amounts[new_rows])]
+        if len(new_rows) > k > 0:
+            new_rows = new_rows[amounts[new_rows] >= np.partition(amounts[new_rows], -k)[-k]]
+        for row in new_rows.tolist():
+            item = (float(amounts[row]), -int(store.positions[row]), row)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif heap and item > heap[0]:
+                heapq.heapreplace(heap, item)
+        position = max(position, high)
+        first_day = [
+            (float(amounts[row]), -int(store.positions[row]), row)
+            for row in range(low, min(second_day, high))
+            if not np.isnan(amounts[row])
+        ]
+        top = [
+            {
+                "date": payment_dates[row],
+                "amount": amount,
+                "category": categories[row],
+                "description": descriptions[row],
+            }
+            for amount, _, row in heapq.nlargest(k, heap + first_day)
+        ]
+        try:
+            cards = store.card_summary(start_date, end_date)
+        except ValueError as error:
+            pages.append({"date": date, "error": str(error)})
+            continue
+        pages.append(
+            {
+                "date": date,
+                "greeting": welcome_text(date),
+                "cards": cards,
+                "top_transactions": top,
+                "currency_rates": rates,
+                "stock_prices": stocks,
+            }
+        )
+    return pages
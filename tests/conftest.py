@@ -1,5 +1,125 @@
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
 import pytest
 
+import src.utils
+from src.api_cache import ApiCache
+from src.market_data import MarketDataClient
+
+
+@pytest.fixture(autouse=True)
+def memory_api_cache(monkeypatch: pytest.MonkeyPatch) -> ApiCache:
+    """
+    Фикстура изолированного кэша ответов API в памяти для каждого теста.
+    :return: Кэш ответов API.
+    """
+    api_cache = ApiCache(path=None)
+    monkeypatch.setattr(src.utils, "api_cache", api_cache)
+    return api_cache
+
+
+@pytest.fixture(autouse=True)
+def market_data_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Фикстура новых клиентов API рыночных данных для каждого теста: квота, предохранитель и последние значения
+    не переходят между тестами, повторы выполняются без задержки.
+    """
+    monkeypatch.setattr(src.utils, "stocks_client", MarketDataClient("stocks", 60, burst=10, backoff=0))
+    monkeypatch.setattr(src.utils, "currency_client", MarketDataClient("currency", 60, burst=10, backoff=0))
+
+
+class StubApiServer(ThreadingHTTPServer):
+    """
+    Локальный HTTP сервер, имитирующий API курсов валют и стоимости акций с задержкой ответа.
+    Первые failures запросов завершаются ошибкой 503, max_in_flight - наибольшее число одновременных запросов.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float) -> None:
+        super().__init__(("127.0.0.1", 0), StubApiHandler)
+        self.delay = delay
+        self.paths: list[str] = []
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов локального API.
+    """
+
+    server: StubApiServer
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.paths.append(self.path)
+            failing = self.server.failures > 0
+            self.server.failures -= failing
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if failing:
+            self.send_error(503)
+            return
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        body: dict[str, Any]
+        if url.path.startswith("/stocks"):
+            body = {"Global Quote": {"05. price": "100.5"}}
+        elif url.path.endswith("/timeseries"):
+            start, end = (date.fromisoformat(params[key][0]) for key in ("start_date", "end_date"))
+            symbols = params["symbols"][0].split(",")
+            body = {
+                "rates": {
+                    (start + timedelta(days=day)).isoformat(): {symbol: 2.0 for symbol in symbols}
+                    for day in range((end - start).days + 1)
+                }
+            }
+        else:
+            body = {"rates": {symbol: 2.0 for symbol in params.get("symbols", ["RUB"])[0].split(",")}}
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+@pytest.fixture
+def api_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[StubApiServer]:
+    """
+    Фикстура локального API сервера с задержкой 0.2 с на запрос.
+    :return: Запущенный сервер.
+    """
+    server = StubApiServer(delay=0.2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(src.utils, "CURRENCY_API_URL", server.url + "/currency")
+    monkeypatch.setattr(src.utils, "STOCKS_API_URL", server.url + "/stocks")
+    yield server
+    server.shutdown()
+    server.server_close()
+
 
 @pytest.fixture
 def excel_data() -> list[dict]:
@@ -162,3 +282,14 @@ def excel_data() -> list[dict]:
             "Сумма операции с округлением": 115909.42,
         },
     ]
+
+
+@pytest.fixture
+def excel_file(tmp_path: str, excel_data: list[dict]) -> str:
+    """
+    Фикстура с временным файлом Excel, отсортированным по убыванию даты.
+    :return: Путь к файлу.
+    """
+    filename = os.path.join(tmp_path, "operations.xlsx")
+    pd.DataFrame(excel_data).to_excel(filename, index=False)
+    return filename
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.views
+from src.analytics import SpendingAnalytics
+from src.models import parse_operation_dates
+from src.store import TransactionStore
+from src.views import page_analytics
+
+
+@pytest.fixture
+def operations() -> pd.DataFrame:
+    """
+    Фикстура операций двух карт за 40 дней: ежедневные траты около 100 рублей и одна трата 5000 рублей.
+    :return: DataFrame с операциями по возрастанию даты.
+    """
+    days = pd.date_range("2021-11-01 12:00:00", periods=40, freq="D")
+    amounts = 100.0 + np.tile([-10.0, 0.0, 10.0], 14)[:40]
+    amounts[35] = 5000.0
+    rows = []
+    for card, shift in (("*1111", 0), ("*2222", 1)):
+        for day, amount in zip(days, amounts + shift):
+            rows.append(
+                {
+                    "Дата операции": (day + pd.Timedelta(hours=shift)).strftime("%d.%m.%Y %H:%M:%S"),
+                    "Номер карты": card,
+                    "Сумма операции с округлением": float(amount),
+                    "Кэшбэк": 1.0,
+                    "Категория": "Супермаркеты",
+                    "Описание": "Магнит",
+                }
+            )
+    return pd.DataFrame(rows).sort_values("Дата операции", key=parse_operation_dates, kind="stable")
+
+
+def build(operations: pd.DataFrame) -> SpendingAnalytics:
+    analytics = SpendingAnalytics()
+    analytics.append(operations, parse_operation_dates(operations["Дата операции"]))
+    return analytics
+
+
+def test_rolling_windows(operations: pd.DataFrame) -> None:
+    """
+    [Тест] Траты, кэшбэк и доля кэшбэка за 7, 30 и 90 дней совпадают с расчетом по строкам.
+    """
+    card = build(operations).cards["*1111"]
+    end = datetime(2021, 12, 5, 23, 0)
+    card_rows = operations[operations["Номер карты"] == "*1111"]
+    dates = pd.Series(parse_operation_dates(card_rows["Дата операции"]), index=card_rows.index)
+    for days in (7, 30, 90):
+        in_window = (dates >= end - pd.Timedelta(days=days)) & (dates <= end)
+        spent = card_rows.loc[in_window, "Сумма операции с округлением"].sum()
+        assert card.window(end, days) == {
+            "count": int(in_window.sum()),
+            "spent": round(spent, 2),
+            "cashback": float(in_window.sum()),
+            "cashback_rate": round(100 * in_window.sum() / spent, 2),
+        }
+
+
+def test_anomalies(operations: pd.DataFrame) -> None:
+    """
+    [Тест] Трата, сильно отклоняющаяся от среднего карты за предыдущие 90 дней, отмечается как аномальная.
+    """
+    summary = build(operations).summary(datetime(2021, 12, 1), datetime(2021, 12, 10, 23, 0))
+    assert [card["last_digits"] for card in summary] == ["1111", "2222"]
+    anomalies = summary[0]["anomalies"]
+    assert len(anomalies) == 1
+    assert anomalies[0]["date"] == "06.12.2021 12:00:00"
+    assert anomalies[0]["amount"] == 5000.0
+    assert anomalies[0]["baseline_mean"] == pytest.approx(100, abs=1)
+    assert anomalies[0]["z_score"] > 3
+
+
+def test_incremental_append(operations: pd.DataFrame) -> None:
+    """
+    [Тест] Добавление новых и более ранних строк дает ту же статистику, что расчет по всем строкам.
+    """
+    full = build(operations)
+    later = build(operations.iloc[:50])
+    later.append(operations.iloc[50:], parse_operation_dates(operations.iloc[50:]["Дата операции"]))
+    shuffled = build(operations.iloc[20:])
+    shuffled.append(operations.iloc[:20], parse_operation_dates(operations.iloc[:20]["Дата операции"]))
+    for analytics in (later, shuffled):
+        for card_num, card in full.cards.items():
+            other = analytics.cards[card_num]
+            assert other.size == card.size
+            np.testing.assert_allclose(other.z_scores[: other.size], card.z_scores[: card.size])
+            np.testing.assert_allclose(other.prefix[:, : other.size + 1], card.prefix[:, : card.size + 1])
+
+
+def test_page_analytics(operations: pd.DataFrame, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] Страница аналитики возвращает блок "card_analytics" рядом с блоком "cards",
+    новые операции хранилища добавляются в статистику.
+    """
+    monkeypatch.setattr(src.views, "currency_rates", lambda settings=None: [])
+    monkeypatch.setattr(src.views, "user_stocks", lambda settings=None: [])
+    operations = operations.copy()
+    operations["Дата платежа"] = ""
+    operations["MCC"] = 5411.0
+    store = TransactionStore(operations.iloc[:70])
+    data = page_analytics("2021-12-10 23:00:00", store)
+    assert list(data)[:3] == ["greeting", "cards", "card_analytics"]
+    assert data["card_analytics"][0]["anomalies"] == []
+    store.append(operations.iloc[70:])
+    data = page_analytics("2021-12-10 23:00:00", store)
+    assert data["card_analytics"][0]["anomalies"][0]["amount"] == 5000.0
@@ -0,0 +1,69 @@
+import os
+import time
+from typing import Any
+from unittest.mock import Mock
+
+from src.api_cache import ApiCache
+from src.utils import currency_rates
+
+
+def test_api_cache_get_or_fetch(tmp_path: str) -> None:
+    """
+    [Тест] Кэш ответов API запрашивает значение один раз и переживает перезапуск через SQLite.
+    """
+    path = os.path.join(tmp_path, "api_cache.sqlite")
+    fetch = Mock(return_value=91.5)
+    api_cache = ApiCache(path=path)
+    assert api_cache.get_or_fetch("currency", "USD", fetch, "2025-03-12") == 91.5
+    assert api_cache.get_or_fetch("currency", "USD", fetch, "2025-03-12") == 91.5
+    assert fetch.call_count == 1
+
+    restarted_cache = ApiCache(path=path)
+    assert restarted_cache.get_or_fetch("currency", "USD", fetch, "2025-03-12") == 91.5
+    assert fetch.call_count == 1
+
+    restarted_cache.clear()
+    assert restarted_cache.get(("currency", "USD", "2025-03-12")) is None
+
+
+def test_api_cache_zero_not_cached() -> None:
+    """
+    [Тест] Нулевые значения (ошибка API) не кэшируются.
+    """
+    fetch = Mock(return_value=0)
+    api_cache = ApiCache(path=None)
+    assert api_cache.get_or_fetch("stocks", "AAPL", fetch) == 0
+    assert api_cache.get_or_fetch("stocks", "AAPL", fetch) == 0
+    assert fetch.call_count == 2
+
+
+def test_api_cache_lru() -> None:
+    """
+    [Тест] Кэш в памяти вытесняет самые давно использованные значения.
+    """
+    api_cache = ApiCache(path=None, max_items=2)
+    api_cache.set(("stocks", "AAPL", "2025-03-12"), 1.0)
+    api_cache.set(("stocks", "AMZN", "2025-03-12"), 2.0)
+    api_cache.get(("stocks", "AAPL", "2025-03-12"))
+    api_cache.set(("stocks", "MSFT", "2025-03-12"), 3.0)
+    assert list(api_cache.memory) == [("stocks", "AAPL", "2025-03-12"), ("stocks", "MSFT", "2025-03-12")]
+
+
+def test_api_cache_stale_while_revalidate() -> None:
+    """
+    [Тест] Устаревшее значение отдается сразу, а обновляется в фоне.
+    """
+    api_cache = ApiCache(path=None, ttl={"stocks": 0})
+    api_cache.set(("stocks", "AAPL", "2025-03-12"), 1.0)
+    time.sleep(0.01)
+    assert api_cache.get_or_fetch("stocks", "AAPL", lambda: 2.0, "2025-03-12") == 1.0
+    api_cache.executor.shutdown(wait=True)
+    assert api_cache.get(("stocks", "AAPL", "2025-03-12"))[0] == 2.0  # type: ignore[index]
+
+
+def test_currency_rates_cached(api_server: Any) -> None:
+    """
+    [Тест] Повторный запрос курсов валют берется из кэша без обращения к API.
+    """
+    assert currency_rates() == currency_rates()
+    assert len(api_server.paths) == 1
@@ -0,0 +1,80 @@
+import datetime
+import os
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backends import ExcelBackend, SqliteBackend, get_backend
+from src.views import page_main
+
+
+@pytest.fixture(scope="module")
+def sqlite_backend(tmp_path_factory: pytest.TempPathFactory) -> SqliteBackend:
+    """
+    Фикстура хранилища SQLite с импортированным файлом data/operations.xlsx.
+    :return: Хранилище SQLite.
+    """
+    backend = SqliteBackend(str(tmp_path_factory.mktemp("sqlite") / "operations.sqlite"))
+    backend.import_excel()
+    return backend
+
+
+@pytest.mark.parametrize("date", ["2021-12-27 08:00:23", "2021-11-30 23:59:59", "2020-02-29 12:00:00"])
+def test_sqlite_backend_page_main(sqlite_backend: SqliteBackend, date: str) -> None:
+    """
+    [Тест] Главная страница по хранилищу SQLite совпадает с главной страницей по файлу Excel.
+    """
+    with patch("src.views.currency_rates", return_value=[]), patch("src.views.user_stocks", return_value=[]):
+        data = page_main(date, sqlite_backend)
+        expected = page_main(date, ExcelBackend())
+    assert data["cards"] == expected["cards"]
+    np.testing.assert_equal(data["top_transactions"], expected["top_transactions"])
+
+
+def test_sqlite_backend_queries(sqlite_backend: SqliteBackend, excel_data: list[dict], tmp_path: str) -> None:
+    """
+    [Тест] Запросы SQLite используют индекс даты, пустой период выдает ошибку, карта без сумм дает нулевые итоги.
+    """
+    start, end = datetime.datetime(2021, 12, 1), datetime.datetime(2021, 12, 27)
+    plan = sqlite_backend.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM operations WHERE operation_ts BETWEEN ? AND ?", ("a", "b")
+    ).fetchall()
+    assert "idx_operations_ts" in str(plan)
+    assert len(sqlite_backend.read_period(start, end)) == len(ExcelBackend().read_period(start, end))
+    with pytest.raises(ValueError):
+        sqlite_backend.card_summary(datetime.datetime(2030, 1, 1), datetime.datetime(2030, 1, 2))
+
+    backend = SqliteBackend(os.path.join(tmp_path, "operations.sqlite"))
+    backend.import_operations(pd.DataFrame(excel_data))
+    period = backend.read_period(datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 31))
+    assert period["Дата операции"].tolist() == [row["Дата операции"] for row in excel_data]
+
+    backend.import_operations(pd.DataFrame(excel_data).assign(**{"Сумма операции с округлением": None}))
+    cards = backend.card_summary(datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 31))
+    assert cards == [{"last_digits": "7197", "total_spent": 0.0, "cashback": 0.0}]
+
+
+def test_get_backend(tmp_path: str) -> None:
+    """
+    [Тест] Функция выбора хранилища по пользовательским настройкам.
+    """
+    assert isinstance(get_backend(), ExcelBackend)
+    backend = get_backend({"storage_backend": "sqlite", "storage_path": os.path.join(tmp_path, "db.sqlite")})
+    assert isinstance(backend, SqliteBackend)
+    assert get_backend({"storage_backend": "sqlite", "storage_path": os.path.join(tmp_path, "db.sqlite")}) is backend
+    with pytest.raises(ValueError):
+        get_backend({"storage_backend": "duckdb"})
+
+
+@patch("src.views.get_backend")
+def test_page_main_settings_backend(get_backend_mock: Any, sqlite_backend: SqliteBackend) -> None:
+    """
+    [Тест] Главная страница без хранилища использует хранилище из пользовательских настроек.
+    """
+    get_backend_mock.return_value = sqlite_backend
+    with patch("src.views.currency_rates", return_value=[]), patch("src.views.user_stocks", return_value=[]):
+        assert page_main("2021-12-27 08:00:23")["cards"][0]["last_digits"] == "4556"
+    get_backend_mock.assert_called_once()
@@ -0,0 +1,47 @@
+import os
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.cache import build_operations_cache, get_cache_path, load_operations_cache, read_operations
+
+
+def test_get_cache_path(tmp_path: str) -> None:
+    """
+    [Тест] Функция получения пути к файлу кэша Arrow для файла Excel.
+    """
+    first = get_cache_path("/data/first.xlsx", str(tmp_path))
+    second = get_cache_path("/data/second.xlsx", str(tmp_path))
+    assert first.startswith(str(tmp_path)) and first.endswith(".arrow")
+    assert first != second
+
+
+def test_read_operations(excel_file: str, tmp_path: str) -> None:
+    """
+    [Тест] Функция чтения операций из кэша Arrow с пересборкой при изменении файла.
+    """
+    cache_dir = os.path.join(tmp_path, "cache")
+    assert load_operations_cache(excel_file, cache_dir) is None
+
+    excel_data = read_operations(excel_file, cache_dir)
+    assert os.path.exists(get_cache_path(excel_file, cache_dir))
+
+    with patch("pandas.read_excel") as read_excel:
+        cached_data = read_operations(excel_file, cache_dir)
+        read_excel.assert_not_called()
+    pd.testing.assert_frame_equal(cached_data, excel_data)
+
+    pd.DataFrame(excel_data.head(2)).to_excel(excel_file, index=False)
+    assert load_operations_cache(excel_file, cache_dir) is None
+    assert len(read_operations(excel_file, cache_dir)) == 2
+
+
+def test_build_operations_cache_corrupted(excel_file: str, tmp_path: str) -> None:
+    """
+    [Тест] Функция чтения кэша возвращает None для поврежденного файла кэша.
+    """
+    cache_dir = os.path.join(tmp_path, "cache")
+    build_operations_cache(excel_file, cache_dir)
+    with open(get_cache_path(excel_file, cache_dir), "wb") as f:
+        f.write(b"broken")
+    assert load_operations_cache(excel_file, cache_dir) is None
@@ -0,0 +1,132 @@
+import os
+from dataclasses import replace
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.utils
+from src.currency import CurrencyConverter, RateTable, get_api_timeseries
+from src.settings import get_settings
+from src.store import TransactionStore
+from src.views import page_analytics, page_main, page_main_batch
+
+
+@pytest.fixture
+def rate_table() -> RateTable:
+    """
+    Фикстура таблицы курсов USD и CNY к рублю с пропуском выходных.
+    :return: Таблица курсов.
+    """
+    rates = pd.DataFrame(
+        {"USD": [70.0, 71.0, np.nan], "CNY": [10.0, np.nan, 11.0]},
+        index=pd.to_datetime(["2021-12-03", "2021-12-06", "2021-12-07"]),
+    )
+    return RateTable("RUB", rates)
+
+
+def test_rate_table_lookup(rate_table: RateTable) -> None:
+    """
+    [Тест] Курс ищется на день операции или последний предыдущий день с котировкой, базовая валюта равна 1.
+    """
+    currencies = np.array(["USD", "USD", "CNY", "CNY", "RUB", "EUR", "USD"], dtype=object)
+    days = np.array(
+        ["2021-12-03", "2021-12-05", "2021-12-06", "2021-12-07", "2021-01-01", "2021-12-06", "2021-12-02"],
+        dtype="datetime64[D]",
+    )
+    rates = rate_table.lookup(currencies, days)
+    assert rates[:5].tolist() == [70.0, 70.0, 10.0, 11.0, 1.0]
+    assert np.isnan(rates[5:]).all()
+    assert rate_table.missing(currencies[1:], days[1:]) == {
+        "EUR": (np.datetime64("2021-12-06"), np.datetime64("2021-12-06")),
+        "RUB": (np.datetime64("2021-01-01"), np.datetime64("2021-01-01")),
+        "USD": (np.datetime64("2021-12-02"), np.datetime64("2021-12-02")),
+    }
+
+
+def test_rate_table_save_load(rate_table: RateTable, tmp_path: str) -> None:
+    """
+    [Тест] Таблица курсов сохраняется в CSV и читается без изменений.
+    """
+    path = os.path.join(tmp_path, "rates.csv")
+    rate_table.save(path)
+    loaded = RateTable.load(path, "RUB")
+    pd.testing.assert_frame_equal(loaded.rates, rate_table.rates, check_names=False, check_freq=False, check_like=True)
+
+
+def test_get_api_timeseries(api_server: Any) -> None:
+    """
+    [Тест] Курсы за период больше 365 дней запрашиваются окнами по 365 дней.
+    """
+    rates = get_api_timeseries(["USD", "EUR"], np.datetime64("2020-01-01"), np.datetime64("2021-01-31"), "RUB")
+    assert len(api_server.paths) == 2
+    assert list(rates.columns) == ["USD", "EUR"]
+    assert len(rates) == 397 and (rates == 0.5).all().all()
+
+
+def test_currency_normalize(api_server: Any, tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] Суммы в валюте пересчитываются по курсу дня одним запросом, курсы переиспользуются и доступны без сети.
+    """
+    operations = pd.DataFrame(
+        {
+            "Дата операции": ["06.12.2021 10:00:00", "05.12.2021 10:00:00", "01.12.2021 10:00:00"],
+            "Сумма операции": [-10.0, -100.0, -42.0],
+            "Валюта операции": ["USD", "RUB", "RUB"],
+            "Сумма платежа": [-700.0, -100.0, -4.72],
+            "Валюта платежа": ["RUB", "RUB", "CNY"],
+            "Сумма операции с округлением": [700.0, 100.0, 4.72],
+        }
+    )
+    path = os.path.join(tmp_path, "rates_RUB.csv")
+    converter = CurrencyConverter("RUB", path)
+    normalized = converter.normalize(operations)
+    assert normalized["Сумма операции"].tolist() == [-5.0, -100.0, -42.0]
+    assert normalized["Сумма операции с округлением"].tolist() == [700.0, 100.0, 2.36]
+    assert set(normalized["Валюта платежа"]) == {"RUB"}
+    assert len(api_server.paths) == 1
+    converter.normalize(operations)
+    assert len(api_server.paths) == 1
+
+    monkeypatch.setattr(src.utils, "CURRENCY_API_URL", "http://127.0.0.1:1")
+    offline = CurrencyConverter("RUB", path)
+    pd.testing.assert_frame_equal(offline.normalize(operations), normalized)
+    with pytest.raises(ValueError):
+        offline.normalize(operations.assign(**{"Дата операции": "01.12.2020 10:00:00"}))
+
+
+def test_page_main_reporting_currency(api_server: Any, tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] С валютой отчета суммы по картам с платежами в юанях пересчитываются в рубли.
+    """
+    monkeypatch.setattr("src.currency.RATES_DIR", str(tmp_path))
+    monkeypatch.setattr("src.currency._converters", {})
+    store = TransactionStore.from_excel()
+    settings = get_settings()
+    date = "2019-09-30 23:00:00"
+    plain = page_main(date, store, settings=settings)
+    normalized = page_main(date, store, settings=replace(settings, reporting_currency="RUB"))
+    plain_cards = {card["last_digits"]: card["total_spent"] for card in plain["cards"]}
+    normalized_cards = {card["last_digits"]: card["total_spent"] for card in normalized["cards"]}
+    assert normalized_cards["7197"] == pytest.approx(plain_cards["7197"])
+    assert normalized_cards["4556"] < plain_cards["4556"]
+
+
+def test_reporting_currency_batch_and_analytics(
+    api_server: Any, tmp_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    [Тест] Страница для многих дат и статистика трат тоже пересчитываются в валюту отчета.
+    """
+    monkeypatch.setattr("src.currency.RATES_DIR", str(tmp_path))
+    monkeypatch.setattr("src.currency._converters", {})
+    store = TransactionStore.from_excel()
+    settings = replace(get_settings(), reporting_currency="RUB")
+    date = "2019-09-30 23:00:00"
+    normalized = page_main(date, store, settings=settings)
+    assert page_main_batch([date], store, settings=settings)[0]["cards"] == normalized["cards"]
+    plain_analytics = {card["last_digits"]: card for card in page_analytics(date, store)["card_analytics"]}
+    analytics = {card["last_digits"]: card for card in page_analytics(date, store, settings)["card_analytics"]}
+    assert analytics["7197"]["windows"] == plain_analytics["7197"]["windows"]
+    assert analytics["4556"]["windows"]["30d"]["spent"] < plain_analytics["4556"]["windows"]["30d"]["spent"]
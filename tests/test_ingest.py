@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ingest import PersistentStore, operation_keys
+from src.utils import main_cards
+
+
+def test_operation_keys(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция расчета ключей различает одинаковые операции номером повтора и стабильна между вызовами.
+    """
+    operations = pd.DataFrame(excel_data + excel_data[:1])
+    keys = operation_keys(operations)
+    assert len(np.unique(keys)) == len(operations)
+    assert np.array_equal(keys, operation_keys(operations.copy()))
+
+
+def test_persistent_store_ingest(tmp_path: str, excel_data: list[dict]) -> None:
+    """
+    [Тест] Хранилище добавляет только новые строки пересекающихся выписок и обновляет агрегаты.
+    """
+    store = PersistentStore(os.path.join(tmp_path, "store"))
+    assert len(store.ingest(pd.DataFrame(excel_data[:6]))) == 6
+    assert len(store.ingest(pd.DataFrame(excel_data[3:]))) == len(excel_data) - 6
+    assert len(store.ingest(pd.DataFrame(excel_data))) == 0
+    assert len(store.part_paths()) == 2
+
+    operations = store.read()
+    assert len(operations) == len(excel_data)
+    aggregates = store.aggregates()
+    assert list(aggregates) == ["*7197"]
+    assert aggregates["*7197"]["2018-01"][0] == 7
+    assert aggregates["*7197"]["2018-01"][1] == pytest.approx(main_cards(excel_data)[0]["total_spent"])
+
+
+def test_persistent_store_excel(tmp_path: str, excel_file: str, excel_data: list[dict]) -> None:
+    """
+    [Тест] Повторная загрузка той же выписки Excel не добавляет строк, хранилище загружается в память.
+    """
+    store = PersistentStore(os.path.join(tmp_path, "store"))
+    with pytest.raises(ValueError):
+        store.read()
+    assert len(store.ingest_excel(excel_file)) == len(excel_data)
+    assert len(store.ingest_excel(excel_file)) == 0
+    assert len(store.load()) == len(excel_data)
@@ -0,0 +1,83 @@
+import os
+from typing import Any
+
+import pytest
+
+from src.instrumentation import Metrics, collect_timings, metrics, profiled, timed, write_metrics
+from src.views import page_main
+
+
+def test_timed_collects_stages() -> None:
+    """
+    [Тест] Декоратор timed записывает длительность и строки вызова, в том числе вызова с исключением.
+    """
+
+    @timed
+    def double(values: list[int]) -> list[int]:
+        return values * 2
+
+    @timed
+    def fail() -> None:
+        raise ValueError("ошибка")
+
+    with collect_timings() as stages:
+        assert double([1, 2, 3]) == [1, 2, 3, 1, 2, 3]
+        with pytest.raises(ValueError):
+            fail()
+    assert [(stage["stage"], stage["rows"], stage["bytes"]) for stage in stages] == [
+        ("double", 3, 0),
+        ("fail", None, 0),
+    ]
+    assert all(stage["seconds"] >= 0 for stage in stages)
+    assert metrics.calls["fail"][3] >= 1
+    double([1])
+    assert len(stages) == 2
+
+
+def test_page_main_timings(api_server: Any) -> None:
+    """
+    [Тест] Блок "_timings" главной страницы содержит функции utils из потоков запросов API с байтами ответов.
+    """
+    data = page_main("2021-12-27 08:00:23", timings=True)
+    stages = {stage["stage"]: stage for stage in data["_timings"]["stages"]}
+    assert {"get_period_date", "read_finance_excel_operation", "main_cards", "currency_rates", "user_stocks"} <= set(
+        stages
+    )
+    assert stages["main_cards"]["rows"] > 0
+    assert stages["get_api_stocks"]["bytes"] > 0
+    assert stages["user_stocks"]["bytes"] == 5 * stages["get_api_stocks"]["bytes"]
+    assert data["_timings"]["total_seconds"] >= stages["user_stocks"]["seconds"]
+    assert "_timings" not in page_main("2021-12-27 08:00:23")
+
+
+def test_metrics_render(tmp_path: str) -> None:
+    """
+    [Тест] Метрики выводятся в текстовом формате Prometheus и записываются в файл.
+    """
+    test_metrics = Metrics()
+    test_metrics.observe_call("main_cards", 0.5, 10, False)
+    test_metrics.observe_call("main_cards", 0.25, 5, True)
+    test_metrics.observe_http("127.0.0.1", 100)
+    text = test_metrics.render()
+    assert 'bank_analyzer_call_duration_seconds_count{function="main_cards"} 2' in text
+    assert 'bank_analyzer_call_duration_seconds_sum{function="main_cards"} 0.750000' in text
+    assert 'bank_analyzer_call_rows_total{function="main_cards"} 15' in text
+    assert 'bank_analyzer_call_errors_total{function="main_cards"} 1' in text
+    assert 'bank_analyzer_http_response_bytes_total{host="127.0.0.1"} 100' in text
+
+    path = os.path.join(tmp_path, "metrics.prom")
+    write_metrics(path)
+    with open(path, encoding="utf-8") as file:
+        assert file.read().startswith("# HELP bank_analyzer_call_duration_seconds")
+
+
+def test_profiled(tmp_path: str) -> None:
+    """
+    [Тест] Профиль cProfile записывается в директорию, только если она задана.
+    """
+    with profiled("page_main", None):
+        sum(range(100))
+    with profiled("page_main", str(tmp_path)):
+        sum(range(100))
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("page_main_") and files[0].endswith(".prof")
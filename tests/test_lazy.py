@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+from src.lazy import LazyModule, lazy_import
+
+
+def test_lazy_import() -> None:
+    """
+    [Тест] Ленивый модуль импортируется при первом обращении, отсутствующий пакет возвращает None.
+    """
+    assert lazy_import("not_installed_package") is None
+    assert lazy_import("os") is os
+    module = LazyModule("json")
+    assert module.dumps([1]) == "[1]"
+    assert "dumps" in vars(module)
+
+
+def test_import_without_heavy_dependencies() -> None:
+    """
+    [Тест] Импорт модулей src не загружает pandas, numpy, pyarrow, openpyxl и requests.
+    """
+    code = (
+        "import sys, src.utils, src.views, src.server, src.ingest, src.parallel;"
+        "print(sorted({'pandas', 'numpy', 'pyarrow', 'openpyxl', 'requests'} & set(sys.modules)))"
+    )
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=root_dir, check=True)
+    assert result.stdout.strip() == "[]"
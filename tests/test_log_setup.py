@@ -0,0 +1,69 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import src.log_setup
+from src.log_setup import get_logger, set_log_level, stop_logging
+
+
+def log_in_worker(log_dir: str) -> None:
+    """
+    Функция пишет запись в журнал из рабочего процесса
+    :param log_dir: каталог журналов
+    """
+    src.log_setup.LOG_DIR = log_dir
+    get_logger("tests.worker_logger", "worker").info("запись рабочего процесса")
+    stop_logging()
+
+
+def test_logger_queue(tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] Записи журнала пишутся потоком записи в файл модуля, уровень журнала меняется set_log_level.
+    """
+    monkeypatch.setattr(src.log_setup, "LOG_DIR", str(tmp_path))
+    logger = get_logger("tests.queue_logger", "queue")
+    path = os.path.join(tmp_path, "logging_queue.log")
+    assert not os.path.exists(path)
+
+    logger.info("первая запись %s", 1)
+    set_log_level(logging.WARNING)
+    logger.info("отключенная запись")
+    logger.warning("предупреждение")
+    set_log_level(logging.DEBUG)
+    stop_logging()
+    logger.error("запись после перезапуска")
+    stop_logging()
+
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert [line.split(" ", 2)[2] for line in lines] == [
+        "test_log_setup test_logger_queue INFO: первая запись 1",
+        "test_log_setup test_logger_queue WARNING: предупреждение",
+        "test_log_setup test_logger_queue ERROR: запись после перезапуска",
+    ]
+
+
+def test_logger_spawn_worker_appends(tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] Рабочий процесс, запущенный через spawn, дописывает журнал родителя и не перезаписывает его.
+    """
+    monkeypatch.setattr(src.log_setup, "LOG_DIR", str(tmp_path))
+    logger = get_logger("tests.worker_logger", "worker")
+    logger.info("запись родителя")
+    stop_logging()
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        executor.submit(log_in_worker, str(tmp_path)).result()
+    logger.info("запись после рабочего процесса")
+    stop_logging()
+
+    with open(os.path.join(tmp_path, "logging_worker.log"), encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert [line.split(": ", 1)[1] for line in lines] == [
+        "запись родителя",
+        "запись рабочего процесса",
+        "запись после рабочего процесса",
+    ]
@@ -0,0 +1,182 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+import src.utils
+from src.market_data import CircuitBreaker, MarketDataClient, MarketDataError, MarketDataUnavailable, TokenBucket
+from src.settings import get_settings
+from src.utils import cached_api_stocks, fetch_api_stocks, user_stocks
+
+
+class FakeClock:
+    """
+    Часы теста: время идет только при ожидании sleep.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_token_bucket() -> None:
+    """
+    [Тест] Корзина пропускает пачку запросов сразу, следующие - со скоростью пополнения.
+    """
+    clock = FakeClock()
+    bucket = TokenBucket(rate=20, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire(1) and bucket.acquire(1)
+    assert clock.now == 0
+    assert bucket.acquire(1) and bucket.acquire(1)
+    assert clock.now == pytest.approx(0.1)
+    assert not bucket.acquire(0.01)
+    assert clock.now == pytest.approx(0.1)
+
+
+def test_circuit_breaker() -> None:
+    """
+    [Тест] Предохранитель размыкается после неудач подряд и после паузы пропускает один пробный запрос.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_client_single_flight(api_server: Any) -> None:
+    """
+    [Тест] Одновременные запросы одного тикера выполняются одним запросом к API.
+    """
+    client = MarketDataClient("stocks", 60, burst=10, backoff=0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        prices = list(executor.map(lambda _: client.call("AAPL", lambda: fetch_api_stocks("AAPL")), range(8)))
+    assert prices == [100.5] * 8
+    assert len(api_server.paths) == 1
+
+
+def test_client_retry(api_server: Any) -> None:
+    """
+    [Тест] Ошибки API повторяются, ошибка после всех повторов - MarketDataError.
+    """
+    client = MarketDataClient("stocks", 60, burst=10, retries=2, backoff=0)
+    api_server.failures = 2
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    assert len(api_server.paths) == 3
+
+    api_server.failures = 3
+    with pytest.raises(MarketDataError):
+        client.call("MSFT", lambda: fetch_api_stocks("MSFT"))
+    assert len(api_server.paths) == 6
+
+
+def test_client_no_data_not_retried() -> None:
+    """
+    [Тест] Ответ API без данных не повторяется и сразу учитывается предохранителем.
+    """
+    client = MarketDataClient("stocks", 60, burst=10, retries=2, backoff=0, failure_threshold=3)
+    calls = []
+
+    def request() -> float:
+        calls.append(1)
+        raise MarketDataUnavailable("Исчерпана квота API")
+
+    for symbol in ("AAPL", "MSFT", "GOOG", "AMZN"):
+        with pytest.raises(MarketDataError):
+            client.call(symbol, request)
+    assert len(calls) == 3
+
+
+def test_client_breaker_counts_attempts(api_server: Any) -> None:
+    """
+    [Тест] Предохранитель учитывает каждую неудачную попытку и прекращает повторы после размыкания.
+    """
+    client = MarketDataClient("stocks", 60, burst=10, retries=2, backoff=0, failure_threshold=2)
+    api_server.failures = 10
+    with pytest.raises(MarketDataError):
+        client.call("AAPL", lambda: fetch_api_stocks("AAPL"))
+    assert len(api_server.paths) == 2
+    with pytest.raises(MarketDataError):
+        client.call("MSFT", lambda: fetch_api_stocks("MSFT"))
+    assert len(api_server.paths) == 2
+
+
+def test_client_circuit_breaker(api_server: Any) -> None:
+    """
+    [Тест] При разомкнутом предохранителе API не вызывается, возвращается последнее известное значение.
+    """
+    client = MarketDataClient("stocks", 60, burst=10, retries=0, backoff=0, failure_threshold=2)
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    api_server.failures = 10
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    assert len(api_server.paths) == 3
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    assert len(api_server.paths) == 3
+    with pytest.raises(MarketDataError):
+        client.call("MSFT", lambda: fetch_api_stocks("MSFT"))
+
+
+def test_client_rate_limit(api_server: Any) -> None:
+    """
+    [Тест] При исчерпанной квоте запрос не ждет дольше max_wait и возвращает последнее известное значение.
+    """
+    client = MarketDataClient("stocks", 1, burst=1, max_wait=0.01)
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    assert client.call("AAPL", lambda: fetch_api_stocks("AAPL")) == 100.5
+    assert len(api_server.paths) == 1
+    with pytest.raises(MarketDataError):
+        client.call("MSFT", lambda: fetch_api_stocks("MSFT"))
+
+
+def test_cached_api_stocks_unavailable(api_server: Any) -> None:
+    """
+    [Тест] Если API недоступно и последней стоимости нет, стоимость акции равна 0.
+    """
+    api_server.failures = 3
+    assert cached_api_stocks("AAPL") == 0
+    assert len(api_server.paths) == 3
+
+
+def test_user_stocks_concurrent_load(api_server: Any) -> None:
+    """
+    [Тест] При одновременных запросах страницы количество запросов к API равно количеству тикеров.
+    """
+    settings = get_settings()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: user_stocks(settings), range(16)))
+    assert all(result == results[0] for result in results)
+    assert len(api_server.paths) == len(settings.user_stocks)
+    assert src.utils.stocks_client.upstream_calls == len(settings.user_stocks)
+
+
+@patch("requests.Session.get")
+def test_user_stocks_quota_note(requests_mock: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] При ответе API с сообщением о квоте стоимость акций сразу равна 0 без ожидания квоты и повторов.
+    """
+    monkeypatch.setattr(
+        src.utils,
+        "stocks_client",
+        MarketDataClient("stocks", 5, burst=5, max_wait=src.utils.MARKET_DATA_MAX_WAIT),
+    )
+    requests_mock.return_value.status_code = 200
+    requests_mock.return_value.json.return_value = {"Note": "API call frequency is 5 calls per minute"}
+    settings = get_settings()
+    started = time.perf_counter()
+    for _ in range(2):
+        assert [stock["price"] for stock in user_stocks(settings)] == [0] * len(settings.user_stocks)
+    assert time.perf_counter() - started < 1
+    assert requests_mock.call_count <= len(settings.user_stocks)
@@ -0,0 +1,75 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.models import Transaction, TransactionBatch
+from src.utils import filter_operations_by_period, main_cards, main_cards_stream, top_transactions
+
+
+def test_transaction_batch_from_records(excel_data: list[dict]) -> None:
+    """
+    [Тест] Пакет транзакций хранит столбцы массивами и восстанавливает DataFrame выписки.
+    """
+    batch = TransactionBatch.from_records(excel_data)
+    assert len(batch) == 9
+    assert isinstance(batch.columns["card_number"], pd.Categorical)
+    assert list(batch.columns["card_number"].categories) == ["*7197"]
+    record = batch.to_frame().to_dict("records")[1]
+    assert pd.isna(record.pop("Кэшбэк"))
+    assert record == {key: value for key, value in excel_data[1].items() if key != "Кэшбэк"}
+
+
+def test_transaction_batch_iter(excel_data: list[dict]) -> None:
+    """
+    [Тест] Пакет транзакций отдает типизированные записи Transaction.
+    """
+    transaction = list(TransactionBatch.from_records(excel_data))[1]
+    assert isinstance(transaction, Transaction)
+    assert transaction.operation_date == datetime.datetime(2018, 1, 25, 14, 49, 57)
+    assert transaction.card_number == "*7197"
+    assert transaction.rounded_amount == 295.0
+    assert not hasattr(transaction, "__dict__")
+
+
+def test_utils_accept_transaction_batch(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функции utils принимают пакет транзакций напрямую.
+    """
+    batch = TransactionBatch.from_records(excel_data)
+    assert main_cards(batch) == main_cards(excel_data)
+    assert main_cards_stream([batch[:4], batch[4:]]) == main_cards(excel_data)
+    assert top_transactions(batch) == top_transactions(excel_data)
+    assert top_transactions(batch, k=2, by_abs=True, amount_column="Сумма операции") == top_transactions(
+        excel_data, k=2, by_abs=True, amount_column="Сумма операции"
+    )
+    assert top_transactions(batch, k=0) == []
+
+    period = (datetime.datetime(2018, 1, 24, 23, 0, 0), datetime.datetime(2018, 1, 24, 0, 0, 0))
+    filtered = filter_operations_by_period(batch, period)
+    assert isinstance(filtered, TransactionBatch)
+    assert len(filtered) == 4
+
+
+def test_main_cards_empty_batch(excel_data: list[dict]) -> None:
+    """
+    [Тест] Пустой пакет транзакций, как и пустой список, приводит к ошибке ValueError.
+    """
+    batch = TransactionBatch.from_records(excel_data)[:0]
+    assert len(batch) == 0
+    with pytest.raises(ValueError, match="Empty DataFrame"):
+        main_cards(batch)
+    with pytest.raises(ValueError, match="Empty DataFrame"):
+        main_cards([])
+
+
+def test_transaction_batch_top_ties(excel_data: list[dict]) -> None:
+    """
+    [Тест] При равных суммах на границе ТОП K пакет транзакций выбирает строки в порядке выписки, как DataFrame.
+    """
+    records = [
+        {**row, "Сумма операции с округлением": 100.0 if number % 3 else 50.0} for number, row in enumerate(excel_data)
+    ]
+    batch = TransactionBatch.from_records(records)
+    for k in range(1, len(records) + 1):
+        assert top_transactions(batch, k=k) == top_transactions(records, k=k)
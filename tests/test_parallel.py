@@ -0,0 +1,52 @@
+import datetime
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from src.parallel import analyze_workbook, analyze_workbooks, merge_partial_results
+from src.utils import main_cards, top_transactions
+
+PERIOD = (datetime.datetime(2018, 1, 31, 0, 0, 0), datetime.datetime(2018, 1, 1, 0, 0, 0))
+
+
+@pytest.fixture
+def excel_files(tmp_path: str, excel_data: list[dict]) -> str:
+    """
+    Фикстура с тремя выписками в одной директории.
+    :return: Шаблон пути к файлам.
+    """
+    for number, rows in enumerate((excel_data[:3], excel_data[3:7], excel_data[7:])):
+        pd.DataFrame(rows).to_excel(os.path.join(tmp_path, f"account_{number}.xlsx"), index=False)
+    return os.path.join(tmp_path, "*.xlsx")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_analyze_workbooks(excel_files: str, excel_data: list[dict], max_workers: int) -> None:
+    """
+    [Тест] Функция параллельного анализа выписок совпадает с анализом объединенных данных.
+    """
+    result = analyze_workbooks(excel_files, PERIOD, k=3, max_workers=max_workers)
+    assert result["files"] == 3
+    assert result["rows"] == len(excel_data)
+    assert result["cards"] == main_cards(excel_data)
+    assert result["top_transactions"] == top_transactions(excel_data, 3)
+
+
+def test_merge_partial_results(excel_files: str) -> None:
+    """
+    [Тест] Функция объединения частичных результатов не зависит от порядка их завершения.
+    """
+    partials = [analyze_workbook(filename, PERIOD) for filename in sorted(glob.glob(excel_files))]
+    assert merge_partial_results(partials) == merge_partial_results(partials[::-1])
+
+
+def test_analyze_workbooks_errors(excel_files: str) -> None:
+    """
+    [Тест] Функция параллельного анализа выдает ошибку без файлов и без операций за период.
+    """
+    with pytest.raises(ValueError):
+        analyze_workbooks(os.path.join(os.path.dirname(excel_files), "*.csv"), PERIOD)
+    with pytest.raises(ValueError):
+        analyze_workbooks(excel_files, (datetime.datetime(2020, 1, 2), datetime.datetime(2020, 1, 1)), max_workers=1)
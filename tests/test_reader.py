@@ -0,0 +1,47 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.reader import iter_finance_excel_operation, summarize_operation_batches
+from src.utils import main_cards, main_cards_stream, top_transactions
+
+
+def test_iter_finance_excel_operation(excel_file: str) -> None:
+    """
+    [Тест] Функция потокового чтения операций из Excel порциями с фильтрацией по периоду.
+    """
+    period = (datetime.datetime(2018, 1, 25, 10, 0, 0), datetime.datetime(2018, 1, 24, 10, 0, 0))
+    batches = list(iter_finance_excel_operation(period, excel_file, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert pd.concat(batches)["Дата операции"].tolist() == [
+        "25.01.2018 09:53:50",
+        "24.01.2018 22:53:54",
+        "24.01.2018 13:59:06",
+    ]
+    assert batches[0]["Сумма операции"].dtype == "float64"
+
+    unsorted_batches = list(iter_finance_excel_operation(period, excel_file, batch_size=2, order=None))
+    assert sum(len(batch) for batch in unsorted_batches) == 3
+
+    with pytest.raises(ValueError):
+        next(iter_finance_excel_operation(period, ""))
+
+
+def test_main_cards_stream(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция вывода информации по картам по потоку порций строк.
+    """
+    assert main_cards_stream([excel_data[:4], [], excel_data[4:]]) == main_cards(excel_data)
+
+    with pytest.raises(ValueError):
+        main_cards_stream([])
+
+
+def test_summarize_operation_batches(excel_file: str, excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция расчета информации по картам и ТОП транзакций за один проход по порциям.
+    """
+    period = (datetime.datetime(2018, 1, 31), datetime.datetime(2018, 1, 1))
+    data = summarize_operation_batches(iter_finance_excel_operation(period, excel_file, batch_size=4), k=3)
+    assert data == {"cards": main_cards(excel_data), "top_transactions": top_transactions(excel_data, k=3)}
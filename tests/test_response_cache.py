@@ -0,0 +1,93 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+import src.response_cache
+import src.views
+from src.response_cache import ResponseCache, dumps
+from src.settings import get_settings
+from src.store import TransactionStore
+from src.views import page_main
+
+
+@pytest.fixture
+def counters(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """
+    Фикстура счетчиков вызовов page_main и запросов курсов без обращений к API.
+    :return: Словарь счетчиков.
+    """
+    calls = {"page_main": 0, "market": 0}
+
+    def counted_page_main(*args: object, **kwargs: object) -> dict:
+        calls["page_main"] += 1
+        return page_main(*args, **kwargs)  # type: ignore[arg-type]
+
+    def rates(settings: object = None) -> list[dict]:
+        calls["market"] += 1
+        return [{"currency": "USD", "rate": 0.5}]
+
+    monkeypatch.setattr(src.response_cache, "page_main", counted_page_main)
+    monkeypatch.setattr(src.views, "currency_rates", rates)
+    monkeypatch.setattr(src.views, "user_stocks", lambda settings=None: [{"stock": "AAPL", "price": 100.5}])
+    return calls
+
+
+@pytest.fixture
+def store(excel_file: str) -> TransactionStore:
+    """
+    Фикстура хранилища транзакций на временном файле Excel.
+    :return: Хранилище транзакций.
+    """
+    return TransactionStore.from_excel(excel_file)
+
+
+def test_response_cache_hit(counters: dict, store: TransactionStore) -> None:
+    """
+    [Тест] Повторный запрос той же даты отдается из кэша готовыми байтами без расчета.
+    """
+    cache = ResponseCache()
+    date = "2018-01-25 10:00:00"
+    payload = cache.page_main_json(date, "v1", store)
+    assert json.loads(payload) == page_main(date, store)
+    assert cache.page_main_json(date, "v1", store) == payload
+    assert counters == {"page_main": 1, "market": 2}
+    assert cache.stats() == {"hits": {"page": 1, "market": 1}, "misses": {"page": 1, "market": 0}, "entries": 1}
+
+
+def test_response_cache_versions(counters: dict, store: TransactionStore) -> None:
+    """
+    [Тест] Новая версия данных или настроек дает промах кэша, старые ответы вытесняются по LRU.
+    """
+    cache = ResponseCache(max_entries=2)
+    date = "2018-01-25 10:00:00"
+    settings = get_settings()
+    cache.page_main_json(date, "v1", store, settings)
+    cache.page_main_json(date, "v2", store, settings)
+    cache.page_main_json(date, "v2", store, replace(settings, user_stocks=("AAPL",)))
+    assert counters["page_main"] == 3
+    assert cache.stats()["entries"] == 2
+    cache.page_main_json(date, "v1", store, settings)
+    assert counters["page_main"] == 4
+
+
+def test_response_cache_market_ttl(counters: dict, store: TransactionStore) -> None:
+    """
+    [Тест] Курсы валют и акций обновляются по своему TTL без пересчета остальной части ответа.
+    """
+    cache = ResponseCache(market_ttl=-1)
+    date = "2018-01-25 10:00:00"
+    first = cache.page_main_json(date, "v1", store)
+    second = cache.page_main_json(date, "v1", store)
+    assert first == second
+    assert counters == {"page_main": 1, "market": 2}
+    assert cache.stats()["misses"] == {"page": 1, "market": 1}
+
+
+def test_dumps_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    [Тест] Без orjson ответ сериализуется через json в компактный UTF-8.
+    """
+    data = {"greeting": "Доброе утро", "cards": [{"total_spent": 7728.92}]}
+    monkeypatch.setattr(src.response_cache, "orjson", None)
+    assert dumps(data) == '{"greeting":"Доброе утро","cards":[{"total_spent":7728.92}]}'.encode("utf-8")
@@ -0,0 +1,81 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from src.ingest import PersistentStore
+from src.rollups import RollupTable, build_daily_rollups
+from src.store import TransactionStore
+
+
+@pytest.fixture
+def operations() -> pd.DataFrame:
+    """
+    Фикстура с операциями из файла data/operations.xlsx.
+    :return: DataFrame с операциями.
+    """
+    return TransactionStore.from_excel().operations
+
+
+def test_build_daily_rollups(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция построения дневных агрегатов суммирует операции по дню, карте, категории и статусу.
+    """
+    daily = build_daily_rollups(pd.DataFrame(excel_data))
+    assert daily["count"].sum() == len(excel_data)
+    day = daily[(daily["period"] == pd.Timestamp("2018-01-24")) & (daily["card"] == "*7197")]
+    assert day["count"].sum() == 4
+    assert day["spent"].sum() == pytest.approx(6824.0)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (datetime.date(2018, 1, 1), datetime.date(2021, 12, 31)),
+        (datetime.date(2019, 3, 15), datetime.date(2021, 11, 2)),
+        (datetime.date(2021, 12, 1), datetime.date(2021, 12, 27)),
+        (datetime.date(2020, 2, 29), datetime.date(2020, 3, 1)),
+    ],
+)
+def test_rollup_card_summary(operations: pd.DataFrame, start: datetime.date, end: datetime.date) -> None:
+    """
+    [Тест] Сводка по картам из агрегатов совпадает со сводкой по операциям за те же дни.
+    """
+    store = TransactionStore(operations)
+    rollups = RollupTable.from_operations(operations)
+    period = datetime.datetime.combine(start, datetime.time.min), datetime.datetime.combine(end, datetime.time.max)
+    assert rollups.card_summary(start, end) == store.card_summary(*period)
+    assert len(rollups.query(start, end)) <= len(store.slice(*period))
+
+
+def test_rollup_reports(excel_data: list[dict]) -> None:
+    """
+    [Тест] Отчеты по категориям и кэшбэку строятся из агрегатов с учетом статуса операций.
+    """
+    rollups = RollupTable.from_operations(pd.DataFrame(excel_data))
+    start, end = datetime.date(2018, 1, 1), datetime.date(2018, 1, 31)
+    categories = rollups.category_report(start, end)
+    assert [category["total_spent"] for category in categories] == sorted(
+        (category["total_spent"] for category in categories), reverse=True
+    )
+    assert sum(category["count"] for category in categories) == len(excel_data)
+    assert rollups.cashback_report(start, end) == [
+        {"last_digits": "7197", "cashback": 0.0, "bonuses": 42.0, "invest_rounding": 0.0}
+    ]
+
+
+def test_persistent_store_rollups(tmp_path: str, excel_data: list[dict]) -> None:
+    """
+    [Тест] Постоянное хранилище дополняет агрегаты при загрузке новых строк.
+    """
+    store = PersistentStore(os.path.join(tmp_path, "store"))
+    assert store.rollups() is None
+    store.ingest(pd.DataFrame(excel_data[:4]))
+    store.ingest(pd.DataFrame(excel_data))
+    rollups = store.rollups()
+    assert rollups is not None
+    expected = RollupTable.from_operations(pd.DataFrame(excel_data))
+    start, end = datetime.date(2018, 1, 1), datetime.date(2018, 1, 31)
+    assert rollups.card_summary(start, end) == expected.card_summary(start, end)
+    assert rollups.category_report(start, end) == expected.category_report(start, end)
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.search import SearchIndex, normalize_tokens
+from src.store import TransactionStore
+from src.views import page_search
+
+
+@pytest.fixture
+def store(excel_data: list[dict]) -> TransactionStore:
+    """
+    Фикстура хранилища транзакций с операциями за 23-25 января 2018.
+    :return: Хранилище транзакций.
+    """
+    return TransactionStore(pd.DataFrame(excel_data))
+
+
+def descriptions(store: TransactionStore, rows: list[int]) -> list[str]:
+    """
+    Функция получения описаний операций хранилища по номерам строк.
+    :param store: Хранилище транзакций.
+    :param rows: Номера строк.
+    :return: Список описаний.
+    """
+    return list(store.operations["Описание"].iloc[np.asarray(rows)])
+
+
+def test_normalize_tokens() -> None:
+    """
+    [Тест] Описание разбивается на слова в нижнем регистре без знаков препинания.
+    """
+    assert normalize_tokens("Ozon.ru") == ["ozon", "ru"]
+    assert normalize_tokens("Перекрёсток  ЖКУ-Дом") == ["перекресток", "жку", "дом"]
+
+
+def test_search_index_query(store: TransactionStore) -> None:
+    """
+    [Тест] Запросы по словам описания, категории и MCC с условиями И и ИЛИ.
+    """
+    index = SearchIndex(store.operations)
+    assert descriptions(store, index.query("frittella").tolist()) == ["OOO Frittella", "OOO Frittella"]
+    assert descriptions(store, index.query("яндекс такси").tolist()) == ["Яндекс Такси", "Яндекс Такси"]
+    assert index.query("яндекс billa").tolist() == []
+    assert sorted(descriptions(store, index.query("billa OR РЖД").tolist())) == ["Billa", "РЖД"]
+    assert descriptions(store, index.query('category:"ж/д билеты" | mcc:5411').tolist()) == ["РЖД", "Billa"]
+    assert len(index.query("перевод")) == 2
+    assert len(index.query("перевод category:Переводы")) == 1
+    assert index.query("McDonald's").tolist() == []
+    assert descriptions(store, index.query('category:"ж/д билеты').tolist()) == ["РЖД"]
+
+
+def test_store_search_period(store: TransactionStore) -> None:
+    """
+    [Тест] Поиск за период ограничивает найденные строки диапазоном дат.
+    """
+    rows = store.search("frittella OR такси", datetime(2018, 1, 24, 12), datetime(2018, 1, 25, 23, 59))
+    assert store.operations["Дата операции"].iloc[rows].tolist() == ["24.01.2018 13:59:06", "25.01.2018 14:49:57"]
+    index = store.get_search_index()
+    assert index.aggregate(rows, "description") == [
+        {"description": "OOO Frittella", "count": 2, "total_spent": 620.0, "cashback": 0.0}
+    ]
+    store.append(store.operations.iloc[rows[:1]])
+    assert store.get_search_index() is not index
+    assert len(store.search("frittella", datetime(2018, 1, 1), datetime(2018, 1, 31))) == 3
+
+
+def test_page_search(tmp_path: str, excel_data: list[dict]) -> None:
+    """
+    [Тест] Страница поиска возвращает итоги, суммы по категориям и MCC и последние транзакции,
+    название с апострофом ищется как обычные слова.
+    """
+    store = TransactionStore(pd.DataFrame(excel_data))
+    data = page_search("mcc:4121 OR Billa", "2018-01-24 00:00:00", "2018-01-25 23:59:59", store, limit=2)
+    assert data["count"] == 3
+    assert data["total_spent"] == 815.62
+    assert data["by_category"] == [
+        {"category": "Транспорт", "count": 2, "total_spent": 751.0, "cashback": 0.0},
+        {"category": "Супермаркеты", "count": 1, "total_spent": 64.62, "cashback": 0.0},
+    ]
+    assert data["by_mcc"][0] == {"mcc": 4121, "count": 2, "total_spent": 751.0, "cashback": 0.0}
+    assert data["transactions"] == [
+        {"date": "26.01.2018", "amount": 64.62, "category": "Супермаркеты", "description": "Billa"},
+        {"date": "25.01.2018", "amount": 376.0, "category": "Транспорт", "description": "Яндекс Такси"},
+    ]
+    with pytest.raises(ValueError):
+        page_search("billa", "24.01.2018", "25.01.2018", store)
+
+    store.append(store.operations.iloc[:1].assign(**{"Описание": "McDonald's"}))
+    assert page_search("McDonald's", "2018-01-01 00:00:00", "2018-01-31 23:59:59", store)["count"] == 1
@@ -0,0 +1,128 @@
+import asyncio
+import http.client
+import json
+import os
+import threading
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+import src.views
+from src.server import DashboardState, create_server
+
+
+@pytest.fixture
+def dashboard(excel_file: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple]:
+    """
+    Фикстура запущенного сервиса на временном файле Excel без обращений к API.
+    :return: Состояние сервиса, порт и путь к файлу.
+    """
+    monkeypatch.setattr(src.views, "currency_rates", lambda settings=None: [])
+    monkeypatch.setattr(src.views, "user_stocks", lambda settings=None: [])
+    state = DashboardState(excel_file)
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(create_server(state, "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield state, server.sockets[0].getsockname()[1], excel_file
+    server.close()
+    asyncio.run_coroutine_threadsafe(server.wait_closed(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def request(port: int, path: str, connection: http.client.HTTPConnection | None = None) -> tuple[int, dict]:
+    """
+    Функция запроса к сервису.
+    :return: Статус и тело ответа.
+    """
+    own_connection = connection is None
+    connection = connection or http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    if own_connection:
+        connection.close()
+    return result
+
+
+def test_server_main(dashboard: tuple) -> None:
+    """
+    [Тест] Сервис отвечает на GET /main?date=... по keep-alive соединению с теплым хранилищем.
+    """
+    state, port, filename = dashboard
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    status, data = request(port, "/main?date=2018-01-25%2010:00:00", connection)
+    assert status == 200
+    assert data["greeting"] == "Доброе утро"
+    assert data["cards"] == [{"last_digits": "7197", "total_spent": 7728.92, "cashback": 0.0}]
+    store = state.store
+
+    status, data = request(port, "/main?date=2018-01-25%2023:00:00", connection)
+    assert status == 200
+    assert data["cards"] == [{"last_digits": "7197", "total_spent": 8023.92, "cashback": 0.0}]
+    assert state.store is store
+
+    status, data = request(port, "/main?date=2018-01-25%2010:00:00", connection)
+    assert data["cards"] == [{"last_digits": "7197", "total_spent": 7728.92, "cashback": 0.0}]
+    assert state.response_cache.stats()["hits"]["page"] == 1
+    connection.close()
+
+
+def test_server_errors(dashboard: tuple) -> None:
+    """
+    [Тест] Сервис возвращает ошибки для неизвестного пути и некорректной даты.
+    """
+    state, port, filename = dashboard
+    assert request(port, "/unknown")[0] == 404
+    assert request(port, "/main")[0] == 400
+    assert request(port, "/main?date=25.01.2018")[0] == 400
+
+
+def test_server_search(dashboard: tuple) -> None:
+    """
+    [Тест] Сервис отвечает на GET /search по индексу хранилища.
+    """
+    state, port, filename = dashboard
+    status, data = request(
+        port, "/search?q=frittella%20OR%20billa&start=2018-01-24%2000:00:00&end=2018-01-25%2023:59:59"
+    )
+    assert status == 200
+    assert data["count"] == 3 and data["total_spent"] == 684.62
+    assert request(port, "/search?q=billa")[0] == 400
+
+
+def test_server_reload(dashboard: tuple, excel_data: list[dict]) -> None:
+    """
+    [Тест] Сервис перечитывает данные при изменении файла Excel.
+    """
+    state, port, filename = dashboard
+    assert request(port, "/main?date=2018-01-25%2023:00:00")[1]["top_transactions"][0]["amount"] == 115909.42
+    pd.DataFrame(excel_data[:3]).to_excel(filename, index=False)
+    os.utime(filename, ns=(0, 0))
+    assert request(port, "/main?date=2018-01-25%2023:00:00")[1]["top_transactions"][0]["amount"] == 9700.0
+
+
+def test_server_metrics(dashboard: tuple) -> None:
+    """
+    [Тест] Сервис возвращает блок "_timings" по параметру timings и метрики Prometheus на GET /metrics.
+    """
+    state, port, filename = dashboard
+    status, data = request(port, "/main?date=2018-01-25%2010:00:00&timings=1")
+    assert status == 200
+    assert "read_finance_excel_operation" in {stage["stage"] for stage in data["_timings"]["stages"]}
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", "/metrics")
+    response = connection.getresponse()
+    assert response.status == 200
+    assert response.getheader("Content-Type", "").startswith("text/plain")
+    response.read()
+    request(port, "/main?date=2018-01-25%2010:00:00")
+    request(port, "/main?date=2018-01-25%2010:00:00")
+    connection.request("GET", "/metrics")
+    text = connection.getresponse().read().decode("utf-8")
+    assert 'function="read_finance_excel_operation"' in text
+    assert 'cache="response_page",result="hit"' in text
+    connection.close()
@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.settings import SettingsError, SettingsLoader, UserSettings, get_settings
+from src.utils import currency_rates, user_stocks
+
+
+def write_settings(path: str, data: dict) -> None:
+    """
+    Функция записи файла настроек.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def test_user_settings_schema() -> None:
+    """
+    [Тест] Настройки проверяются по схеме: валюты, акции и параметры хранилища.
+    """
+    settings = UserSettings.from_dict({"user_currencies": ["USD"], "user_stocks": ["AAPL"], "storage_path": "db"})
+    assert settings == UserSettings(("USD",), ("AAPL",), "excel", "db")
+    assert settings.as_dict() == {
+        "user_currencies": ["USD"],
+        "user_stocks": ["AAPL"],
+        "storage_backend": "excel",
+        "storage_path": "db",
+    }
+    for data in [
+        [],
+        {"user_stocks": ["AAPL"]},
+        {"user_currencies": ["usd"], "user_stocks": ["AAPL"]},
+        {"user_currencies": ["USD"], "user_stocks": [""]},
+        {"user_currencies": ["USD"], "user_stocks": ["AAPL"], "storage_backend": 1},
+        {"user_currencies": ["USD"], "user_stocks": ["AAPL"], "storage_path": 1},
+    ]:
+        with pytest.raises(SettingsError):
+            UserSettings.from_dict(data)  # type: ignore[arg-type]
+
+
+def test_settings_loader_cache(tmp_path: str) -> None:
+    """
+    [Тест] Файл настроек читается один раз и перечитывается только при изменении файла.
+    """
+    path = os.path.join(tmp_path, "user_settings.json")
+    write_settings(path, {"user_currencies": ["USD"], "user_stocks": ["AAPL"]})
+    loader = SettingsLoader(path)
+    with patch("src.settings.json.load", wraps=json.load) as json_load:
+        settings = loader.get()
+        assert loader.get() is settings
+        assert json_load.call_count == 1
+
+        write_settings(path, {"user_currencies": ["USD", "EUR"], "user_stocks": ["AAPL"]})
+        os.utime(path, ns=(0, 0))
+        assert loader.get().user_currencies == ("USD", "EUR")
+        assert json_load.call_count == 2
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{")
+    with pytest.raises(SettingsError):
+        loader.get()
+    with pytest.raises(SettingsError):
+        SettingsLoader(os.path.join(tmp_path, "missing.json")).get()
+
+
+def test_settings_loader_threads(tmp_path: str) -> None:
+    """
+    [Тест] Параллельные вызовы из нескольких потоков получают один объект настроек.
+    """
+    path = os.path.join(tmp_path, "user_settings.json")
+    write_settings(path, {"user_currencies": ["USD"], "user_stocks": ["AAPL"]})
+    loader = SettingsLoader(path)
+    results: list[UserSettings] = []
+    threads = [threading.Thread(target=lambda: results.append(loader.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8 and all(result is results[0] for result in results)
+
+
+def test_injected_settings(api_server: Any) -> None:
+    """
+    [Тест] Функции курсов и акций используют переданные настройки без чтения файла.
+    """
+    settings = UserSettings(("GBP",), ("NVDA",))
+    with patch("builtins.open", side_effect=AssertionError("файл настроек не должен читаться")):
+        assert currency_rates(settings) == [{"currency": "GBP", "rate": 0.5}]
+        assert user_stocks(settings) == [{"stock": "NVDA", "price": 100.5}]
+    assert get_settings().user_currencies == ("USD", "EUR")
@@ -0,0 +1,74 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.store import TransactionStore
+from src.utils import main_cards, read_finance_excel_operation
+
+
+def test_transaction_store_slice(excel_data: list[dict]) -> None:
+    """
+    [Тест] Хранилище транзакций отдает срез за период бинарным поиском.
+    """
+    store = TransactionStore(pd.DataFrame(excel_data))
+    assert len(store) == 9
+    assert store.operations["Дата операции"].iloc[0] == "23.01.2018 21:39:01"
+
+    data = store.slice(datetime.datetime(2018, 1, 24), datetime.datetime(2018, 1, 24, 23, 59, 59))
+    assert data["Дата операции"].tolist() == [
+        "24.01.2018 00:00:00",
+        "24.01.2018 00:00:00",
+        "24.01.2018 13:59:06",
+        "24.01.2018 22:53:54",
+    ]
+    assert store.slice(datetime.datetime(2019, 1, 1), datetime.datetime(2019, 2, 1)).empty
+    assert store.bounds(datetime.datetime(2018, 1, 26), datetime.datetime(2018, 1, 1)) == (9, 9)
+
+
+def test_read_finance_excel_operation_store(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция считывания операций принимает хранилище вместо пути к файлу и отдает строки в порядке файла.
+    """
+    store = TransactionStore(pd.DataFrame(excel_data))
+    period = (datetime.datetime(2018, 1, 25, 10, 0, 0), datetime.datetime(2018, 1, 1, 10, 0, 0))
+    data = read_finance_excel_operation(period, store)
+    assert len(data) == 7
+    assert data["Дата операции"].tolist() == [row["Дата операции"] for row in excel_data[2:]]
+
+
+def test_transaction_store_card_summary(excel_data: list[dict]) -> None:
+    """
+    [Тест] Итоги по картам из индекса накопленных сумм совпадают с main_cards.
+    """
+    store = TransactionStore(pd.DataFrame(excel_data))
+    start, end = datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 31)
+    assert store.card_summary(start, end) == main_cards(store.slice(start, end))
+    assert store.card_summary(datetime.datetime(2018, 1, 24, 12), datetime.datetime(2018, 1, 25, 10)) == [
+        {"last_digits": "7197", "total_spent": 6137.62, "cashback": 0.0}
+    ]
+
+    with pytest.raises(ValueError):
+        store.card_summary(datetime.datetime(2019, 1, 1), datetime.datetime(2019, 1, 31))
+
+
+def test_transaction_store_append(excel_data: list[dict]) -> None:
+    """
+    [Тест] Добавление строк в хранилище обновляет срезы и индекс карт.
+    """
+    full_store = TransactionStore(pd.DataFrame(excel_data))
+    store = TransactionStore(pd.DataFrame(excel_data[3:6]))
+    store.append(pd.DataFrame(excel_data[:3]))
+    store.append(pd.DataFrame(excel_data[6:] + [{**excel_data[1], "Номер карты": "*5091", "Кэшбэк": 3.0}]))
+    assert len(store) == 10
+    assert store.operation_dates.tolist() == sorted(store.operation_dates.tolist())
+    source_order = store.slice(datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 31), source_order=True)
+    assert source_order["Дата операции"].tolist() == [
+        row["Дата операции"] for row in excel_data[3:6] + excel_data[:3] + excel_data[6:] + excel_data[1:2]
+    ]
+
+    start, end = datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 31)
+    assert store.card_summary(start, end) == [
+        {"last_digits": "5091", "total_spent": 295.0, "cashback": 3.0},
+        *full_store.card_summary(start, end),
+    ]
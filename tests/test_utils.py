@@ -3,11 +3,14 @@ import os
 from typing import Any
 from unittest.mock import patch
 
+import pandas as pd
 import pytest
 import requests
 
 from src.utils import (
     currency_rates,
+    filter_operations_by_period,
+    get_api_currencies,
     get_api_currency,
     get_api_stocks,
     get_period_date,
@@ -15,6 +18,9 @@ from src.utils import (
     main_cards,
     read_finance_excel_operation,
     top_transactions,
+    top_transactions_by_group,
+    top_transactions_stream,
+    user_stocks,
     welcome_text,
 )
 
@@ -37,7 +43,8 @@ def test_read_finance_excel_operation() -> None:
     """
     dates = (datetime.datetime(2021, 12, 27, 22, 53, 10), datetime.datetime(2021, 12, 1, 22, 53, 10))
     success_test = read_finance_excel_operation(dates, ROOT_DIR + "/data/operations.xlsx")
-    assert isinstance(success_test, list)
+    assert isinstance(success_test, pd.DataFrame)
+    assert len(success_test) == 155
 
     with pytest.raises(ValueError):
         dates = (datetime.datetime(2021, 12, 27, 22, 53, 10), datetime.datetime(2021, 12, 1, 22, 53, 10))
@@ -49,6 +56,24 @@ def test_read_finance_excel_operation() -> None:
             read_finance_excel_operation(dates, "")
 
 
+def test_filter_operations_by_period(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция фильтрации операций по периоду дат одной векторной маской.
+    """
+    period = (datetime.datetime(2018, 1, 24, 23, 0, 0), datetime.datetime(2018, 1, 24, 0, 0, 0))
+    data = filter_operations_by_period(pd.DataFrame(excel_data), period)
+    assert data["Дата операции"].tolist() == [
+        "24.01.2018 22:53:54",
+        "24.01.2018 13:59:06",
+        "24.01.2018 00:00:00",
+        "24.01.2018 00:00:00",
+    ]
+    assert list(data.index) == [0, 1, 2, 3]
+
+    with pytest.raises(ValueError):
+        filter_operations_by_period(pd.DataFrame([{"Дата операции": "2018-01-24"}]), period)
+
+
 @pytest.mark.parametrize(
     "test_datetime, result",
     [
@@ -95,7 +120,45 @@ def test_top_transactions(excel_data: list[dict]) -> None:
     ]
 
 
-@patch("requests.get")
+def test_top_transactions_k_by_abs(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция возврата ТОП K транзакций по модулю суммы.
+    """
+    data = top_transactions(excel_data, k=2, by_abs=True, amount_column="Сумма операции")
+    assert [row["amount"] for row in data] == [115909.42, 9700.0]
+
+    data = top_transactions(excel_data[1:8], k=2, by_abs=True, amount_column="Сумма операции")
+    assert data == [
+        {"amount": -5748.0, "category": "Авиабилеты", "date": "25.01.2018", "description": "Aviacassa"},
+        {"amount": -840.3, "category": "Ж/д билеты", "date": "24.01.2018", "description": "РЖД"},
+    ]
+
+
+def test_top_transactions_stream(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция возврата ТОП K транзакций по потоку порций строк.
+    """
+    chunks = [excel_data[:3], excel_data[3:6], excel_data[6:]]
+    assert top_transactions_stream(chunks) == top_transactions(excel_data)
+    assert top_transactions_stream(iter([[], excel_data]), k=1) == top_transactions(excel_data, k=1)
+    assert top_transactions_stream([]) == []
+
+
+def test_top_transactions_by_group(excel_data: list[dict]) -> None:
+    """
+    [Тест] Функция возврата ТОП K транзакций по каждой карте или категории.
+    """
+    data = top_transactions_by_group(excel_data, "Категория", k=1)
+    assert list(data) == sorted({row["Категория"] for row in excel_data})
+    assert data["Транспорт"] == [
+        {"amount": 376.0, "category": "Транспорт", "date": "25.01.2018", "description": "Яндекс Такси"}
+    ]
+
+    data = top_transactions_by_group(excel_data, k=2)
+    assert data == {"*7197": top_transactions(excel_data[1:8], k=2)}
+
+
+@patch("requests.Session.get")
 def test_get_api_currency(requests_mock: Any) -> None:
     """
     [Тест] Функция получения курса валюты по API
@@ -114,7 +177,7 @@ def test_get_api_currency(requests_mock: Any) -> None:
         get_api_currency("USD")
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_get_api_stocks(requests_mock: Any) -> None:
     """
     [Тест] Функция получения стоимости акций.
@@ -134,19 +197,40 @@ def test_get_api_stocks(requests_mock: Any) -> None:
     assert data == 0
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
+def test_get_api_currencies(requests_mock: Any) -> None:
+    """
+    [Тест] Функция получения курсов всех валют к рублю одним запросом API.
+    """
+    requests_mock.return_value.status_code = 200
+    requests_mock.return_value.json.return_value = {"rates": {"USD": 0.0125, "EUR": 0.01}}
+    data = get_api_currencies(["USD", "EUR", "CNY"])
+    assert data == {"USD": 80.0, "EUR": 100.0, "CNY": 0}
+    assert requests_mock.call_count == 1
+    assert requests_mock.call_args.kwargs["params"] == {"base": "RUB", "symbols": "USD,EUR,CNY"}
+
+    requests_mock.return_value.status_code = 500
+    assert get_api_currencies(["USD"]) == {"USD": 0}
+
+    requests_mock.side_effect = requests.exceptions.ReadTimeout
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        get_api_currencies(["USD"])
+
+
+@patch("requests.Session.get")
 def test_currency_rates(requests_mock: Any) -> None:
     """
-    [Тест] Функция возвращает курс валют.
+    [Тест] Функция возвращает курс валют одним запросом API.
     """
     requests_mock.return_value.status_code = 200
-    requests_mock.return_value.json.return_value = {"rates": {"RUB": 32.223}}
+    requests_mock.return_value.json.return_value = {"rates": {"USD": 0.031033, "EUR": 0.0111}}
 
     data = currency_rates()
-    assert data == [{"currency": "USD", "rate": 32.22}, {"currency": "EUR", "rate": 32.22}]
+    assert data == [{"currency": "USD", "rate": 32.22}, {"currency": "EUR", "rate": 90.09}]
+    assert requests_mock.call_count == 1
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_user_stocks(requests_mock: Any) -> None:
     """
     [Тест] Функция возвращает стоимость акций.
@@ -157,12 +241,28 @@ def test_user_stocks(requests_mock: Any) -> None:
     assert data == 322.223
 
 
+def test_market_data_concurrent(api_server: Any) -> None:
+    """
+    [Тест] Курсы валют и акций запрашиваются параллельно: сервер API обрабатывает несколько запросов одновременно.
+    """
+    rates = currency_rates()
+    stocks = user_stocks()
+    assert rates == [{"currency": "USD", "rate": 0.5}, {"currency": "EUR", "rate": 0.5}]
+    assert stocks == [{"stock": stock, "price": 100.5} for stock in ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]]
+    assert len(api_server.paths) == 6
+    assert api_server.max_in_flight > 1
+
+
 def test_get_user_settings() -> None:
     """
     [Тест] Функция чтения пользовательских настроек.
     """
     data = get_user_settings()
-    assert data == {"user_currencies": ["USD", "EUR"], "user_stocks": ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]}
+    assert data == {
+        "user_currencies": ["USD", "EUR"],
+        "user_stocks": ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"],
+        "storage_backend": "excel",
+    }
 
     with patch("builtins.open") as f_open:
         f_open("fake_file")
@@ -1,10 +1,13 @@
 from typing import Any
 from unittest.mock import patch
 
-from src.views import page_main
+import pytest
 
+from src.store import TransactionStore
+from src.views import page_main, page_main_batch
 
-@patch("requests.get")
+
+@patch("requests.Session.get")
 @patch("src.utils.user_stocks")
 @patch("src.utils.currency_rates")
 def test_page_main(user_stocks: Any, currency_rates: Any, requests_mock: Any) -> None:
@@ -18,7 +21,7 @@ def test_page_main(user_stocks: Any, currency_rates: Any, requests_mock: Any) ->
     assert data == {
         "cards": [
             {"cashback": 41.0, "last_digits": "4556", "total_spent": 24452.9},
-            {"cashback": 0.0, "last_digits": "5091", "total_spent": 16360.710000000001},
+            {"cashback": 0.0, "last_digits": "5091", "total_spent": 16360.71},
             {"cashback": 0.0, "last_digits": "7197", "total_spent": 20935.68},
         ],
         "currency_rates": [{"currency": "USD", "rate": 0}, {"currency": "EUR", "rate": 0}],
@@ -48,3 +51,71 @@ def test_page_main(user_stocks: Any, currency_rates: Any, requests_mock: Any) ->
             {"amount": 10000.0, "category": "Переводы", "date": "23.12.2021", "description": "Светлана Т."},
         ],
     }
+
+
+@patch("requests.Session.get")
+def test_page_main_store(requests_mock: Any) -> None:
+    """
+    Тестирование основной функции с заранее загруженным хранилищем транзакций
+    """
+    requests_mock.return_value.json.return_value = {}
+    store = TransactionStore.from_excel()
+    data = page_main("2021-12-27 08:00:23", store)
+    expected = page_main("2021-12-27 08:00:23")
+    assert data["cards"] == expected["cards"]
+    assert data["top_transactions"] == expected["top_transactions"]
+
+
+@patch("requests.Session.get")
+def test_page_main_batch(requests_mock: Any) -> None:
+    """
+    Тестирование главной страницы для многих дат за один проход, включая первый день месяца и пустой период
+    """
+    requests_mock.return_value.json.return_value = {}
+    store = TransactionStore.from_excel()
+    dates = [
+        "2021-12-27 08:00:23",
+        "2021-11-30 23:59:59",
+        "2021-12-01 00:00:00",
+        "2021-12-01 08:00:23",
+        "2021-12-15 12:00:00",
+        "2021-12-27 08:00:23",
+        "2021-12-02 00:00:00",
+    ]
+    pages = page_main_batch(dates, store)
+    assert sum("error" in page for page in pages) == 2
+    assert [page["date"] for page in pages] == sorted(set(dates))
+    for page in pages:
+        if "error" in page:
+            with pytest.raises(ValueError, match=page["error"]):
+                page_main(page["date"], store)
+            continue
+        expected = page_main(page["date"], store)
+        assert page == {"date": page["date"], **expected}
+
+
+@patch("requests.Session.get")
+def test_page_main_store_ties(requests_mock: Any) -> None:
+    """
+    Тестирование ТОП транзакций с равными суммами: хранилище и проход по многим датам выбирают строки
+    в порядке файла Excel
+    """
+    requests_mock.return_value.json.return_value = {}
+    store = TransactionStore.from_excel()
+    date = "2018-02-05 23:59:59"
+    expected = page_main(date)["top_transactions"]
+    assert [transaction["amount"] for transaction in expected][:2] == [5960.0, 5960.0]
+    assert page_main(date, store)["top_transactions"] == expected
+    assert page_main_batch([date], store)[0]["top_transactions"] == expected
+
+
+@patch("requests.Session.get")
+def test_page_main_empty_period(requests_mock: Any) -> None:
+    """
+    [Тест] Период без операций приводит к ошибке ValueError и по файлу Excel, и по хранилищу транзакций.
+    """
+    requests_mock.return_value.json.return_value = {}
+    with pytest.raises(ValueError, match="Empty DataFrame"):
+        page_main("2030-01-15 10:00:00")
+    with pytest.raises(ValueError, match="Empty DataFrame"):
+        page_main("2030-01-15 10:00:00", TransactionStore.from_excel())